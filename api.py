@@ -5,19 +5,40 @@ FastAPI-based REST API for serving scraped tweets
 
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, Response
 from typing import Optional, List
 import sqlite3
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
+import re
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 import uvicorn
+from src.database import get_placeholder
+from src.trends import TrendTracker
+from src.config import FEED_DIR, DELTA_DIR
+from src.feeds import MANIFEST_NAME, SHARD_FILE_RE
+from src.deltas import files_since
+from src.polling import freshness_report
+from src.metrics import REGISTRY, CONTENT_TYPE
+from src.apimetrics import RequestMetrics, TimedConnection
+from src.logconfig import setup_logging
+
+@asynccontextmanager
+async def lifespan(app):
+    # Production runs `uvicorn api:app` (Procfile, start.sh), which never reaches __main__,
+    # so logging is set up at startup; it leaves an already configured root logger alone
+    setup_logging("api")
+    yield
 
 app = FastAPI(
     title="Nigerian News API",
     description="REST API for accessing Nigerian news tweets",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS
@@ -29,6 +50,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, status counts and connect/query/app breakdown (served on /metrics)
+app.add_middleware(RequestMetrics)
+
 # ============================================================================
 # MODELS
 # ============================================================================
@@ -48,6 +72,19 @@ class Tweet(BaseModel):
     ingested_at: str
     processed: bool
 
+class Story(BaseModel):
+    story_id: str
+    tweet_count: int
+    total_engagement: int
+    first_seen: str
+    representative: Tweet
+
+class Trend(BaseModel):
+    term: str
+    count: int
+    baseline: float
+    score: float
+
 class StatsResponse(BaseModel):
     total_tweets: int
     tweets_last_hour: int
@@ -60,22 +97,18 @@ class StatsResponse(BaseModel):
 # ============================================================================
 
 def get_db():
-    """Get database connection"""
+    """Get database connection (statements are timed and slow ones logged)"""
+    started = time.perf_counter()
     db_url = os.getenv("DATABASE_URL")
     if not db_url:
         conn = sqlite3.connect("nigerian_news.db")
         conn.row_factory = sqlite3.Row
-        return conn
-    
-    conn = psycopg2.connect(db_url, cursor_factory=RealDictCursor)
-    return conn
+    else:
+        conn = psycopg2.connect(db_url, cursor_factory=RealDictCursor)
+    return TimedConnection(conn, time.perf_counter() - started)
 
-def get_placeholder(conn):
-    """Return SQL placeholder based on connection type"""
-    # Check if SQLite (has execute but no status)
-    if hasattr(conn, 'execute') and not hasattr(conn, 'status'):
-        return "?"
-    return "%s"
+# Trend buckets are held in memory and topped up from the database on demand
+trend_tracker = TrendTracker()
 
 # ============================================================================
 # API ENDPOINTS
@@ -92,7 +125,13 @@ async def root():
             "/tweets/top": "Get top trending tweets",
             "/tweets/recent": "Get most recent tweets",
             "/tweets/category/{category}": "Get tweets by category",
+            "/stories": "Get clustered stories (one representative per story)",
+            "/trends": "Get terms and hashtags surging right now",
+            "/feeds": "Manifest of precomputed static feed shards",
+            "/deltas": "Incremental export files needed to catch up from a sequence number",
+            "/accounts/freshness": "Per-account polling interval and expected vs actual freshness",
             "/stats": "Get API statistics",
+            "/metrics": "Request and query metrics (Prometheus text format)",
             "/health": "Health check"
         }
     }
@@ -171,6 +210,7 @@ async def get_tweets(
     offset: int = Query(0, ge=0, description="Offset for pagination"),
     category: Optional[str] = Query(None, description="Filter by category"),
     author: Optional[str] = Query(None, description="Filter by author username"),
+    entity: Optional[str] = Query(None, description="Filter by tagged entity (e.g. inec, lagos, bola_tinubu)"),
     min_engagement: Optional[int] = Query(None, ge=0, description="Minimum total engagement"),
     hours: Optional[int] = Query(None, ge=1, description="Only tweets from last N hours")
 ):
@@ -193,6 +233,10 @@ async def get_tweets(
             query += f" AND author_username = {ph}"
             params.append(author)
         
+        if entity:
+            query += f" AND tweet_id IN (SELECT tweet_id FROM tweet_entities WHERE entity = {ph})"
+            params.append(entity.lower())
+        
         if hours:
             # Postgres: created_at > NOW() - INTERVAL 'X hours'
             # SQLite: created_at > datetime('now', '-X hours')
@@ -381,6 +425,153 @@ async def get_tweets_by_category(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching tweets: {str(e)}")
 
+@app.get("/stories", response_model=List[Story])
+async def get_stories(
+    limit: int = Query(20, ge=1, le=100, description="Number of stories to return"),
+    hours: Optional[int] = Query(24, ge=1, description="Time window in hours")
+):
+    """Get near-duplicate story clusters, ranked by aggregate engagement"""
+    try:
+        conn = get_db()
+        cursor = conn.cursor()
+        ph = get_placeholder(conn)
+        
+        # Handle time interval syntax
+        if ph == "?":
+            time_clause = "datetime('now', ?)"
+            time_param = f'-{hours} hours'
+        else:
+            time_clause = "NOW() - INTERVAL %s"
+            time_param = f'{hours} hours'
+        
+        # One representative (highest engagement) per story, plus story aggregates
+        query = f"""
+            SELECT * FROM (
+                SELECT t.*,
+                    COALESCE(t.story_id, t.tweet_id) AS story_key,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY COALESCE(t.story_id, t.tweet_id)
+                        ORDER BY (t.likes + t.retweets + t.replies) DESC
+                    ) AS story_rank,
+                    COUNT(*) OVER (PARTITION BY COALESCE(t.story_id, t.tweet_id)) AS story_size,
+                    SUM(t.likes + t.retweets + t.replies) OVER (
+                        PARTITION BY COALESCE(t.story_id, t.tweet_id)
+                    ) AS story_engagement,
+                    MIN(t.created_at) OVER (PARTITION BY COALESCE(t.story_id, t.tweet_id)) AS story_first_seen
+                FROM tweets t
+                WHERE t.is_retweet = {ph}
+                AND t.created_at > {time_clause}
+            ) ranked
+            WHERE story_rank = 1
+            ORDER BY story_engagement DESC
+            LIMIT {ph}
+        """
+        
+        cursor.execute(query, (False, time_param, limit))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        stories = []
+        for row in rows:
+            stories.append(Story(
+                story_id=row['story_key'],
+                tweet_count=row['story_size'],
+                total_engagement=row['story_engagement'],
+                first_seen=str(row['story_first_seen']),
+                representative=Tweet(
+                    tweet_id=row['tweet_id'],
+                    author_username=row['author_username'],
+                    author_verified=bool(row['author_verified']),
+                    account_category=row['account_category'],
+                    text=row['text'],
+                    created_at=str(row['created_at']),
+                    likes=row['likes'],
+                    retweets=row['retweets'],
+                    replies=row['replies'],
+                    url=row['url'],
+                    is_retweet=bool(row['is_retweet']),
+                    ingested_at=str(row['ingested_at']),
+                    processed=bool(row['processed'])
+                )
+            ))
+        
+        return stories
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching stories: {str(e)}")
+
+@app.get("/trends", response_model=List[Trend])
+async def get_trends(
+    limit: int = Query(20, ge=1, le=100, description="Number of trending terms to return")
+):
+    """Get terms and hashtags surging in the current window versus the trailing baseline"""
+    try:
+        conn = get_db()
+        trend_tracker.refresh(conn)
+        conn.close()
+        
+        return [Trend(**trend) for trend in trend_tracker.top(limit)]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching trends: {str(e)}")
+
+@app.get("/feeds")
+async def get_feed_manifest():
+    """Serve the static feed manifest (shard name -> content-hashed file)"""
+    path = os.path.join(FEED_DIR, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="No feeds published yet")
+    
+    # Clients revalidate the manifest; the shards it points to never change
+    return FileResponse(path, media_type="application/json", headers={"Cache-Control": "public, max-age=60"})
+
+@app.get("/feeds/{file_name}")
+async def get_feed_shard(file_name: str):
+    """Serve a precomputed feed shard straight from disk without touching the database"""
+    path = os.path.join(FEED_DIR, file_name)
+    if not SHARD_FILE_RE.match(file_name) or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Feed shard not found: {file_name}")
+    
+    return FileResponse(path, media_type="application/json", headers={
+        "Content-Encoding": "gzip",
+        "Cache-Control": "public, max-age=31536000, immutable",
+    })
+
+@app.get("/deltas")
+async def get_deltas(
+    since: int = Query(0, ge=0, description="Last sequence number the consumer has applied")
+):
+    """List the delta (or snapshot + delta) files needed to catch up from a sequence number"""
+    plan = files_since(since, DELTA_DIR)
+    plan["files"] = [f"/deltas/{name}" for name in plan["files"]]
+    return plan
+
+@app.get("/deltas/{file_name}")
+async def get_delta_file(file_name: str):
+    """Serve a delta or snapshot file (gzip NDJSON)"""
+    path = os.path.join(DELTA_DIR, file_name)
+    if not re.match(r"^(delta|snapshot)-\d{12}\.ndjson\.gz$", file_name) or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Export file not found: {file_name}")
+    
+    return FileResponse(path, media_type="application/x-ndjson", headers={
+        "Content-Encoding": "gzip",
+        "Cache-Control": "public, max-age=31536000, immutable",
+    })
+
+@app.get("/accounts/freshness")
+async def get_account_freshness():
+    """Per-account polling schedule with expected vs observed freshness, stalest first"""
+    try:
+        conn = get_db()
+        report = freshness_report(conn)
+        conn.close()
+        return report
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching account freshness: {str(e)}")
+
+@app.get("/metrics")
+async def get_metrics():
+    """Request latency, status and query timing in Prometheus text format (this process only)"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 # ============================================================================
 # RUN SERVER
 # ============================================================================
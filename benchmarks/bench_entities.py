@@ -0,0 +1,54 @@
+"""
+Entity tagging throughput benchmark over a synthetic corpus.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_entities --tweets 100000
+"""
+
+import argparse
+import random
+import time
+from src.entities import EntityMatcher
+from src.gazetteer import GAZETTEER
+
+FILLER = (
+    "the people are waiting for update on fuel price and naira today as traders "
+    "in market say government should act now before things get worse for everybody "
+    "abeg make una help us wetin dey happen for this country"
+).split()
+
+
+def synthetic_corpus(n, seed=42):
+    """Tweets of filler words with 0-3 gazetteer aliases mixed in"""
+    rng = random.Random(seed)
+    aliases = [alias for entry in GAZETTEER.values() for alias in entry["aliases"]]
+    corpus = []
+    for _ in range(n):
+        words = rng.choices(FILLER, k=rng.randint(10, 40))
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(aliases))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def run(n):
+    corpus = synthetic_corpus(n)
+    chars = sum(len(text) for text in corpus)
+
+    start = time.perf_counter()
+    matcher = EntityMatcher()
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tags = sum(len(matcher.match(text)) for text in corpus)
+    elapsed = time.perf_counter() - start
+
+    print(f"Automaton: {len(matcher.goto)} states, built in {build_seconds * 1000:.1f} ms")
+    print(f"Tagged {n} tweets ({chars / 1e6:.1f} MB text) in {elapsed:.2f}s")
+    print(f"Throughput: {n / elapsed:,.0f} tweets/s, {chars / elapsed / 1e6:.2f} MB/s, {tags} tags")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tweets", type=int, default=100000)
+    run(parser.parse_args().tweets)
@@ -0,0 +1,178 @@
+"""
+Microbenchmarks for the per-tweet hot paths, gated against a stored baseline.
+
+Each case runs over a seeded synthetic corpus and reports the best-of-N time
+per tweet. Results are written as JSON. With --baseline, any case slower
+than the baseline by more than --threshold fails the run (exit status 1).
+Baselines are machine-specific: record one with --save-baseline on the
+machine that runs the gate.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_hotpaths --save-baseline
+    python -m benchmarks.bench_hotpaths --baseline benchmarks/baseline_hotpaths.json --threshold 0.5
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+import main
+from src.analyzer import parse_metric, calculate_relevance_score
+from src.records import TweetRecord
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline_hotpaths.json")
+
+WORDS = (
+    "breaking news lagos abuja fuel price naira senate inec election police urgent confirmed "
+    "update market traders government today people economy security tinubu governor kano"
+).split()
+RELATIVE_TIMES = ["23s", "45m", "2h", "Jan 3", "Dec 31, 2023", "7m", "59s", ""]
+METRICS = ["", "0", "12", "987", "1.2K", "15K", "3.4M", "n/a"]
+
+
+def synthetic_corpus(n, seed=42):
+    """Tweet dicts shaped like the scraper's, with a fixed seed"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    return [{
+        "tweet_id": str(1_860_000_000_000_000_000 + i),
+        "author_username": rng.choice(("channelstv", "PremiumTimesng", "dailytrust")),
+        "author_verified": False,
+        "category": "news_outlets",
+        "text": " ".join(rng.choices(WORDS, k=rng.randint(5, 35))),
+        "likes": rng.randint(0, 500),
+        "retweets": rng.randint(0, 80),
+        "replies": rng.randint(0, 40),
+        "url": "",
+        "is_retweet": rng.random() < 0.1,
+        "created_at": (now - timedelta(minutes=rng.randint(0, 120))).isoformat(),
+        "time_str": rng.choice(RELATIVE_TIMES),
+        "metric": rng.choice(METRICS),
+    } for i in range(n)]
+
+
+def cases(corpus, workdir):
+    """(name, callable) pairs; each callable processes the whole corpus once"""
+    texts = [t["text"] for t in corpus]
+    time_strs = [t["time_str"] for t in corpus]
+    timestamps = [t["created_at"] for t in corpus]
+    metrics = [t["metric"] for t in corpus]
+    records = [TweetRecord.from_dict(t) for t in corpus]
+
+    conn = main.init_database()
+    export_path = str(Path(workdir) / "tweets.json")
+    main.store_tweets(conn, records)
+
+    return [
+        ("parse_relative_time", lambda: [main.parse_relative_time(s) for s in time_strs]),
+        ("is_within_time_window", lambda: [main.is_within_time_window(s, 60) for s in timestamps]),
+        ("apply_quality_filters", lambda: main.apply_quality_filters(corpus, min_engagement=30)),
+        ("detect_news_relevance", lambda: [main.detect_news_relevance(t) for t in texts]),
+        ("parse_metric", lambda: [parse_metric(m) for m in metrics]),
+        ("calculate_relevance_score", lambda: [calculate_relevance_score(t) for t in texts]),
+        ("store_tweets", lambda: main.store_tweets(conn, records)),
+        ("export_to_json", lambda: main.export_to_json(conn, export_path, fmt="json", compress=False, limit=None)),
+    ]
+
+
+def measure(fn, items, repeat):
+    """Best-of-repeat nanoseconds per item (the minimum is the least noisy estimate)"""
+    best = float("inf")
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter_ns()
+            fn()
+            best = min(best, time.perf_counter_ns() - started)
+    finally:
+        gc.enable()
+    return best / items
+
+
+def find_regressions(results, baseline, threshold):
+    """Cases slower than the baseline by more than threshold (a fraction), with their ratio"""
+    regressions = []
+    for name, result in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        ratio = result["ns_per_tweet"] / base["ns_per_tweet"]
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def run(tweets, repeat, seed):
+    corpus = synthetic_corpus(tweets, seed)
+    results = {
+        "tweets": tweets,
+        "repeat": repeat,
+        "seed": seed,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": {},
+    }
+
+    # Temp database and export file; keep per-call log lines out of the timings
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="bench_hotpaths_")
+    os.chdir(workdir)
+    os.environ.pop("DATABASE_URL", None)
+    logging.disable(logging.WARNING)
+    try:
+        for name, fn in cases(corpus, workdir):
+            ns = measure(fn, tweets, repeat)
+            results["cases"][name] = {"ns_per_tweet": round(ns, 1), "tweets_per_second": round(1e9 / ns)}
+    finally:
+        logging.disable(logging.NOTSET)
+        os.chdir(cwd)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tweets", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", nargs="?", const=str(DEFAULT_BASELINE), help="fail on regressions against this baseline")
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed slowdown (0.5 = 50%%)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {DEFAULT_BASELINE.name}")
+    args = parser.parse_args()
+
+    results = run(args.tweets, args.repeat, args.seed)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{args.tweets:,} synthetic tweets, best of {args.repeat}")
+    for name, result in results["cases"].items():
+        line = f"{name:26s} {result['ns_per_tweet']:10.1f} ns/tweet {result['tweets_per_second']:>12,} tweets/s"
+        base = baseline and baseline.get("cases", {}).get(name)
+        if base:
+            line += f"  ({result['ns_per_tweet'] / base['ns_per_tweet'] - 1:+.0%} vs baseline)"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {DEFAULT_BASELINE}")
+
+    if baseline:
+        regressions = find_regressions(results, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f"REGRESSION: {name} is {ratio - 1:.0%} slower than baseline (limit {args.threshold:.0%})")
+        sys.exit(1 if regressions else 0)
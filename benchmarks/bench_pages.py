@@ -0,0 +1,73 @@
+"""
+Per-account page setup overhead: a new page per account vs the page pool.
+
+Needs the Playwright Firefox build (playwright install firefox). Each
+"account" loads a small local timeline page, so the numbers are setup cost
+rather than network time.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_pages --accounts 90
+"""
+
+import argparse
+import asyncio
+import time
+from playwright.async_api import async_playwright
+from main import launch_browser
+from src.pagepool import PagePool, block_heavy_resources
+
+TIMELINE = "data:text/html," + "".join(
+    f'<article data-testid="tweet"><div data-testid="tweetText">tweet {i}</div></article>' for i in range(50)
+)
+
+
+async def visit(page):
+    await page.goto(TIMELINE)
+    await page.wait_for_selector('article[data-testid="tweet"]')
+
+
+async def fresh_pages(context, accounts):
+    setups = []
+    for _ in range(accounts):
+        started = time.perf_counter()
+        page = await context.new_page()
+        await block_heavy_resources(page)
+        setups.append(time.perf_counter() - started)
+        await visit(page)
+        started = time.perf_counter()
+        await page.close()
+        setups[-1] += time.perf_counter() - started
+    return setups
+
+
+async def pooled_pages(context, accounts):
+    pool = PagePool(context, setup=block_heavy_resources)
+    for _ in range(accounts):
+        async with pool.page() as page:
+            await visit(page)
+    await pool.close()
+    return pool.setup_seconds, pool.report()
+
+
+async def run(accounts):
+    async with async_playwright() as p:
+        browser, context = await launch_browser(p)
+        try:
+            fresh = await fresh_pages(context, accounts)
+            pooled, report = await pooled_pages(context, accounts)
+        finally:
+            await browser.close()
+
+    fresh_ms = sum(fresh) / len(fresh) * 1000
+    pooled_ms = sum(pooled) / len(pooled) * 1000
+    print(f"{accounts} accounts")
+    print(f"new page per account: {fresh_ms:7.1f} ms setup/account")
+    print(f"page pool:            {pooled_ms:7.1f} ms setup/account "
+          f"({report['pages_created']} pages created, {report['pages_reused']} reuses)")
+    print(f"saved per cycle:      {(fresh_ms - pooled_ms) * accounts / 1000:7.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=90)
+    asyncio.run(run(parser.parse_args().accounts))
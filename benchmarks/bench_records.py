@@ -0,0 +1,100 @@
+"""
+Per-tweet memory and pipeline throughput: scraper dicts vs TweetRecord.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_records --tweets 1000000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from src.batch import filter_and_enrich
+from src.records import TweetRecord
+
+WORDS = (
+    "breaking news lagos abuja fuel price naira senate inec election police "
+    "update market traders government today people economy security"
+).split()
+
+
+def synthetic_fields(n, seed=42):
+    """Field tuples for n tweets (texts are shared so they don't dominate the memory numbers)"""
+    rng = random.Random(seed)
+    texts = [" ".join(rng.choices(WORDS, k=rng.randint(8, 30))) for _ in range(1000)]
+    base = 1_764_300_000
+    for i in range(n):
+        yield (
+            1_860_000_000_000_000_000 + i, rng.choice(("channelstv", "PremiumTimesng", "dailytrust")),
+            "news_outlets", texts[i % len(texts)], base + i, rng.randint(0, 500), rng.randint(0, 50),
+            rng.randint(0, 50),
+        )
+
+
+def as_dict(tweet_id, author, category, text, created_at, likes, retweets, replies):
+    """The dict main.py used to build per scraped tweet"""
+    return {
+        "tweet_id": str(tweet_id),
+        "author_username": author,
+        "author_verified": False,
+        "category": category,
+        "text": text,
+        "likes": likes,
+        "retweets": retweets,
+        "replies": replies,
+        "url": f"https://x.com/{author}/status/{tweet_id}",
+        "is_retweet": False,
+        "created_at": datetime.fromtimestamp(created_at).isoformat(),
+    }
+
+
+def as_record(tweet_id, author, category, text, created_at, likes, retweets, replies):
+    return TweetRecord(
+        tweet_id=tweet_id, author_username=author, category=category, text=text, created_at=created_at,
+        likes=likes, retweets=retweets, replies=replies, url=f"https://x.com/{author}/status/{tweet_id}",
+    )
+
+
+def bytes_per_tweet(fields, make, sample=100000):
+    """Traced allocation per built tweet over a sample (tracing slows building down a lot)"""
+    gc.collect()
+    tracemalloc.start()
+    tweets = [make(*f) for f in fields[:sample]]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(tweets)
+
+
+def run(n):
+    fields = list(synthetic_fields(n))
+
+    start = time.perf_counter()
+    records = [as_record(*f) for f in fields]
+    record_build = time.perf_counter() - start
+    start = time.perf_counter()
+    filter_and_enrich(records, min_engagement=30)
+    filter_seconds = time.perf_counter() - start
+    del records
+
+    start = time.perf_counter()
+    dicts = [as_dict(*f) for f in fields]
+    dict_build = time.perf_counter() - start
+    del dicts
+
+    record_bytes = bytes_per_tweet(fields, as_record)
+    dict_bytes = bytes_per_tweet(fields, as_dict)
+
+    print(f"{n:,} synthetic tweets")
+    print(f"dict:        {dict_bytes:6.0f} B/tweet, built in {dict_build:.2f}s")
+    print(f"TweetRecord: {record_bytes:6.0f} B/tweet, built in {record_build:.2f}s "
+          f"({1 - record_bytes / dict_bytes:.0%} less memory)")
+    print(f"filter_and_enrich: {n / filter_seconds:,.0f} tweets/s")
+    print(f"build + filter:    {n / (record_build + filter_seconds):,.0f} tweets/s end to end")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tweets", type=int, default=1000000)
+    run(parser.parse_args().tweets)
@@ -0,0 +1,101 @@
+"""
+End-to-end scrape throughput against the offline replay server.
+
+Scrapes replayed timelines with a real browser (the Playwright Firefox build
+must be installed) and reports tweets/s, per-account latency percentiles and
+browser memory. By default each account goes through scrape_account_tweets
+on a pooled page; --full runs main.main() instead (scrape, pipeline, storage
+and publishing) against a throwaway SQLite database in a temp directory.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_scrape --accounts 20 --latency-ms 150 --jitter-ms 100
+    python -m benchmarks.bench_scrape --full --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from playwright.async_api import async_playwright
+import main
+from src.memory import child_processes_rss_mb
+from src.pagepool import PagePool, block_heavy_resources
+from benchmarks.replay_server import build_server
+from benchmarks.stats import percentile
+
+
+async def scrape_replay(accounts, max_tweets):
+    """Scrape each account once; returns (tweets per account, seconds per account, RSS samples)"""
+    conn = main.init_database()
+    counts, seconds, rss = [], [], []
+    async with async_playwright() as p:
+        browser, context = await main.launch_browser(p)
+        pool = PagePool(context, setup=block_heavy_resources)
+        try:
+            for username in accounts:
+                started = time.perf_counter()
+                try:
+                    async with pool.page() as page:
+                        tweets = await main.scrape_account_tweets(page, username, "replay", conn, max_tweets=max_tweets)
+                except Exception as e:
+                    print(f"@{username} failed: {e}")
+                    tweets = []
+                seconds.append(time.perf_counter() - started)
+                counts.append(len(tweets))
+                rss.append(child_processes_rss_mb() or 0.0)
+        finally:
+            await pool.close()
+            await browser.close()
+    conn.close()
+    return counts, seconds, rss
+
+
+def run(args):
+    # Recorded timelines replace the generated accounts
+    accounts = [] if args.timelines else [f"replay_{i:03d}" for i in range(args.accounts)]
+    server = build_server(accounts, timelines_dir=args.timelines, tweets_per_account=args.tweets,
+                          latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          failure_rate=args.failure_rate).start()
+    accounts = list(server.timelines)
+    main.X_BASE_URL = server.base_url
+
+    # Database, exports and feeds all go to a temp directory
+    workdir = tempfile.mkdtemp(prefix="bench_scrape_")
+    os.chdir(workdir)
+    os.environ.pop("DATABASE_URL", None)
+
+    started = time.perf_counter()
+    if args.full:
+        main.ACCOUNTS = {"replay": accounts}
+        total = len(asyncio.run(main.main()))
+        counts = seconds = rss = []
+    else:
+        counts, seconds, rss = asyncio.run(scrape_replay(accounts, args.max_tweets))
+        total = sum(counts)
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    print(f"{len(accounts)} accounts replayed from {server.base_url} "
+          f"(latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, failure rate {args.failure_rate:.0%})")
+    print(f"API requests: {server.requests}, injected failures: {server.failures}")
+    print(f"tweets:       {total} in {elapsed:.1f}s ({total / elapsed:.1f} tweets/s)")
+    if seconds:
+        print(f"per account:  p50 {percentile(seconds, 50):.2f}s, p90 {percentile(seconds, 90):.2f}s, "
+              f"p99 {percentile(seconds, 99):.2f}s, max {max(seconds):.2f}s")
+    if rss and any(rss):
+        print(f"browser RSS:  first {rss[0]:.0f} MB, peak {max(rss):.0f} MB, last {rss[-1]:.0f} MB")
+    print(f"work dir:     {workdir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--tweets", type=int, default=60, help="tweets per generated timeline")
+    parser.add_argument("--max-tweets", type=int, default=50, help="per-account scrape limit")
+    parser.add_argument("--timelines", help="directory of recorded <username>.json timelines")
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--full", action="store_true", help="run main.main() instead of only the scrape loop")
+    run(parser.parse_args())
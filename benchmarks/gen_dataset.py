@@ -0,0 +1,155 @@
+"""
+Synthetic tweets dataset for exercising the API at scale.
+
+Fills the production tweets schema (created through main.init_database)
+with N rows shaped like real traffic. Authors are the tracked ACCOUNTS with
+a Zipf-skewed share of tweets, so categories are skewed too. Timestamps
+follow a daily cycle plus bursts around breaking-news events. Engagement is
+heavy-tailed (Pareto), with verified accounts drawing more. Rows are
+generated in vectorised chunks and bulk-inserted (executemany on SQLite,
+execute_values on Postgres).
+
+Usage (from the repo root):
+    python -m benchmarks.gen_dataset --rows 2000000                  # bench_data/nigerian_news.db
+    DATABASE_URL=postgresql://localhost/news_bench python -m benchmarks.gen_dataset --rows 2000000
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+import numpy as np
+import main
+
+COLUMNS = [
+    "tweet_id", "author_username", "author_verified", "account_category", "text", "created_at",
+    "likes", "retweets", "replies", "url", "is_retweet", "ingested_at", "processed",
+    "relevance_score", "story_id", "updated_at",
+]
+
+WORDS = (
+    "breaking news update lagos abuja kano rivers fuel price naira dollar senate inec election "
+    "police army governor president tinubu atiku obi minister court strike asuu nlc subsidy "
+    "market traders government today people economy security flood kidnapping bandits protest "
+    "explosion fire accident budget cbn rate inflation hospital school students exam"
+).split()
+
+ZIPF_EXPONENT = 1.1
+BURST_SHARE = 0.3  # Fraction of tweets that belong to a news burst
+BURST_SPREAD_MINUTES = 20
+# Relative tweet volume per hour of the day (quiet overnight, peaks mid-morning and evening)
+HOURLY_WEIGHTS = np.array([2, 1, 1, 1, 1, 2, 4, 7, 9, 10, 10, 9, 8, 8, 8, 8, 9, 9, 10, 10, 9, 7, 5, 3], dtype=float)
+
+
+def author_table(rng):
+    """(usernames, categories, selection probabilities, verified flags) with a Zipf skew"""
+    authors = [(username, category) for category, usernames in main.ACCOUNTS.items() for username in usernames]
+    order = rng.permutation(len(authors))
+    usernames = np.array([authors[i][0] for i in order], dtype=object)
+    categories = np.array([authors[i][1] for i in order], dtype=object)
+    weights = 1.0 / np.arange(1, len(authors) + 1) ** ZIPF_EXPONENT
+    verified = np.arange(len(authors)) < len(authors) // 4  # The busiest accounts tend to be verified
+    return usernames, categories, weights / weights.sum(), verified
+
+
+def timestamps(rng, n, start, end, bursts):
+    """Epoch seconds: a daily cycle for most tweets, clusters after burst events for the rest"""
+    midnight = datetime.fromtimestamp(start).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    days = int((end - midnight) // 86400) + 1
+    hours = rng.choice(24, n, p=HOURLY_WEIGHTS / HOURLY_WEIGHTS.sum())
+    ts = midnight + rng.integers(0, days, n) * 86400 + hours * 3600 + rng.uniform(0, 3600, n)
+
+    in_burst = rng.random(n) < BURST_SHARE
+    centers = rng.choice(bursts, in_burst.sum())
+    ts[in_burst] = centers + np.abs(rng.normal(0, BURST_SPREAD_MINUTES * 60, in_burst.sum()))
+    return np.clip(ts, start, end)
+
+
+def generate_chunk(rng, first_id, n, authors, start, end, bursts):
+    usernames, categories, probabilities, verified_flags = authors
+    who = rng.choice(len(usernames), n, p=probabilities)
+    created = timestamps(rng, n, start, end, bursts)
+    verified = verified_flags[who]
+
+    likes = np.minimum(rng.pareto(1.2, n) * 6 * np.where(verified, 3, 1), 500_000).astype(int)
+    retweets = (likes * rng.beta(2, 10, n)).astype(int)
+    replies = (likes * rng.beta(1.5, 15, n)).astype(int)
+    is_retweet = rng.random(n) < 0.08
+    lengths = rng.integers(6, 40, n)
+    words = rng.integers(0, len(WORDS), (n, 40))
+    lag = rng.exponential(300, n)
+
+    rows = []
+    for i in range(n):
+        tweet_id = str(first_id + i)
+        author = usernames[who[i]]
+        text = " ".join(WORDS[w] for w in words[i, :lengths[i]]).capitalize()
+        if is_retweet[i]:
+            text = f"RT @{usernames[rng.integers(len(usernames))]}: {text}"
+        ingested = str(datetime.fromtimestamp(created[i] + lag[i]))
+        rows.append((
+            tweet_id, author, bool(verified[i]), categories[who[i]], text,
+            datetime.fromtimestamp(created[i]).isoformat(), int(likes[i]), int(retweets[i]), int(replies[i]),
+            f"https://x.com/{author}/status/{tweet_id}", bool(is_retweet[i]), ingested, True,
+            0, tweet_id, ingested,
+        ))
+    return rows
+
+
+def insert_rows(conn, rows):
+    cursor = conn.cursor()
+    if main.get_placeholder(conn) == "?":
+        cursor.executemany(f"INSERT INTO tweets ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+    else:
+        from psycopg2.extras import execute_values
+        execute_values(cursor, f"INSERT INTO tweets ({', '.join(COLUMNS)}) VALUES %s", rows, page_size=10000)
+    conn.commit()
+
+
+def run(rows, days, chunk, seed, workdir):
+    if not os.getenv("DATABASE_URL"):
+        os.makedirs(workdir, exist_ok=True)
+        os.chdir(workdir)
+    conn = main.init_database()
+    is_sqlite = main.get_placeholder(conn) == "?"
+    if is_sqlite:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+
+    rng = np.random.default_rng(seed)
+    authors = author_table(rng)
+    end = time.time()
+    start = end - days * 86400
+    bursts = rng.uniform(start, end, max(days * 3, 1))
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM tweets")
+    existing = cursor.fetchone()[0]
+    first_id = 1_900_000_000_000_000_000 + existing
+
+    started = time.perf_counter()
+    done = 0
+    while done < rows:
+        n = min(chunk, rows - done)
+        insert_rows(conn, generate_chunk(rng, first_id + done, n, authors, start, end, bursts))
+        done += n
+        elapsed = time.perf_counter() - started
+        print(f"  {done:,}/{rows:,} rows ({done / elapsed:,.0f} rows/s)", flush=True)
+
+    cursor.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    where = os.getenv("DATABASE_URL") or os.path.join(os.getcwd(), "nigerian_news.db")
+    print(f"Inserted {rows:,} rows over {days} days into {where} "
+          f"({existing + rows:,} total) in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--chunk", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", default="bench_data", help="where the SQLite database goes (no DATABASE_URL)")
+    args = parser.parse_args()
+    run(args.rows, args.days, args.chunk, args.seed, args.workdir)
@@ -0,0 +1,220 @@
+"""
+Concurrent load test for the read endpoints of api.py.
+
+Each client is a thread with its own keep-alive HTTP connection that picks
+endpoints at random (/tweets with and without filters, /tweets/top,
+/tweets/recent, /tweets/category/{category} and /stats) for a fixed
+duration. Latency percentiles, throughput and errors are reported per
+endpoint. Without --url the API is started as a separate `uvicorn api:app`
+process against the database in --workdir, e.g. one filled by
+benchmarks.gen_dataset; set DATABASE_URL to load-test a local Postgres
+instead. --in-process runs it on a thread here instead, which is quicker to
+start but shares the GIL with the client threads and skews the numbers.
+
+Usage (from the repo root):
+    python -m benchmarks.gen_dataset --rows 2000000
+    python -m benchmarks.load_api --clients 16 --seconds 30
+    python -m benchmarks.load_api --url http://127.0.0.1:8000 --output load.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+from benchmarks.stats import percentile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_SECONDS = 30
+
+# Replaced by the categories /stats reports before the run starts
+CATEGORIES = ["news_outlets", "journalists", "activists"]
+
+# (label, weight, path builder): weights roughly follow how clients use the API
+ENDPOINTS = [
+    ("/tweets", 30, lambda rng: f"/tweets?limit=50&offset={rng.choice((0, 0, 50, 100, 500))}"),
+    ("/tweets?category", 10, lambda rng: f"/tweets?limit=50&category={rng.choice(CATEGORIES)}"),
+    ("/tweets?hours&min_engagement", 5, lambda rng: "/tweets?limit=50&hours=24&min_engagement=100"),
+    ("/tweets/top", 20, lambda rng: f"/tweets/top?limit=20&hours={rng.choice((1, 6, 24))}"),
+    ("/tweets/recent", 20, lambda rng: "/tweets/recent?limit=50"),
+    ("/tweets/category/{category}", 10, lambda rng: f"/tweets/category/{rng.choice(CATEGORIES)}?limit=50"),
+    ("/stats", 5, lambda rng: "/stats"),
+]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_api_process(workdir):
+    """Run `uvicorn api:app` as a child process; returns (base url, process) once it accepts connections"""
+    port = free_port()
+    cwd = REPO_ROOT if os.getenv("DATABASE_URL") else workdir
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "api:app", "--app-dir", REPO_ROOT,
+                                "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"], cwd=cwd)
+    deadline = time.monotonic() + STARTUP_SECONDS
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"API exited with code {process.returncode} before accepting connections")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return f"http://127.0.0.1:{port}", process
+        except OSError:
+            if time.monotonic() > deadline:
+                stop_api_process(process)
+                raise RuntimeError(f"API didn't start within {STARTUP_SECONDS}s")
+            time.sleep(0.1)
+
+
+def stop_api_process(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def start_local_api(workdir):
+    """Run api.app with uvicorn on a background thread; returns (base url, server)"""
+    import uvicorn
+    if not os.getenv("DATABASE_URL"):
+        os.chdir(workdir)
+    from api import app
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="api", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", server
+
+
+def load_categories(base_url):
+    """Categories present in the database, so category requests hit real data"""
+    url = urlparse(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=60)
+    try:
+        conn.request("GET", "/stats")
+        categories = list(json.loads(conn.getresponse().read()).get("categories", {}))
+    except (OSError, ValueError, http.client.HTTPException):
+        categories = []
+    finally:
+        conn.close()
+    if categories:
+        CATEGORIES[:] = [c for c in categories if c]
+
+
+def client(base_url, deadline, seed, samples, errors, endpoints):
+    """Issue requests until the deadline, recording (label -> latencies) and error counts"""
+    rng = random.Random(seed)
+    url = urlparse(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    labels = [label for label, _, _ in endpoints]
+    weights = [weight for _, weight, _ in endpoints]
+    builders = {label: build for label, _, build in endpoints}
+
+    while time.perf_counter() < deadline:
+        label = rng.choices(labels, weights)[0]
+        started = time.perf_counter()
+        try:
+            conn.request("GET", builders[label](rng))
+            response = conn.getresponse()
+            response.read()
+            ok = response.status < 500
+        except (OSError, http.client.HTTPException):
+            ok = False
+            conn.close()
+            conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+        samples[label].append(time.perf_counter() - started)
+        if not ok:
+            errors[label] += 1
+    conn.close()
+
+
+def run(base_url, clients, seconds, endpoints):
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=client, args=(base_url, deadline, seed, samples, errors, endpoints))
+               for seed in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    report = {"url": base_url, "clients": clients, "seconds": round(elapsed, 2), "endpoints": {}}
+    for label, _, _ in endpoints:
+        latencies = samples.get(label, [])
+        if not latencies:
+            continue
+        report["endpoints"][label] = {
+            "requests": len(latencies),
+            "errors": errors[label],
+            "requests_per_second": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p90_ms": round(percentile(latencies, 90) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "max_ms": round(max(latencies) * 1000, 1),
+        }
+    total = sum(len(v) for v in samples.values())
+    report["total"] = {"requests": total, "errors": sum(errors.values()),
+                       "requests_per_second": round(total / elapsed, 1)}
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="API to test (default: start a uvicorn process)")
+    parser.add_argument("--workdir", default="bench_data", help="directory holding nigerian_news.db for the local API")
+    parser.add_argument("--in-process", action="store_true",
+                        help="run the local API on a thread in this process instead of a separate uvicorn")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--only", help="comma-separated endpoint labels to test")
+    parser.add_argument("--output", help="write the report as JSON here")
+    args = parser.parse_args()
+
+    endpoints = ENDPOINTS
+    if args.only:
+        wanted = set(args.only.split(","))
+        endpoints = [e for e in ENDPOINTS if e[0] in wanted]
+
+    server = process = None
+    base_url = args.url
+    if not base_url and args.in_process:
+        base_url, server = start_local_api(args.workdir)
+    elif not base_url:
+        base_url, process = start_api_process(args.workdir)
+
+    try:
+        load_categories(base_url)
+        report = run(base_url, args.clients, args.seconds, endpoints)
+    finally:
+        if server:
+            server.should_exit = True
+        if process:
+            stop_api_process(process)
+
+    print(f"{args.clients} clients for {report['seconds']}s against {base_url}")
+    print(f"{'endpoint':32s} {'reqs':>7s} {'err':>5s} {'req/s':>8s} {'p50':>8s} {'p90':>8s} {'p99':>8s} {'max':>8s}")
+    for label, r in report["endpoints"].items():
+        print(f"{label:32s} {r['requests']:7d} {r['errors']:5d} {r['requests_per_second']:8.1f} "
+              f"{r['p50_ms']:6.1f}ms {r['p90_ms']:6.1f}ms {r['p99_ms']:6.1f}ms {r['max_ms']:6.1f}ms")
+    t = report["total"]
+    print(f"{'total':32s} {t['requests']:7d} {t['errors']:5d} {t['requests_per_second']:8.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,227 @@
+"""
+Local stand-in for x.com that replays profile timelines.
+
+Profile pages (/<username>) are a small shell that renders tweets from a
+paginated JSON endpoint (/i/api/UserTweets) as the page is scrolled, using
+the same data-testid markup the scraper reads. A loading spinner is shown
+while a page of tweets is in flight, and nothing more is loaded once the
+timeline runs out. API responses can be slowed down (latency + jitter) and
+made to fail at a given rate, in which case the page shows X's "Something
+went wrong" message.
+
+Timelines come from recorded JSON files (<username>.json: a list of
+{"tweet_id", "text", "created_at" (epoch), "likes", "retweets", "replies"})
+or are generated. Either way they are shifted so the newest tweet is a
+minute old when served, so replays always fall inside the scrape window.
+
+Usage (from the repo root):
+    python -m benchmarks.replay_server --port 8765 --latency-ms 200 --failure-rate 0.05
+    X_BASE_URL=http://127.0.0.1:8765 python main.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+PAGE_SIZE = 10
+
+WORDS = (
+    "breaking news lagos abuja fuel price naira senate inec election police tinubu "
+    "update market traders government today people economy security governor kano"
+).split()
+
+PROFILE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>@__USERNAME__ / X</title>
+<style>article { min-height: 240px; border-bottom: 1px solid #eee; }</style></head>
+<body><main><div id="timeline"></div><div id="status"></div></main>
+<script>
+const username = "__USERNAME__";
+let cursor = 0, loading = false;
+const esc = (s) => s.replace(/[&<>"]/g, (c) => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]));
+function render(t) {
+    const el = document.createElement("div");
+    el.setAttribute("data-testid", "cellInnerDiv");
+    el.innerHTML = `<article data-testid="tweet">
+        <div data-testid="User-Name"><div>${esc(t.name)}</div><div>@${username}</div></div>
+        <a href="/${username}/status/${t.tweet_id}"><time datetime="${t.datetime}">${t.relative}</time></a>
+        <div data-testid="tweetText">${esc(t.text)}</div>
+        <div role="group">
+            <button data-testid="reply" aria-label="${t.replies} replies. Reply"></button>
+            <button data-testid="retweet" aria-label="${t.retweets} reposts. Repost"></button>
+            <button data-testid="like" aria-label="${t.likes} likes. Like"></button>
+        </div></article>`;
+    document.getElementById("timeline").appendChild(el);
+}
+async function loadMore() {
+    if (loading || cursor === null) return;
+    loading = true;
+    const status = document.getElementById("status");
+    status.innerHTML = '<div role="progressbar">Loading</div>';
+    try {
+        const response = await fetch(`/i/api/UserTweets?username=${username}&cursor=${cursor}`);
+        if (response.status === 404) {
+            status.innerHTML = '<div data-testid="emptyState">This account doesn’t exist</div>';
+            cursor = null;
+            return;
+        }
+        if (!response.ok) throw new Error(response.status);
+        const page = await response.json();
+        page.tweets.forEach(render);
+        cursor = page.next_cursor;
+        status.innerHTML = "";
+    } catch (e) {
+        status.innerHTML = '<div data-testid="error-detail">Something went wrong. Try reloading.</div>';
+    } finally {
+        loading = false;
+    }
+}
+window.addEventListener("scroll", () => {
+    if (window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 1500) loadMore();
+});
+loadMore();
+</script></body></html>
+"""
+
+
+def synthetic_timeline(username, n=60, spacing_seconds=45, seed=None):
+    """n tweets, newest first, spacing_seconds apart"""
+    rng = random.Random(seed if seed is not None else username)
+    now = time.time()
+    base_id = 1_860_000_000_000_000_000 + rng.randrange(10 ** 12)
+    return [{
+        "tweet_id": str(base_id - i),
+        "text": " ".join(rng.choices(WORDS, k=rng.randint(8, 30))).capitalize(),
+        "created_at": now - i * spacing_seconds,
+        "likes": rng.randint(0, 500),
+        "retweets": rng.randint(0, 100),
+        "replies": rng.randint(0, 60),
+    } for i in range(n)]
+
+
+def load_timelines(directory):
+    """Recorded timelines keyed by username from <username>.json files"""
+    timelines = {}
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            timelines[path.stem] = sorted(json.load(f), key=lambda t: t["created_at"], reverse=True)
+    return timelines
+
+
+def relative_time(age_seconds):
+    if age_seconds < 60:
+        return f"{int(age_seconds)}s"
+    if age_seconds < 3600:
+        return f"{int(age_seconds // 60)}m"
+    return f"{int(age_seconds // 3600)}h"
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, timelines, latency_ms=0, jitter_ms=0, failure_rate=0.0, seed=42):
+        super().__init__(address, ReplayHandler)
+        self.timelines = timelines
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a background thread"""
+        threading.Thread(target=self.serve_forever, name="replay-server", daemon=True).start()
+        return self
+
+    def timeline_page(self, username, cursor):
+        """One page of tweets, shifted so the newest is a minute old"""
+        tweets = self.timelines[username]
+        shift = time.time() - 60 - tweets[0]["created_at"] if tweets else 0
+        now = time.time()
+        page = []
+        for t in tweets[cursor:cursor + PAGE_SIZE]:
+            created = t["created_at"] + shift
+            page.append({
+                **t,
+                "created_at": created,
+                "name": username,
+                "datetime": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(created)),
+                "relative": relative_time(now - created),
+            })
+        next_cursor = cursor + PAGE_SIZE if cursor + PAGE_SIZE < len(tweets) else None
+        return {"tweets": page, "next_cursor": next_cursor}
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, status, body, content_type):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+
+        if parsed.path == "/i/api/UserTweets":
+            query = parse_qs(parsed.query)
+            username = query.get("username", [""])[0]
+            server.requests += 1
+            delay = server.latency_ms + server.rng.uniform(-server.jitter_ms, server.jitter_ms)
+            time.sleep(max(delay, 0) / 1000)
+            if username not in server.timelines:
+                return self.send(404, json.dumps({"errors": ["not found"]}), "application/json")
+            if server.rng.random() < server.failure_rate:
+                server.failures += 1
+                return self.send(500, json.dumps({"errors": ["replay failure"]}), "application/json")
+            page = server.timeline_page(username, int(query.get("cursor", ["0"])[0]))
+            return self.send(200, json.dumps(page), "application/json")
+
+        username = parsed.path.strip("/")
+        if not username or "/" in username:
+            return self.send(404, "Not found", "text/plain")
+        self.send(200, PROFILE_HTML.replace("__USERNAME__", username), "text/html; charset=utf-8")
+
+
+def build_server(accounts, port=0, timelines_dir=None, tweets_per_account=60, **options):
+    """Replay server for the given usernames (recorded timelines where available)"""
+    timelines = load_timelines(timelines_dir) if timelines_dir else {}
+    for username in accounts:
+        timelines.setdefault(username, synthetic_timeline(username, tweets_per_account))
+    return ReplayServer(("127.0.0.1", port), timelines, **options)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timelines", help="directory of recorded <username>.json timelines")
+    parser.add_argument("--accounts", default="", help="comma-separated usernames to generate timelines for")
+    parser.add_argument("--tweets", type=int, default=60, help="tweets per generated timeline")
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    accounts = [a for a in args.accounts.split(",") if a]
+    if not accounts and not args.timelines:
+        from main import ACCOUNTS
+        accounts = [u for usernames in ACCOUNTS.values() for u in usernames]
+    server = build_server(accounts, args.port, args.timelines, args.tweets, latency_ms=args.latency_ms,
+                          jitter_ms=args.jitter_ms, failure_rate=args.failure_rate)
+    print(f"Replaying {len(server.timelines)} timelines at {server.base_url}")
+    server.serve_forever()
@@ -0,0 +1,12 @@
+"""Summary statistics shared by the benchmark scripts."""
+
+
+def percentile(values, p):
+    """Linear-interpolated p-th percentile (0-100) of values"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
@@ -4,30 +4,52 @@ Scrapes tweets from X (Twitter) without API requirements
 Features: Exponential backoff, 60-min time filter, enhanced schema
 """
 
+import argparse
 import asyncio
 from playwright.async_api import async_playwright, Page
 from playwright_stealth import Stealth
 import psycopg2
 from psycopg2.extras import RealDictCursor
-import json
 from datetime import datetime, timedelta
 import logging
 import random
 import re
 import os
-from pathlib import Path
-
-# Setup logging
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_dir / f"scraper_{datetime.now().strftime('%Y-%m-%d')}.log"),
-        logging.StreamHandler()
-    ]
+import signal
+import time
+from contextlib import nullcontext
+from src.config import (
+    NEWS_KEYWORDS, JSON_PATH, EXPORT_HOURS, ADAPTIVE_POLLING, POLL_TARGET_YIELD, WORKER_PUBLISH, RETRY_BUDGET,
+    PIPELINE_QUEUE_SIZE, BLOCK_MEDIA, METRICS_PORT, PROFILE_CYCLES,
+    SCRAPE_INTERVAL_SECONDS, BROWSER_RECYCLE_CYCLES, BROWSER_MAX_RSS_MB,
+    SCROLL_KEEP_ARTICLES, SCROLL_MAX_RSS_MB, MEMORY_SAMPLE_SCROLLS,
+)
+from src.batch import filter_and_enrich, rescore_table
+from src.stories import init_story_index, prune_story_index, cluster_tweets
+from src.database import get_placeholder, to_db_timestamp
+from src.trends import init_trend_store, record_trends
+from src.entities import init_entity_store, tag_entities, store_entities
+from src.export import stream_export
+from src.archive import archive_old_tweets
+from src.feeds import publish_feeds
+from src.deltas import export_delta
+from src.memory import child_processes_rss_mb
+from src.pagepool import PagePool, block_heavy_resources
+from src.instrumentation import AccountTimer, CycleSummary
+from src.metrics import serve_metrics
+from src.profiling import CycleProfiler
+from src.logconfig import setup_logging
+from src.waits import scroll_and_wait, ScrollWaits, FIXED_WAIT_MS, TIMELINE_END, WAIT_TIMED_OUT
+from src.polling import init_schedule_store, PollingScheduler, freshness_report
+from src.leases import init_lease_store, WorkQueue, default_worker_id
+from src.checkpoint import init_checkpoint_store, CycleJournal
+from src.pipeline import Pipeline, DbExecutor
+from src.records import TweetRecord
+from src.breaker import (
+    init_breaker_store, CircuitBreakers, RetryBudget, ScrapeFailure,
+    RETRYABLE, TIMEOUT, EMPTY, MISSING, LOGIN_WALL, ERROR,
 )
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -44,6 +66,9 @@ USER_AGENTS = [
 
 TIME_WINDOW_MINUTES = 60  # Only scrape tweets from last 60 minutes
 
+# Where profiles are loaded from; point at benchmarks/replay_server.py to scrape offline
+X_BASE_URL = os.getenv("X_BASE_URL", "https://x.com")
+
 ACCOUNTS = {
     "news_outlets": [
         "channelstv", "guardian", "PremiumTimesNG", "SaharaReporters", "TheCablNG",
@@ -100,7 +125,11 @@ def get_db_connection():
         # Fallback to local SQLite for development if no URL provided
         logger.warning("DATABASE_URL not set, falling back to SQLite 'nigerian_news.db'")
         import sqlite3
-        return sqlite3.connect("nigerian_news.db")
+        conn = sqlite3.connect("nigerian_news.db", timeout=30)
+        # The ingest DbExecutor writes on its own connection while the loop thread
+        # updates the schedule/journal; WAL lets readers and one writer overlap
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
     return psycopg2.connect(db_url)
 
 def init_database():
@@ -128,7 +157,10 @@ def init_database():
                 url TEXT,
                 is_retweet BOOLEAN DEFAULT FALSE,
                 ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                processed BOOLEAN DEFAULT FALSE
+                processed BOOLEAN DEFAULT FALSE,
+                relevance_score INTEGER DEFAULT 0,
+                story_id TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
     else:
@@ -148,7 +180,10 @@ def init_database():
                 url TEXT,
                 is_retweet BOOLEAN DEFAULT FALSE,
                 ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                processed BOOLEAN DEFAULT FALSE
+                processed BOOLEAN DEFAULT FALSE,
+                relevance_score INTEGER DEFAULT 0,
+                story_id TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
     
@@ -166,7 +201,10 @@ def init_database():
     columns_to_add = [
         ("author_verified", "BOOLEAN DEFAULT FALSE"),
         ("ingested_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
-        ("processed", "BOOLEAN DEFAULT FALSE")
+        ("processed", "BOOLEAN DEFAULT FALSE"),
+        ("relevance_score", "INTEGER DEFAULT 0"),
+        ("story_id", "TEXT"),
+        ("updated_at", "TIMESTAMP")  # SQLite can't add a column with a non-constant default
     ]
     
     for col_name, col_type in columns_to_add:
@@ -178,18 +216,30 @@ def init_database():
         except Exception:
             pass # Column likely exists (SQLite throws error if exists)
             
+    # Backfill rows stored before updated_at existed so delta exports see them
+    cursor.execute("UPDATE tweets SET updated_at = ingested_at WHERE updated_at IS NULL")
+    if is_sqlite:
+        # Delta exports compare updated_at with ISO strings (to_db_timestamp); rewrite values stored in
+        # SQLite's space-separated form so both sort the same way
+        cursor.execute("UPDATE tweets SET updated_at = REPLACE(updated_at, ' ', 'T') WHERE updated_at LIKE '% %'")
     conn.commit()
+    
+    try:
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_story_id ON tweets(story_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_updated_at ON tweets(updated_at, tweet_id)")
+    except Exception as e:
+        logger.warning(f"Error creating indexes: {e}")
+    
+    init_story_index(conn)
+    init_trend_store(conn)
+    init_entity_store(conn)
+    init_schedule_store(conn)
+    init_breaker_store(conn)
+    init_checkpoint_store(conn)
+    init_lease_store(conn)
     logger.info("Database initialized successfully")
     return conn
 
-def get_placeholder(conn):
-    """Return SQL placeholder based on connection type"""
-    # Check if SQLite (has execute but no status)
-    if hasattr(conn, 'execute') and not hasattr(conn, 'status'):
-        return "?"
-    return "%s"
-    
-
 def check_tweet_exists(conn, tweet_id):
     """Check if tweet already exists in database"""
     cursor = conn.cursor()
@@ -256,228 +306,505 @@ def is_within_time_window(timestamp_str, window_minutes=TIME_WINDOW_MINUTES):
 # 4. PLAYWRIGHT SCRAPING
 # ============================================================================
 
-async def scrape_account_tweets(page: Page, username: str, category: str, conn, max_tweets: int = 50) -> list:
+# Elements X renders instead of a timeline for suspended/missing accounts or a login wall
+DEAD_END_SELECTOR = '[data-testid="emptyState"], [data-testid="error-detail"], input[autocomplete="username"]'
+MISSING_ACCOUNT_MARKERS = ("account suspended", "this account doesn’t exist", "this account doesn't exist")
+
+# Reads every article not seen yet in one round trip and returns plain data, tagging the
+# articles as read. Read articles beyond the last `keep` lose their images and videos, which
+# are most of a long timeline's memory (the nodes stay so X's virtual list keeps its layout).
+EXTRACT_ARTICLES_JS = """
+(keep) => {
+    const label = (article, id) => {
+        const el = article.querySelector(`[data-testid="${id}"]`);
+        return el ? el.getAttribute("aria-label") || "" : "";
+    };
+    const rows = [];
+    for (const article of document.querySelectorAll('article[data-testid="tweet"]:not([data-scraped])')) {
+        article.setAttribute("data-scraped", "1");
+        const text = article.querySelector('div[data-testid="tweetText"]');
+        const user = article.querySelector('div[data-testid="User-Name"]');
+        const time = article.querySelector("time");
+        const link = article.querySelector('a[href*="/status/"]');
+        rows.push({
+            text: text ? text.innerText : "",
+            user: user ? user.innerText : "",
+            likes: label(article, "like"),
+            retweets: label(article, "retweet"),
+            replies: label(article, "reply"),
+            time: time ? time.innerText : "",
+            datetime: time ? time.getAttribute("datetime") : null,
+            href: link ? link.getAttribute("href") : "",
+        });
+    }
+    const read = document.querySelectorAll('article[data-scraped]');
+    for (let i = 0; i < read.length - keep; i++) {
+        read[i].querySelectorAll("img, video").forEach((el) => el.remove());
+    }
+    return rows;
+}
+"""
+
+# Scroll wait timeouts learned per account over the life of the process
+SCROLL_WAITS = ScrollWaits()
+
+def parse_count(label: str, noun: str) -> int:
+    """Pull the count out of an aria-label like '1234 likes. Like'"""
+    match = re.search(rf'(\d+) {noun}', label or "")
+    return int(match.group(1)) if match else 0
+
+def article_to_record(raw: dict, username: str, category: str):
+    """Build a TweetRecord from one EXTRACT_ARTICLES_JS row (None if it isn't a usable tweet)"""
+    tweet_url = raw.get("href") or ""
+    id_match = re.search(r'/status/(\d+)', tweet_url)
+    tweet_text = raw.get("text") or ""
+    if not id_match or not tweet_text:
+        return None
+    
+    if raw.get("datetime"):
+        created_at = datetime.fromisoformat(raw["datetime"].replace("Z", "+00:00")).timestamp()
+    else:
+        created_at = datetime.fromisoformat(parse_relative_time(raw.get("time", ""))).timestamp()
+    
+    user_text = raw.get("user") or ""
+    return TweetRecord(
+        tweet_id=int(id_match.group(1)),
+        author_username=username,
+        author_verified="Verified account" in user_text or "\n" in user_text,  # Rough check, better to check SVG
+        category=category,
+        text=tweet_text,
+        likes=parse_count(raw.get("likes"), "likes"),
+        retweets=parse_count(raw.get("retweets"), "reposts"),
+        replies=parse_count(raw.get("replies"), "replies"),
+        url=f"https://x.com{tweet_url}",
+        is_retweet=tweet_text.startswith("RT @"),
+        created_at=created_at,
+    )
+
+async def classify_failure(page: Page, nav_timed_out: bool) -> str:
+    """Work out why an account page shows no tweets"""
+    if "/login" in page.url or "/i/flow/" in page.url or await page.query_selector('input[autocomplete="username"]'):
+        return LOGIN_WALL
+    try:
+        body = (await page.inner_text("body")).lower()
+    except Exception:
+        body = ""
+    if any(marker in body for marker in MISSING_ACCOUNT_MARKERS):
+        return MISSING
+    if "something went wrong" in body:
+        return ERROR  # Rate limiting or a transient X error
+    if nav_timed_out or not body.strip():
+        return TIMEOUT
+    return EMPTY
+
+async def scrape_account_tweets(page: Page, username: str, category: str, conn, max_tweets: int = 50,
+                                window_minutes: float = TIME_WINDOW_MINUTES, timer: AccountTimer = None) -> list:
     """Scrape recent tweets from a single X account using Playwright (Best Practices)"""
+    timer = timer or AccountTimer(username, category)
     tweets = []
-    url = f"https://x.com/{username}"
+    url = f"{X_BASE_URL}/{username}"
+    waits = 0
+    waited_ms = 0.0
     
     try:
         logger.info(f"Navigating to @{username}...")
         
         # Fast navigation
+        nav_timed_out = False
         try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=45000)
+            with timer.phase("navigation"):
+                await page.goto(url, wait_until="domcontentloaded", timeout=45000)
         except Exception:
+            nav_timed_out = True
             logger.warning(f"Navigation timeout for @{username}, checking content...")
             
-        # Wait for tweets to load using robust selector
+        # Wait for tweets, or for a page that will never show any (suspended, login wall)
         try:
-            await page.wait_for_selector('article[data-testid="tweet"]', timeout=15000)
+            with timer.phase("first_article"):
+                await page.wait_for_selector(f'article[data-testid="tweet"], {DEAD_END_SELECTOR}', timeout=15000)
         except Exception:
-            logger.warning(f"No tweets found on @{username}")
-            return tweets
+            pass
+        if not await page.query_selector('article[data-testid="tweet"]'):
+            kind = await classify_failure(page, nav_timed_out)
+            logger.warning(f"No tweets found on @{username} ({kind})")
+            raise ScrapeFailure(kind, f"no tweets on @{username}")
             
         tweets_loaded = 0
         consecutive_duplicates = 0
+        consecutive_stale = 0
+        seen = set()
+        scrolls = 0
+        consecutive_timeouts = 0
+        consecutive_ends = 0
+        cutoff = time.time() - window_minutes * 60
         
-        # Dynamic scrolling loop
+        # Dynamic scrolling loop. Each pass is one evaluate() call that returns plain data for the
+        # articles not read yet and strips media from older ones, so no ElementHandles are held
+        # and the page's memory stays bounded however long the session scrolls.
         while tweets_loaded < max_tweets:
-            # Robust extraction using data-testid
-            articles = await page.query_selector_all('article[data-testid="tweet"]')
-            
-            for article in articles:
+            with timer.phase("extraction"):
+                rows = await page.evaluate(EXTRACT_ARTICLES_JS, SCROLL_KEEP_ARTICLES)
+            for raw in rows:
                 if tweets_loaded >= max_tweets:
                     break
                     
                 try:
-                    # Extract text using data-testid
-                    text_elem = await article.query_selector('div[data-testid="tweetText"]')
-                    if not text_elem:
-                        continue
-                    tweet_text = await text_elem.inner_text()
-                    
-                    # Extract User-Name (for verification/handle)
-                    user_elem = await article.query_selector('div[data-testid="User-Name"]')
-                    user_text = await user_elem.inner_text() if user_elem else ""
-                    is_verified = "Verified account" in user_text or "\n" in user_text # Rough check, better to check SVG
-                    
-                    # Extract metrics using data-testid
-                    likes = 0
-                    retweets = 0
-                    replies = 0
-                    
-                    like_elem = await article.query_selector('[data-testid="like"]')
-                    retweet_elem = await article.query_selector('[data-testid="retweet"]')
-                    reply_elem = await article.query_selector('[data-testid="reply"]')
-                    
-                    if like_elem:
-                        val = await like_elem.get_attribute("aria-label")
-                        if val: likes = int(re.search(r'(\d+) likes', val).group(1)) if re.search(r'(\d+) likes', val) else 0
-                            
-                    if retweet_elem:
-                        val = await retweet_elem.get_attribute("aria-label")
-                        if val: retweets = int(re.search(r'(\d+) reposts', val).group(1)) if re.search(r'(\d+) reposts', val) else 0
-                            
-                    if reply_elem:
-                        val = await reply_elem.get_attribute("aria-label")
-                        if val: replies = int(re.search(r'(\d+) replies', val).group(1)) if re.search(r'(\d+) replies', val) else 0
-
-                    # Extract timestamp and URL
-                    time_elem = await article.query_selector('time')
-                    link_elem = await article.query_selector('a[href*="/status/"]')
-                    
-                    time_str = await time_elem.inner_text() if time_elem else ""
-                    tweet_url = await link_elem.get_attribute('href') if link_elem else ""
-                    
-                    tweet_id = tweet_url.split('/status/')[-1].split('?')[0] if '/status/' in tweet_url else ""
-                    
-                    if tweet_id and tweet_text:
-                        created_at = parse_relative_time(time_str)
-                        
-                        if not is_within_time_window(created_at):
-                            continue
-                            
-                        if check_tweet_exists(conn, tweet_id):
-                            consecutive_duplicates += 1
-                            if consecutive_duplicates >= 5:
-                                return tweets
-                            continue
-                        
-                        consecutive_duplicates = 0
-                        
-                        tweets.append({
-                            "tweet_id": tweet_id,
-                            "author_username": username,
-                            "author_verified": is_verified,
-                            "category": category,
-                            "text": tweet_text,
-                            "likes": likes,
-                            "retweets": retweets,
-                            "replies": replies,
-                            "url": f"https://x.com{tweet_url}" if tweet_url else "",
-                            "is_retweet": tweet_text.startswith("RT @"),
-                            "created_at": created_at,
-                        })
-                        tweets_loaded += 1
-                        
+                    tweet = article_to_record(raw, username, category)
                 except Exception as e:
                     logger.warning(f"Error extracting tweet: {e}")
                     continue
+                if tweet is None or tweet.tweet_id in seen:
+                    continue
+                seen.add(tweet.tweet_id)
+                
+                if tweet.created_at < cutoff:
+                    # Past the window: a pinned tweet or repost can be old, a run of them means we're done
+                    consecutive_stale += 1
+                    if consecutive_stale >= 5:
+                        logger.info(f"✓ Scraped {len(tweets)} tweets from @{username} (reached the time window)")
+                        return tweets
+                    continue
+                consecutive_stale = 0
+                    
+                with timer.phase("dedup"):
+                    exists = check_tweet_exists(conn, tweet.key)
+                if exists:
+                    consecutive_duplicates += 1
+                    if consecutive_duplicates >= 5:
+                        return tweets
+                    continue
+                
+                consecutive_duplicates = 0
+                tweets.append(tweet)
+                tweets_loaded += 1
             
-            # Dynamic scroll
-            await page.mouse.wheel(0, 2000)
-            await page.wait_for_timeout(1500)
+            scrolls += 1
+            if scrolls % MEMORY_SAMPLE_SCROLLS == 0:
+                rss_mb = child_processes_rss_mb()
+                if rss_mb is not None and rss_mb > SCROLL_MAX_RSS_MB:
+                    # The pooled pages are drained after this account (see scrape_accounts)
+                    logger.warning(f"Browser at {rss_mb:.0f} MB > {SCROLL_MAX_RSS_MB} MB while scrolling @{username}, "
+                                   f"stopping early with {tweets_loaded} tweets")
+                    break
             
-            # Check if end of page (optional, or just rely on loop limit)
+            # Scroll and wait only as long as it takes the next articles to render. A short learned
+            # timeout can expire at the bottom while X is still fetching, so an apparent end is
+            # confirmed by a second wait of at least the old fixed sleep before giving up.
+            timeout_ms = SCROLL_WAITS.timeout_ms(username)
+            if consecutive_ends:
+                timeout_ms = max(timeout_ms, FIXED_WAIT_MS)
+            with timer.phase("scroll"):
+                outcome, ms = await scroll_and_wait(page, lambda: page.mouse.wheel(0, 2000), timeout_ms)
+            SCROLL_WAITS.observe(username, outcome, ms)
+            waits += 1
+            waited_ms += ms
+            consecutive_ends = consecutive_ends + 1 if outcome == TIMELINE_END else 0
+            if consecutive_ends >= 2:
+                logger.info(f"Reached the end of @{username}'s timeline")
+                break
+            consecutive_timeouts = consecutive_timeouts + 1 if outcome == WAIT_TIMED_OUT else 0
+            if consecutive_timeouts >= 3:
+                logger.warning(f"@{username}'s timeline stopped loading, ending scroll")
+                break
             
         logger.info(f"✓ Scraped {len(tweets)} tweets from @{username}")
         return tweets
+    except ScrapeFailure:
+        raise
     except Exception as e:
-        logger.error(f"Error scraping @{username}: {e}")
-        return tweets
+        # Propagate so the pool retires the page instead of handing it to the next account;
+        # the caller retries on a fresh page
+        logger.error(f"Error scraping @{username} after {len(tweets)} tweets: {e}")
+        raise
+    finally:
+        if waits:
+            fixed_ms = waits * FIXED_WAIT_MS
+            logger.info(f"⏱️ @{username}: waited {waited_ms / 1000:.1f}s over {waits} scrolls "
+                        f"(fixed sleeps: {fixed_ms / 1000:.1f}s, saved {(fixed_ms - waited_ms) / 1000:.1f}s)")
 
-async def main():
-    """Main execution function"""
-    logger.info("🚀 Starting Nigerian News Scraper (Production)...")
-    logger.info(f"Time window: Last {TIME_WINDOW_MINUTES} minutes")
+async def launch_browser(p):
+    """Launch Firefox with the saved login state and stealth applied"""
+    # Use Firefox
+    browser_type = p.firefox
     
-    # Initialize DB
-    conn = init_database()
+    # Check for storage state
+    storage_state = "twitter_state.json" if os.path.exists("twitter_state.json") else None
+    
+    if not storage_state:
+        logger.warning("No twitter_state.json found! Running in logged-out mode (limited).")
+    
+    browser = await browser_type.launch(headless=True)
     
-    # Flatten accounts list
-    accounts_dict = ACCOUNTS
+    context = await browser.new_context(
+        storage_state=storage_state,
+        viewport={'width': 1920, 'height': 1080}
+    )
+    
+    # Apply stealth to context
+    await Stealth().apply_stealth_async(context)
+    
+    return browser, context
+
+def claim_accounts(queue, scheduler, stop_event=None):
+    """Lease due accounts one at a time until none are left (worker mode)"""
+    usernames = list(scheduler.state)
+    while not (stop_event and stop_event.is_set()):
+        row = queue.claim(usernames)
+        if row is None:
+            return
+        scheduler.adopt(row)
+        username = row["username"]
+        yield scheduler.state[username]["category"], username, scheduler.window_minutes(username)
+
+async def scrape_accounts(context, conn, accounts_dict=None, stop_event=None, adaptive=ADAPTIVE_POLLING,
+                          queue=None, journal=None, db_factory=get_db_connection, summary: CycleSummary = None,
+                          db: DbExecutor = None) -> list:
+    """Scrape the accounts due this cycle (all of them unless adaptive), streaming each into storage.
+
+    Pass a long-lived DbExecutor as db to keep its connection across cycles; otherwise one is opened
+    with db_factory for this call.
+    """
+    accounts_dict = accounts_dict or ACCOUNTS
     all_tweets = []
-    failure_tracker = {}
+    breakers = CircuitBreakers(conn)
+    retry_budget = RetryBudget(RETRY_BUDGET)
     
-    async with async_playwright() as p:
-        # Use Firefox
-        browser_type = p.firefox
-        
-        # Check for storage state
-        storage_state = "twitter_state.json" if os.path.exists("twitter_state.json") else None
-        
-        if not storage_state:
-            logger.warning("No twitter_state.json found! Running in logged-out mode (limited).")
-        
-        browser = await browser_type.launch(headless=True)
-        
-        context = await browser.new_context(
-            storage_state=storage_state,
-            viewport={'width': 1920, 'height': 1080}
-        )
-        
-        # Apply stealth to context
-        await Stealth().apply_stealth_async(context)
-        
-        for category, usernames in accounts_dict.items():
-            logger.info(f"\n{'='*60}")
-            logger.info(f"Scraping {category}...")
-            logger.info(f"{'='*60}")
+    if queue is not None:
+        # Without adaptive polling, workers visit every account once per floor interval
+        scheduler = PollingScheduler(conn, accounts_dict, target_yield=POLL_TARGET_YIELD if adaptive else 0)
+        queue.sync(scheduler.state)
+        plan = claim_accounts(queue, scheduler, stop_event)
+        logger.info(f"📅 Worker {queue.worker_id} claiming due accounts")
+    elif adaptive:
+        scheduler = PollingScheduler(conn, accounts_dict)
+        plan = scheduler.due_accounts()
+        logger.info(f"📅 {len(plan)}/{len(scheduler.state)} accounts due this cycle")
+    else:
+        scheduler = None
+        plan = [(category, username, None) for category, usernames in accounts_dict.items() for username in usernames]
+    
+    def checkpoint_writes(db_conn, batch):
+        # Runs on the DB thread, so these commits don't hold up the event loop
+        username = batch["username"]
+        if scheduler:
+            scheduler.record(username, batch["raw"], batch["started"], batch["finished"], conn=db_conn)
+        if journal:
+            journal.mark_done(username, "done", len(batch["raw"]), conn=db_conn)
+        if queue:
+            queue.release(username, conn=db_conn)
+    
+    async def checkpoint(batch):
+        username = batch["username"]
+        all_tweets.extend(batch["raw"])
+        if queue:
+            # Leased until now so no other worker claims it while its tweets were in the pipeline
+            queue.unhold(username)
+        if scheduler or journal or queue:
+            await db.run(checkpoint_writes, batch)
+        lags.append(time.time() - batch["finished"])
+        logger.info(f"💾 Stored {len(batch['tweets'])}/{len(batch['raw'])} tweets from @{username}")
+    
+    lags = []
+    rss_samples = []
+    own_db = db is None
+    if own_db:
+        db = DbExecutor(db_factory)
+    pipeline = build_ingest_pipeline(db, checkpoint, summary).start()
+    pool = PagePool(context, setup=block_heavy_resources if BLOCK_MEDIA else None)
+    
+    try:
+        current_category = None
+        for category, username, window in plan:
+            if category != current_category:
+                current_category = category
+                logger.info(f"\n{'='*60}")
+                logger.info(f"Scraping {category}...")
+                logger.info(f"{'='*60}")
             
-            for username in usernames:
-                # Exponential backoff retry logic
-                max_retries = 3
-                base_delay = 1
-                
-                for attempt in range(max_retries):
-                    try:
-                        # Create a fresh page for each account to avoid closure issues
-                        page = await context.new_page()
-                        
-                        tweets = await scrape_account_tweets(page, username, category, conn, max_tweets=50)
-                        all_tweets.extend(tweets)
-                        
-                        # Close the page after scraping
-                        await page.close()
-                        
-                        # Reset failure tracker on success
-                        failure_tracker[username] = 0
-                        break
-                        
-                    except Exception as e:
-                        logger.warning(f"Attempt {attempt+1}/{max_retries} failed for @{username}: {e}")
-                        
-                        # Track consecutive failures
-                        failure_tracker[username] = failure_tracker.get(username, 0) + 1
-                        
-                        if attempt < max_retries - 1:
-                            # Exponential backoff: 1s, 2s, 4s
-                            delay = base_delay * (2 ** attempt)
-                            logger.info(f"Waiting {delay}s before retry...")
-                            await asyncio.sleep(delay)
-                        else:
-                            logger.error(f"Failed to scrape @{username} after {max_retries} attempts")
-                            
-                            # Alert if consecutive failures > 3
-                            if failure_tracker[username] > 3:
-                                logger.critical(f"ALERT: @{username} has failed {failure_tracker[username]} consecutive times!")
+            # Shutdown requested: stop between accounts and keep what we have
+            if stop_event and stop_event.is_set():
+                logger.info("Stop requested, ending scrape early")
+                break
+            
+            # Finished before an interrupted run stopped
+            if journal and journal.is_done(username):
+                continue
+            
+            # Infrequently polled accounts look back to their previous visit
+            window_minutes = max(window or 0, TIME_WINDOW_MINUTES)
+            timer = summary.account(username, category) if summary else None
+            
+            # Dead accounts sit out their cool-down instead of burning cycle time
+            if not breakers.allow(username):
+                logger.info(f"⏸️ Skipping @{username}: circuit open")
+                if timer:
+                    timer.finish("circuit_open")
+                if queue:
+                    queue.release(username, retry_at=breakers.retry_at(username))
+                continue
+            
+            # Exponential backoff retry logic, bounded by the cycle's retry budget
+            max_retries = 3
+            base_delay = 1
+            succeeded = False
+            
+            # The lease is heartbeated until the account is checkpointed (or released on failure below)
+            if queue:
+                queue.hold(username)
+            for attempt in range(max_retries):
+                try:
+                    started = time.time()
+                    # A warmed page from the pool; it's retired rather than reused if the scrape fails
+                    async with pool.page() as page:
+                        tweets = await scrape_account_tweets(page, username, category, conn, max_tweets=50,
+                                                             window_minutes=window_minutes, timer=timer)
+                    finished = time.time()
+                    breakers.record_success(username)
+                    succeeded = True
+                    break
                 
-                # Be respectful to the server - wait between requests
-                await asyncio.sleep(3)
-        
-        await browser.close()
+                except Exception as e:
+                    kind = e.kind if isinstance(e, ScrapeFailure) else ERROR
+                    logger.warning(f"Attempt {attempt+1}/{max_retries} failed for @{username} ({kind}): {e}")
+                    
+                    if kind in RETRYABLE and attempt < max_retries - 1 and retry_budget.take():
+                        # Exponential backoff: 1s, 2s, 4s
+                        delay = base_delay * (2 ** attempt)
+                        logger.info(f"Waiting {delay}s before retry ({retry_budget.remaining} retries left this cycle)...")
+                        await asyncio.sleep(delay)
+                        continue
+                    
+                    logger.error(f"Failed to scrape @{username} after {attempt+1} attempt(s): {kind}")
+                    if kind != LOGIN_WALL:
+                        breakers.record_failure(username, kind)
+                    break
+            
+            # Browser memory between accounts: should stay flat across the sweep
+            rss_mb = child_processes_rss_mb()
+            if rss_mb is not None:
+                rss_samples.append(rss_mb)
+                if rss_mb > SCROLL_MAX_RSS_MB:
+                    logger.warning(f"Browser at {rss_mb:.0f} MB, recycling pooled pages")
+                    await pool.drain()
+            
+            # Hand the tweets to the pipeline and move straight on to the next account;
+            # the account is checkpointed once its tweets are stored
+            if timer:
+                timer.finish("done" if succeeded else kind, len(tweets) if succeeded else 0)
+            if succeeded:
+                await pipeline.put({"username": username, "category": category, "raw": tweets,
+                                    "started": started, "finished": finished})
+            else:
+                if journal:
+                    journal.mark_done(username, "failed")
+                if queue:
+                    queue.unhold(username)
+                    queue.release(username, retry_at=time.time() + scheduler.floor)
+            
+            # Be respectful to the server - wait between requests
+            await asyncio.sleep(3)
+    finally:
+        # Drain what's already been scraped, even if the scrape loop failed
+        await pool.close()
+        await pipeline.close()
+        if queue:
+            # Batches dropped by a failed stage were never checkpointed; their leases just expire
+            queue.unhold()
+        if own_db:
+            db.shutdown()
+    
+    for m in pipeline.report():
+        logger.info(f"📊 {m['stage']}: {m['items']} tweets in {m['batches']} batches, {m['busy_seconds']}s busy, "
+                    f"queue depth max {m['max_queue_depth']} / avg {m['avg_queue_depth']}, {m['errors']} errors")
+    if lags:
+        logger.info(f"Ingestion lag after scrape: avg {sum(lags) / len(lags):.2f}s, max {max(lags):.2f}s")
+    pages = pool.report()
+    if pages["avg_setup_ms"] is not None:
+        logger.info(f"🧩 Pages: {pages['pages_created']} created, {pages['pages_reused']} reused, "
+                    f"{pages['pages_retired']} retired; setup avg {pages['avg_setup_ms']} ms/account "
+                    f"(first {pages['first_setup_ms']} ms)")
+    if rss_samples:
+        logger.info(f"🧠 Browser memory over {len(rss_samples)} accounts: first {rss_samples[0]:.0f} MB, "
+                    f"peak {max(rss_samples):.0f} MB, last {rss_samples[-1]:.0f} MB")
     
     logger.info(f"✓ Fetched {len(all_tweets)} raw tweets")
+    if scheduler:
+        logger.info(f"Schedule needs ~{scheduler.browser_minutes_per_hour():.1f} browser-min/hour")
+        for row in freshness_report(conn)[:5]:
+            logger.info(f"  @{row['username']}: every {row['interval_minutes']} min, freshness expected "
+                        f"{row['expected_freshness_minutes']} min / actual {row['actual_freshness_minutes']} min")
+    return all_tweets
+
+def store_batch(conn, enriched_tweets: list):
+    """Cluster and store one account's filtered, enriched tweets (runs on the DB thread)"""
+    # Cluster near-duplicate stories across accounts (the story index is persistent)
+    cluster_tweets(conn, enriched_tweets)
     
-    # Step 2: Apply quality filters
-    logger.info("\n🔍 Step 2: Applying quality filters...")
-    filtered_tweets = apply_quality_filters(all_tweets, min_engagement=30)
-    logger.info(f"✓ Filtered to {len(filtered_tweets)} high-quality tweets")
+    # Store in database
+    store_tweets(conn, enriched_tweets)
+    record_trends(conn, enriched_tweets)
+    store_entities(conn, enriched_tweets)
+
+def build_ingest_pipeline(db: DbExecutor, checkpoint, summary: CycleSummary = None) -> Pipeline:
+    """filter -> enrich -> store -> checkpoint stages fed by the scraper over bounded queues"""
+    loop = asyncio.get_running_loop()
     
-    # Step 3: Enrich with metadata
-    logger.info("\n🏷️ Step 3: Enriching tweets with metadata...")
-    enriched_tweets = enrich_tweets(filtered_tweets)
+    def timed(batch, phase):
+        # Stage time counts towards the account the batch came from
+        if summary is None:
+            return nullcontext()
+        return summary.account(batch["username"], batch["category"]).phase(phase)
     
-    # Step 4: Store in database
-    logger.info("\n💾 Step 4: Storing tweets in database...")
-    store_tweets(conn, enriched_tweets)
+    async def filter_stage(batch):
+        # Apply quality filters and relevance scoring (vectorized batch)
+        with timed(batch, "filter"):
+            batch["tweets"] = await loop.run_in_executor(None, filter_and_enrich, batch["raw"], 30)
+        return batch
+    
+    async def enrich_stage(batch):
+        with timed(batch, "enrich"):
+            await loop.run_in_executor(None, tag_entities, batch["tweets"])
+        return batch
+    
+    async def store_stage(batch):
+        with timed(batch, "store"):
+            await db.run(store_batch, batch["tweets"])
+        return batch
+    
+    async def checkpoint_stage(batch):
+        await checkpoint(batch)
+    
+    return Pipeline(
+        [("filter", filter_stage), ("enrich", enrich_stage), ("store", store_stage), ("checkpoint", checkpoint_stage)],
+        maxsize=PIPELINE_QUEUE_SIZE,
+        size=lambda batch: len(batch["raw"]),
+    )
+
+def should_publish(queue) -> bool:
+    """A single scraper always publishes; among workers only the elected (or configured) publisher does"""
+    if queue is None:
+        return True
+    if WORKER_PUBLISH != "auto":
+        return WORKER_PUBLISH in ("1", "true", "yes")
+    if queue.elect("publisher"):
+        return True
+    logger.info("Another worker is the publisher; skipping exports and feeds")
+    return False
+
+def process_tweets(conn, all_tweets: list, publish: bool = True, summary: CycleSummary = None):
+    """Report on and publish a cycle whose tweets were stored account by account"""
+    phase = summary.phase if summary else (lambda name: nullcontext())
+    logger.info(f"\n🔍 Cycle scraped {len(all_tweets)} raw tweets (stored per account)")
+    with phase("prune"):
+        prune_story_index(conn)
     
     # Step 5: Display results
     logger.info("\n" + "="*80)
     logger.info("TOP 15 TRENDING STORIES")
     logger.info("="*80)
     
-    top_stories = get_top_stories(conn, limit=15)
+    with phase("report"):
+        top_stories = get_top_stories(conn, limit=15)
     
     for i, story in enumerate(top_stories, 1):
         username, text, likes, retweets, replies, url, category = story
@@ -486,9 +813,53 @@ async def main():
         print(f"   {text[:120]}...")
         print(f"   ❤️ {likes} | 🔄 {retweets} | 💬 {replies} (Total: {total_engagement})")
     
+    # With several workers, only the designated one rewrites shared exports
+    if not publish:
+        return
+    
     # Step 6: Export to JSON
     logger.info("\n📁 Step 6: Exporting to JSON...")
-    export_to_json(conn)
+    with phase("export"):
+        export_to_json(conn)
+        export_delta(conn)
+    
+    # Step 7: Move tweets past the hot-table horizon into the archive
+    logger.info("\n🗄️ Step 7: Archiving old tweets...")
+    with phase("archive"):
+        archive_old_tweets(conn)
+    
+    # Step 8: Publish precomputed static feed shards
+    logger.info("\n📰 Step 8: Publishing feed shards...")
+    with phase("publish"):
+        publish_feeds(conn)
+
+async def main(worker: bool = False, profile: bool = False):
+    """Main execution function"""
+    logger.info("🚀 Starting Nigerian News Scraper (Production)...")
+    logger.info(f"Time window: Last {TIME_WINDOW_MINUTES} minutes")
+    
+    # Initialize DB
+    conn = init_database()
+    
+    queue = WorkQueue(conn) if worker else None
+    # Workers checkpoint through their leases; a single scraper resumes from its journal
+    journal = None if worker else CycleJournal(conn).open()
+    summary = CycleSummary(journal.cycle_id if journal else None)
+    profiler = CycleProfiler(summary).start() if profile else None
+    try:
+        async with async_playwright() as p:
+            browser, context = await launch_browser(p)
+            all_tweets = await scrape_accounts(context, conn, queue=queue, journal=journal, summary=summary)
+            await browser.close()
+        
+        process_tweets(conn, all_tweets, publish=should_publish(queue), summary=summary)
+        if journal:
+            journal.close()
+        summary.finish()
+    finally:
+        # A cycle that failed is the one most worth a profile
+        if profiler:
+            profiler.stop()
     
     logger.info("\n✅ Scraper completed successfully!")
     return all_tweets
@@ -521,20 +892,10 @@ def apply_quality_filters(tweets: list, min_engagement: int = 30) -> list:
 
 def detect_news_relevance(tweet_text: str) -> int:
     """Score tweet for news relevance"""
-    keywords = [
-        "breaking", "urgent", "news", "confirmed",
-        "government", "president", "minister", "parliament",
-        "security", "protest", "strike", "arrested",
-        "economy", "inflation", "business", "deal",
-        "health", "hospital", "disease", "outbreak",
-        "election", "vote", "campaign", "politics",
-        "corruption", "accountability", "justice"
-    ]
-    
     relevance_score = 0
     text_lower = tweet_text.lower()
     
-    for keyword in keywords:
+    for keyword in NEWS_KEYWORDS:
         if keyword in text_lower:
             relevance_score += 1
     
@@ -552,54 +913,63 @@ def enrich_tweets(tweets: list) -> list:
 # ============================================================================
 
 def store_tweets(conn, tweets: list):
-    """Store tweets in database"""
+    """Store TweetRecords in database"""
     cursor = conn.cursor()
     stored_count = 0
     ph = get_placeholder(conn)
     is_sqlite = ph == "?"
     
     for tweet in tweets:
+        now = datetime.now()
         try:
             if is_sqlite:
                 query = f"""
                     INSERT OR REPLACE INTO tweets (
                         tweet_id, author_username, author_verified, account_category,
                         text, created_at, likes, retweets, replies,
-                        url, is_retweet, ingested_at, processed
-                    ) VALUES ({', '.join([ph]*13)})
+                        url, is_retweet, ingested_at, processed, relevance_score, story_id,
+                        updated_at
+                    ) VALUES ({', '.join([ph]*16)})
                 """
             else:
                 query = f"""
                     INSERT INTO tweets (
                         tweet_id, author_username, author_verified, account_category,
                         text, created_at, likes, retweets, replies,
-                        url, is_retweet, ingested_at, processed
-                    ) VALUES ({', '.join([ph]*13)})
+                        url, is_retweet, ingested_at, processed, relevance_score, story_id,
+                        updated_at
+                    ) VALUES ({', '.join([ph]*16)})
                     ON CONFLICT (tweet_id) DO UPDATE SET
                         likes = EXCLUDED.likes,
                         retweets = EXCLUDED.retweets,
                         replies = EXCLUDED.replies,
+                        relevance_score = EXCLUDED.relevance_score,
+                        story_id = EXCLUDED.story_id,
+                        updated_at = EXCLUDED.updated_at,
                         processed = FALSE
                 """
                 
             cursor.execute(query, (
-                tweet["tweet_id"],
-                tweet["author_username"],
-                tweet.get("author_verified", False),
-                tweet["category"],
-                tweet["text"],
-                tweet["created_at"],
-                tweet["likes"],
-                tweet["retweets"],
-                tweet["replies"],
-                tweet["url"],
-                tweet["is_retweet"],
-                datetime.now(), # ingested_at
-                False # processed
+                tweet.key,
+                tweet.author_username,
+                tweet.author_verified,
+                tweet.category,
+                tweet.text,
+                tweet.created_at_iso,
+                tweet.likes,
+                tweet.retweets,
+                tweet.replies,
+                tweet.url,
+                tweet.is_retweet,
+                now, # ingested_at
+                False, # processed
+                tweet.relevance_score,
+                tweet.story_id or tweet.key,
+                to_db_timestamp(conn, now) # updated_at (compared as ISO text on SQLite by delta exports)
             ))
             stored_count += 1
         except Exception as e:
-            logger.error(f"Error storing tweet {tweet['tweet_id']}: {e}")
+            logger.error(f"Error storing tweet {tweet.tweet_id}: {e}")
             # If Postgres transaction fails, we might need to rollback
             if not is_sqlite:
                 conn.rollback()
@@ -624,31 +994,197 @@ def get_top_stories(conn, limit: int = 20) -> list:
     
     return cursor.fetchall()
 
-def export_to_json(conn, filename: str = "nigerian_news.json"):
-    """Export tweets to JSON file"""
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT * FROM tweets
-        WHERE is_retweet = 0
-        ORDER BY created_at DESC
-        LIMIT 500
-    """)
+def export_to_json(conn, filename: str = JSON_PATH, **options):
+    """Export tweets to JSON file (streamed, written atomically)"""
+    if "since" not in options and EXPORT_HOURS:
+        options["since"] = datetime.now() - timedelta(hours=EXPORT_HOURS)
+    return stream_export(conn, filename, **options)
+
+# ============================================================================
+# 8. DAEMON MODE
+# ============================================================================
+
+class ScraperDaemon:
+    """Runs scrape cycles at a fixed cadence, keeping the browser and DB warm"""
+    
+    def __init__(self, interval=SCRAPE_INTERVAL_SECONDS, recycle_cycles=BROWSER_RECYCLE_CYCLES,
+                 max_browser_rss_mb=BROWSER_MAX_RSS_MB, worker=False, profile_cycles=PROFILE_CYCLES):
+        self.interval = interval
+        self.recycle_cycles = recycle_cycles
+        self.max_browser_rss_mb = max_browser_rss_mb
+        self.stop_event = asyncio.Event()
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.conn = None
+        # Ingest writes go through one long-lived DB thread so its connection stays warm too
+        self.db = None
+        self.cycles = 0
+        self.cycles_on_browser = 0
+        # In worker mode accounts are leased from the database and shared with other workers
+        self.worker_id = default_worker_id() if worker else None
+        # Cycles still to be profiled; SIGUSR1 adds one
+        self.profile_cycles = profile_cycles
+    
+    def request_stop(self):
+        """Finish the account in progress, process what was scraped, then exit"""
+        if not self.stop_event.is_set():
+            logger.info("🛑 Shutdown requested, finishing current work...")
+            self.stop_event.set()
+    
+    def request_profile(self):
+        """Profile the next cycle (or one more, if some are already queued)"""
+        self.profile_cycles += 1
+        logger.info(f"🔬 Profiling requested, {self.profile_cycles} cycle(s) queued")
+    
+    def _ensure_db(self):
+        if self.conn is not None:
+            try:
+                self.conn.cursor().execute("SELECT 1")
+                return
+            except Exception as e:
+                logger.warning(f"Database connection lost, reconnecting: {e}")
+                try:
+                    self.conn.close()
+                except Exception:
+                    pass
+                self.conn = None
+        self.conn = init_database()
     
-    columns = [desc[0] for desc in cursor.description]
-    results = cursor.fetchall()
+    async def _ensure_browser(self):
+        if self.browser is not None and self.browser.is_connected():
+            return
+        self.browser, self.context = await launch_browser(self.playwright)
+        self.cycles_on_browser = 0
     
-    tweets_list = [dict(zip(columns, row)) for row in results]
+    async def _close_browser(self):
+        if self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                logger.warning(f"Error closing browser: {e}")
+        self.browser = self.context = None
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(tweets_list, f, indent=2, default=str)
+    async def _maybe_recycle_browser(self):
+        rss_mb = child_processes_rss_mb()
+        if rss_mb is not None:
+            logger.info(f"Browser memory: {rss_mb:.0f} MB after {self.cycles_on_browser} cycles")
+        
+        if self.cycles_on_browser >= self.recycle_cycles:
+            reason = f"{self.cycles_on_browser} cycles"
+        elif rss_mb is not None and rss_mb > self.max_browser_rss_mb:
+            reason = f"{rss_mb:.0f} MB > {self.max_browser_rss_mb} MB"
+        else:
+            return
+        
+        logger.info(f"♻️ Recycling browser ({reason})")
+        await self._close_browser()
+    
+    async def run_cycle(self):
+        """One scrape cycle on the warm browser and connection"""
+        self.cycles += 1
+        started = time.monotonic()
+        
+        profiler = None
+        try:
+            # A DB outage or failed browser launch fails this cycle only; the next slot retries
+            self._ensure_db()
+            await self._ensure_browser()
+            logger.info(f"🔁 Cycle {self.cycles}: ready to navigate in {time.monotonic() - started:.2f}s")
+            
+            queue = WorkQueue(self.conn, self.worker_id) if self.worker_id else None
+            journal = None if queue else CycleJournal(self.conn).open()
+            summary = CycleSummary(journal.cycle_id if journal else None)
+            if self.profile_cycles > 0:
+                self.profile_cycles -= 1
+                profiler = CycleProfiler(summary).start()
+            all_tweets = await scrape_accounts(self.context, self.conn, stop_event=self.stop_event,
+                                               queue=queue, journal=journal, summary=summary, db=self.db)
+            self.cycles_on_browser += 1
+            process_tweets(self.conn, all_tweets, publish=should_publish(queue), summary=summary)
+            # A cycle cut short by shutdown stays open so the next start resumes it
+            if journal and not self.stop_event.is_set():
+                journal.close()
+            summary.finish()
+        except Exception as e:
+            logger.error(f"Cycle {self.cycles} failed: {e}")
+            # The browser may be wedged; start the next cycle on a fresh one
+            await self._close_browser()
+        else:
+            await self._maybe_recycle_browser()
+        
+        if profiler:
+            profiler.stop()
+        logger.info(f"✅ Cycle {self.cycles} finished in {time.monotonic() - started:.1f}s")
     
-    logger.info(f"✓ Exported {len(tweets_list)} tweets to {filename}")
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.request_stop)
+            except NotImplementedError:
+                pass  # Not supported on Windows event loops
+        if hasattr(signal, "SIGUSR1"):
+            loop.add_signal_handler(signal.SIGUSR1, self.request_profile)
+        
+        logger.info(f"🚀 Starting scraper daemon (every {self.interval}s)...")
+        if METRICS_PORT:
+            serve_metrics(METRICS_PORT)
+            logger.info(f"📈 Serving metrics on :{METRICS_PORT}/metrics")
+        self.playwright = await async_playwright().start()
+        self.db = DbExecutor(get_db_connection)
+        next_run = loop.time()
+        
+        try:
+            while not self.stop_event.is_set():
+                await self.run_cycle()
+                
+                # Fixed cadence; cycles never overlap, and slots missed by an overrun are skipped
+                next_run += self.interval
+                if next_run <= loop.time():
+                    missed = int((loop.time() - next_run) // self.interval) + 1
+                    logger.warning(f"Cycle overran its slot, skipping {missed} scheduled run(s)")
+                    next_run += missed * self.interval
+                
+                try:
+                    await asyncio.wait_for(self.stop_event.wait(), timeout=next_run - loop.time())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._close_browser()
+            await self.playwright.stop()
+            self.db.shutdown()
+            if self.conn is not None:
+                self.conn.close()
+            logger.info("👋 Scraper daemon stopped")
 
 # ============================================================================
-# 8. MAIN EXECUTION
+# 9. MAIN EXECUTION
 # ============================================================================
 
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Nigerian News Twitter Scraper")
+    parser.add_argument("--daemon", action="store_true",
+                        help=f"Run continuously, one cycle every SCRAPE_INTERVAL_SECONDS ({SCRAPE_INTERVAL_SECONDS}s)")
+    parser.add_argument("--worker", action="store_true",
+                        help="Lease accounts from the database so several scrapers can share the load")
+    parser.add_argument("--profile", type=int, nargs="?", const=1, default=PROFILE_CYCLES, metavar="N",
+                        help="Profile the first N cycles (default 1) and write reports to PROFILE_DIR; "
+                             "a running daemon also profiles its next cycle on SIGUSR1")
+    parser.add_argument("--rescore", action="store_true",
+                        help="Recompute relevance scores of all stored tweets (after NEWS_KEYWORDS changes) and exit")
+    args = parser.parse_args()
+    
+    # Only when run as the scraper: importing main (tests, benchmarks) leaves logging alone.
+    # Queued, so log calls never wait on file I/O in the event loop
+    setup_logging("scraper")
+    if args.rescore:
+        conn = init_database()
+        rescore_table(conn)
+        conn.close()
+    elif args.daemon:
+        asyncio.run(ScraperDaemon(worker=args.worker, profile_cycles=args.profile).run())
+    else:
+        asyncio.run(main(worker=args.worker, profile=args.profile > 0))
@@ -15,20 +15,25 @@ FAILURE_LOG="$LOG_DIR/failures.log"
 # Create log directory if it doesn't exist
 mkdir -p "$LOG_DIR"
 
-# Check for lock file (prevent concurrent runs)
-if [ -f "$LOCK_FILE" ]; then
-    echo "$(date): Scraper is already running (lock file exists)" >> "$FAILURE_LOG"
-    exit 1
-fi
+# Workers lease accounts from the database, so concurrent runs are safe
+if [ "$SCRAPER_WORKER" = "true" ]; then
+    SCRAPER_ARGS="--worker"
+else
+    # Check for lock file (prevent concurrent runs)
+    if [ -f "$LOCK_FILE" ]; then
+        echo "$(date): Scraper is already running (lock file exists)" >> "$FAILURE_LOG"
+        exit 1
+    fi
 
-# Create lock file
-touch "$LOCK_FILE"
+    # Create lock file
+    touch "$LOCK_FILE"
 
-# Cleanup function
-cleanup() {
-    rm -f "$LOCK_FILE"
-}
-trap cleanup EXIT
+    # Cleanup function
+    cleanup() {
+        rm -f "$LOCK_FILE"
+    }
+    trap cleanup EXIT
+fi
 
 # Activate virtual environment
 source "$VENV_PATH/bin/activate"
@@ -36,7 +41,7 @@ source "$VENV_PATH/bin/activate"
 # Run the scraper
 echo "$(date): Starting scraper..." >> "$LOG_DIR/cron.log"
 
-if python "$PYTHON_SCRIPT"; then
+if python "$PYTHON_SCRIPT" $SCRAPER_ARGS; then
     echo "$(date): Scraper completed successfully" >> "$LOG_DIR/cron.log"
     # Reset failure counter
     echo "0" > "$LOG_DIR/failure_count.txt"
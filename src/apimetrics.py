@@ -0,0 +1,229 @@
+"""
+Request and query timing for the API.
+
+RequestMetrics is a plain ASGI middleware that records latency by route
+template and status counts. TimedConnection wraps a DB-API connection so
+that every statement (execute plus its fetches, since SQLite does the work
+lazily) is timed. Statements over SLOW_QUERY_MS are logged once with their
+parameters, plus the EXPLAIN plan the first time a query text is seen in each
+SLOW_QUERY_EXPLAIN_SECONDS, so a query that stays slow under load isn't run
+twice per request. Each request also gets a breakdown of where
+its time went: connect, query, and the rest (row conversion and
+serialization).
+"""
+
+import logging
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from .config import SLOW_QUERY_MS, SLOW_QUERY_EXPLAIN_SECONDS
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "api_request_seconds", "Request latency by route", ["method", "route"])
+RESPONSES = REGISTRY.counter(
+    "api_responses_total", "Responses by route and status code", ["method", "route", "status"])
+REQUEST_PHASE_SECONDS = REGISTRY.histogram(
+    "api_request_phase_seconds", "Request time split into connect, query and app (conversion, serialization)",
+    ["route", "phase"])
+QUERY_SECONDS = REGISTRY.histogram(
+    "api_query_seconds", "Statement time including fetches", ["route", "statement"])
+SLOW_QUERIES = REGISTRY.counter("api_slow_queries_total", "Statements over SLOW_QUERY_MS", ["route"])
+
+# Query text -> when it was last EXPLAINed (shared by the worker threads serving requests)
+_explained = {}
+_explained_lock = threading.Lock()
+MAX_EXPLAINED = 1000
+
+# Phase times of the request being served: {"scope": ..., "connect": s, "query": s}
+_current = ContextVar("api_request_timing", default=None)
+
+
+def _record(phase, seconds):
+    timing = _current.get()
+    if timing is not None:
+        timing[phase] = timing.get(phase, 0.0) + seconds
+
+
+def _route(scope):
+    route = scope.get("route")
+    # Unmatched paths share one label so scanners can't blow up the series count
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _current_route():
+    timing = _current.get()
+    return _route(timing["scope"]) if timing else ""
+
+
+class RequestMetrics:
+    """ASGI middleware: per-route latency histogram, status counts and phase breakdown"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        timing = {"scope": scope}
+        token = _current.set(timing)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            route = _route(scope)
+            method = scope.get("method", "")
+            REQUEST_SECONDS.observe(elapsed, method=method, route=route)
+            RESPONSES.inc(method=method, route=route, status=status[0])
+            if "connect" in timing or "query" in timing:
+                db = timing.get("connect", 0.0) + timing.get("query", 0.0)
+                for phase in ("connect", "query"):
+                    if phase in timing:
+                        REQUEST_PHASE_SECONDS.observe(timing[phase], route=route, phase=phase)
+                REQUEST_PHASE_SECONDS.observe(max(elapsed - db, 0.0), route=route, phase="app")
+
+
+def _statement(query):
+    words = query.lstrip().split(None, 1)
+    return words[0].upper() if words else ""
+
+
+def _should_explain(query, now=None):
+    """True at most once per SLOW_QUERY_EXPLAIN_SECONDS for each distinct query text"""
+    now = now or time.monotonic()
+    with _explained_lock:
+        last = _explained.get(query)
+        if last is not None and now - last < SLOW_QUERY_EXPLAIN_SECONDS:
+            return False
+        if len(_explained) >= MAX_EXPLAINED:
+            _explained.clear()
+        _explained[query] = now
+        return True
+
+
+def explain(conn, query, params):
+    """Query plan lines for a SELECT, or [] if it can't be explained"""
+    is_sqlite = hasattr(conn, "execute") and not hasattr(conn, "status")
+    prefix = "EXPLAIN QUERY PLAN " if is_sqlite else "EXPLAIN "
+    try:
+        cursor = conn.cursor()
+        cursor.execute(prefix + query, params or ())
+        rows = cursor.fetchall()
+        cursor.close()
+    except Exception as e:
+        return [f"(EXPLAIN failed: {e})"]
+    # SQLite: (id, parent, notused, detail); Postgres: one "QUERY PLAN" column
+    return [str(list(row.values())[-1] if isinstance(row, dict) else row[-1]) for row in rows]
+
+
+class TimedCursor:
+    """Cursor proxy that times each statement through its last fetch"""
+
+    def __init__(self, cursor, conn):
+        self._cursor = cursor
+        self._conn = conn
+        self._query = None
+        self._params = None
+        self._elapsed = 0.0
+        self._reported = True
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def _timed(self, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            seconds = time.perf_counter() - started
+            self._elapsed += seconds
+            _record("query", seconds)
+
+    def _finish(self):
+        """Record the previous statement once its results have been consumed"""
+        if self._reported:
+            return
+        self._reported = True
+        route = _current_route()
+        QUERY_SECONDS.observe(self._elapsed, route=route, statement=_statement(self._query))
+        if SLOW_QUERY_MS and self._elapsed * 1000 >= SLOW_QUERY_MS:
+            SLOW_QUERIES.inc(route=route)
+            plan = []
+            if _statement(self._query) in ("SELECT", "WITH"):
+                if _should_explain(self._query):
+                    plan = explain(self._conn, self._query, self._params)
+                else:
+                    plan = [f"(plan logged within the last {SLOW_QUERY_EXPLAIN_SECONDS:.0f}s)"]
+            logger.warning(
+                f"Slow query ({self._elapsed * 1000:.1f} ms): {' '.join(self._query.split())} "
+                f"params={self._params!r:.200}" + "".join(f"\n    {line}" for line in plan))
+
+    def execute(self, query, params=None):
+        self._finish()
+        self._query, self._params, self._elapsed, self._reported = query, params, 0.0, False
+        if params is None:
+            self._timed(self._cursor.execute, query)
+        else:
+            self._timed(self._cursor.execute, query, params)
+        return self
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(self._cursor.fetchmany, size or self._cursor.arraysize)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+
+class TimedConnection:
+    """Connection proxy whose cursors are timed; connect time is charged to the current request"""
+
+    def __init__(self, conn, connect_seconds=0.0):
+        self._conn = conn
+        self._cursors = weakref.WeakSet()
+        _record("connect", connect_seconds)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = TimedCursor(self._conn.cursor(*args, **kwargs), self._conn)
+        self._cursors.add(cursor)
+        return cursor
+
+    def close(self):
+        # A statement read with a single fetchone() is only complete now
+        for cursor in list(self._cursors):
+            cursor._finish()
+        self._conn.close()
@@ -0,0 +1,135 @@
+"""
+Time-partitioned archive for tweets older than the hot-table horizon.
+
+archive_old_tweets() moves old rows in batches into date-partitioned files
+(archive/date=YYYY-MM-DD/part-<first id>-<last id>.<ext>) and deletes them from
+the hot tweets table, so the table holds roughly a constant horizon of data.
+Archived ids are recorded as tombstones for the next delta export.
+Files are gzip NDJSON by default, or Parquet when ARCHIVE_FORMAT=parquet and
+pyarrow is installed. read_archive() scans the archive with partition and
+column pruning.
+"""
+
+import glob
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+import pandas as pd
+from .config import ARCHIVE_DIR, ARCHIVE_FORMAT, ARCHIVE_HORIZON_DAYS
+from .database import get_placeholder, to_db_timestamp
+from .deltas import init_tombstone_store, record_tombstones
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+TIMESTAMP_COLUMNS = ("created_at", "ingested_at")
+# Hot side tables keyed on tweet_id that should shrink along with tweets
+# (the story index prunes itself to a sliding window)
+SIDE_TABLES = ("tweet_entities",)
+EXTENSIONS = {"ndjson": ".ndjson.gz", "parquet": ".parquet"}
+
+
+def _resolve_format(fmt):
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            logger.warning("pyarrow not installed, archiving as compressed NDJSON instead of Parquet")
+            return "ndjson"
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Unsupported archive format: {fmt}")
+    return fmt
+
+
+def _write_partition(path, rows, fmt):
+    """Write one part file atomically"""
+    tmp_path = path + ".tmp"
+    if fmt == "parquet":
+        df = pd.DataFrame(rows)
+        for col in TIMESTAMP_COLUMNS:
+            if col in df:
+                df[col] = pd.to_datetime(df[col], format="ISO8601", errors="coerce")
+        df.to_parquet(tmp_path, index=False)
+    else:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, default=str, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, path)
+
+
+def archive_old_tweets(conn, horizon_days=ARCHIVE_HORIZON_DAYS, archive_dir=ARCHIVE_DIR,
+                       fmt=ARCHIVE_FORMAT, batch_size=BATCH_SIZE) -> int:
+    """Move tweets older than horizon_days into the archive; returns rows archived"""
+    fmt = _resolve_format(fmt)
+    init_tombstone_store(conn)
+    cursor = conn.cursor()
+    ph = get_placeholder(conn)
+    cutoff = to_db_timestamp(conn, datetime.now() - timedelta(days=horizon_days))
+    archived = 0
+
+    while True:
+        cursor.execute(
+            f"SELECT * FROM tweets WHERE created_at < {ph} ORDER BY id LIMIT {ph}",
+            (cutoff, batch_size)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            break
+
+        columns = [desc[0] for desc in cursor.description]
+        partitions = {}
+        for row in rows:
+            record = dict(zip(columns, row))
+            partitions.setdefault(str(record["created_at"])[:10], []).append(record)
+
+        for day, records in partitions.items():
+            partition_dir = os.path.join(archive_dir, f"date={day}")
+            os.makedirs(partition_dir, exist_ok=True)
+            name = f"part-{records[0]['id']:012d}-{records[-1]['id']:012d}{EXTENSIONS[fmt]}"
+            _write_partition(os.path.join(partition_dir, name), records, fmt)
+
+        # Only delete once every partition of the batch is safely on disk
+        ids = [row[columns.index("id")] for row in rows]
+        tweet_ids = [row[columns.index("tweet_id")] for row in rows]
+        id_list = ", ".join([ph] * len(ids))
+        cursor.execute(f"DELETE FROM tweets WHERE id IN ({id_list})", ids)
+        for table in SIDE_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE tweet_id IN ({id_list})", tweet_ids)
+        # Delta consumers learn about the deletion from the next delta export
+        record_tombstones(cursor, ph, tweet_ids)
+        conn.commit()
+        archived += len(rows)
+
+    if archived:
+        logger.info(f"✓ Archived {archived} tweets older than {horizon_days} days to {archive_dir}/")
+    return archived
+
+
+def read_archive(archive_dir=ARCHIVE_DIR, columns=None, start=None, end=None):
+    """Load archived tweets into a DataFrame, pruning partitions by date and columns by name"""
+    frames = []
+    for partition_dir in sorted(glob.glob(os.path.join(archive_dir, "date=*"))):
+        day = os.path.basename(partition_dir)[len("date="):]
+        if start and day < start.strftime("%Y-%m-%d"):
+            continue
+        if end and day > end.strftime("%Y-%m-%d"):
+            continue
+
+        for path in sorted(os.listdir(partition_dir)):
+            full_path = os.path.join(partition_dir, path)
+            if path.endswith(".parquet"):
+                frames.append(pd.read_parquet(full_path, columns=columns))
+            elif path.endswith(".ndjson.gz"):
+                df = pd.read_json(full_path, lines=True, compression="gzip", dtype=False, convert_dates=False)
+                if columns:
+                    df = df[columns]
+                for col in TIMESTAMP_COLUMNS:
+                    if col in df:
+                        df[col] = pd.to_datetime(df[col], format="ISO8601", errors="coerce")
+                frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=columns or [])
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,97 @@
+"""
+Columnar batch stage for the main pipeline.
+
+Loads a cycle's raw tweets into a pandas DataFrame and applies the quality
+filters and news relevance scoring as vectorized column operations. Results
+match apply_quality_filters() + enrich_tweets() in main.py row for row.
+"""
+
+import logging
+from datetime import datetime
+import pandas as pd
+from .config import NEWS_KEYWORDS
+from .database import get_placeholder, to_db_timestamp
+
+logger = logging.getLogger(__name__)
+
+MIN_TEXT_LENGTH = 50
+
+
+def score_relevance(texts, keywords=NEWS_KEYWORDS):
+    """Count keyword hits per text (one point per keyword, substring match)"""
+    texts_lower = pd.Series(texts, dtype=object).str.lower()
+    scores = pd.Series(0, index=texts_lower.index, dtype="int64")
+
+    for keyword in keywords:
+        scores += texts_lower.str.contains(keyword, regex=False).astype("int64")
+
+    return scores
+
+
+def quality_mask(df, min_engagement=30):
+    """Boolean mask of rows passing the retweet/engagement/length filters"""
+    total_engagement = df["likes"] + df["retweets"] + df["replies"]
+    return (
+        ~df["is_retweet"].astype(bool)
+        & (total_engagement >= min_engagement)
+        & (df["text"].str.len() >= MIN_TEXT_LENGTH)
+    )
+
+
+def filter_and_enrich(tweets: list, min_engagement: int = 30, keywords=NEWS_KEYWORDS) -> list:
+    """Vectorized equivalent of apply_quality_filters() followed by enrich_tweets() over TweetRecords"""
+    if not tweets:
+        return []
+
+    df = pd.DataFrame({
+        "is_retweet": [t.is_retweet for t in tweets],
+        "likes": [t.likes for t in tweets],
+        "retweets": [t.retweets for t in tweets],
+        "replies": [t.replies for t in tweets],
+        "text": pd.Series([t.text for t in tweets], dtype=object),
+    })
+
+    kept = df[quality_mask(df, min_engagement)]
+    scores = score_relevance(kept["text"], keywords)
+
+    # Hand back the original records so store_tweets sees plain Python types
+    enriched = []
+    for idx, score in zip(kept.index.tolist(), scores.tolist()):
+        tweet = tweets[idx]
+        tweet.relevance_score = score
+        enriched.append(tweet)
+
+    return enriched
+
+
+def rescore_table(conn, keywords=NEWS_KEYWORDS, chunk_size: int = 50000) -> int:
+    """Recompute relevance_score for every stored tweet (e.g. after keywords change); returns rows changed
+
+    Changed rows get a fresh updated_at so the next delta export carries the new scores.
+    """
+    read_cursor = conn.cursor()
+    write_cursor = conn.cursor()
+    ph = get_placeholder(conn)
+    now = to_db_timestamp(conn, datetime.now())
+
+    read_cursor.execute("SELECT id, text, relevance_score FROM tweets ORDER BY id")
+    scanned = updated = 0
+
+    while True:
+        rows = read_cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+
+        scores = score_relevance([row[1] or "" for row in rows], keywords).tolist()
+        changed = [(score, now, row[0]) for row, score in zip(rows, scores) if score != row[2]]
+        if changed:
+            write_cursor.executemany(
+                f"UPDATE tweets SET relevance_score = {ph}, updated_at = {ph} WHERE id = {ph}",
+                changed
+            )
+        scanned += len(rows)
+        updated += len(changed)
+
+    conn.commit()
+    logger.info(f"✓ Rescored {scanned} tweets, {updated} changed")
+    return updated
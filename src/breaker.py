@@ -0,0 +1,138 @@
+"""
+Per-account circuit breakers and a per-cycle retry budget.
+
+A breaker is closed while an account scrapes fine. After BREAKER_THRESHOLD
+consecutive failures (or a single "missing" result) it opens and the account
+is skipped until its cool-down passes. The next visit is a half-open probe:
+success closes the breaker, and another failure re-opens it with the
+cool-down doubled (up to BREAKER_MAX_COOLDOWN_MINUTES). Breaker state is
+stored in the circuit_breakers table so it survives restarts and is shared
+by all workers.
+"""
+
+import logging
+import time
+from .config import BREAKER_THRESHOLD, BREAKER_COOLDOWN_MINUTES, BREAKER_MAX_COOLDOWN_MINUTES
+from .database import get_placeholder
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# Failure kinds. Only transient ones are worth another attempt in the same cycle;
+# a login wall is a session problem, not the account's, so it never trips a breaker.
+TIMEOUT, EMPTY, MISSING, LOGIN_WALL, ERROR = "timeout", "empty", "missing", "login_wall", "error"
+RETRYABLE = {TIMEOUT, ERROR}
+
+BREAKER_COLUMNS = ["username", "state", "failures", "last_failure", "opened_at", "cooldown_seconds"]
+
+
+class ScrapeFailure(Exception):
+    """A classified failure to scrape an account"""
+
+    def __init__(self, kind, message=""):
+        super().__init__(message or kind)
+        self.kind = kind
+
+
+class RetryBudget:
+    """Caps the number of retries spent across all accounts in one cycle"""
+
+    def __init__(self, retries):
+        self.remaining = retries
+
+    def take(self):
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+def init_breaker_store(conn):
+    """Create the circuit_breakers table"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS circuit_breakers (
+            username TEXT PRIMARY KEY,
+            state TEXT,
+            failures INTEGER,
+            last_failure TEXT,
+            opened_at DOUBLE PRECISION,
+            cooldown_seconds DOUBLE PRECISION
+        )
+    """)
+    conn.commit()
+
+
+class CircuitBreakers:
+    """Persisted closed/open/half-open breakers keyed by account"""
+
+    def __init__(self, conn, threshold=BREAKER_THRESHOLD, cooldown_minutes=BREAKER_COOLDOWN_MINUTES,
+                 max_cooldown_minutes=BREAKER_MAX_COOLDOWN_MINUTES):
+        self.conn = conn
+        self.ph = get_placeholder(conn)
+        self.threshold = threshold
+        self.cooldown = cooldown_minutes * 60
+        self.max_cooldown = max_cooldown_minutes * 60
+
+    def get(self, username):
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT {', '.join(BREAKER_COLUMNS)} FROM circuit_breakers WHERE username = {self.ph}", (username,))
+        row = cursor.fetchone()
+        if row is None:
+            return {"username": username, "state": CLOSED, "failures": 0, "last_failure": None,
+                    "opened_at": None, "cooldown_seconds": self.cooldown}
+        return dict(zip(BREAKER_COLUMNS, row.values() if isinstance(row, dict) else row))
+
+    def _save(self, b):
+        updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in BREAKER_COLUMNS[1:])
+        self.conn.cursor().execute(f"""
+            INSERT INTO circuit_breakers ({', '.join(BREAKER_COLUMNS)})
+            VALUES ({', '.join([self.ph] * len(BREAKER_COLUMNS))})
+            ON CONFLICT (username) DO UPDATE SET {updates}
+        """, [b[col] for col in BREAKER_COLUMNS])
+        self.conn.commit()
+
+    def retry_at(self, username):
+        """When an open breaker will let the next probe through"""
+        b = self.get(username)
+        if b["state"] != OPEN:
+            return None
+        return b["opened_at"] + b["cooldown_seconds"]
+
+    def allow(self, username, now=None):
+        """Whether to scrape the account now; an expired cool-down turns into a half-open probe"""
+        b = self.get(username)
+        if b["state"] != OPEN:
+            return True
+        if (now or time.time()) < b["opened_at"] + b["cooldown_seconds"]:
+            return False
+        b["state"] = HALF_OPEN
+        self._save(b)
+        logger.info(f"Probing @{username} after {b['cooldown_seconds'] / 60:.0f} min cool-down")
+        return True
+
+    def record_success(self, username):
+        b = self.get(username)
+        if b["state"] == CLOSED and b["failures"] == 0:
+            return
+        if b["state"] != CLOSED:
+            logger.info(f"✓ @{username} recovered, closing circuit")
+        b.update(state=CLOSED, failures=0, last_failure=None, opened_at=None, cooldown_seconds=self.cooldown)
+        self._save(b)
+
+    def record_failure(self, username, kind, now=None):
+        now = now or time.time()
+        b = self.get(username)
+        b["failures"] += 1
+        b["last_failure"] = kind
+
+        if b["state"] == HALF_OPEN:
+            b.update(state=OPEN, opened_at=now, cooldown_seconds=min(b["cooldown_seconds"] * 2, self.max_cooldown))
+        elif b["state"] == CLOSED and (b["failures"] >= self.threshold or kind == MISSING):
+            b.update(state=OPEN, opened_at=now, cooldown_seconds=self.cooldown)
+        self._save(b)
+
+        if b["state"] == OPEN:
+            logger.critical(f"ALERT: @{username} circuit open after {b['failures']} consecutive failures "
+                            f"({kind}); next probe in {b['cooldown_seconds'] / 60:.0f} min")
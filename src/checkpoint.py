@@ -0,0 +1,104 @@
+"""
+Cycle journal for resumable scrape cycles.
+
+Each account's tweets are stored as soon as the account finishes and the
+account is then marked done in the journal. If the process dies mid-cycle,
+the next run reopens the unfinished cycle and skips the accounts that are
+already done, as long as the cycle is recent enough that their results are
+still fresh (CHECKPOINT_MAX_AGE_MINUTES).
+"""
+
+import logging
+import time
+import uuid
+from .config import CHECKPOINT_MAX_AGE_MINUTES
+from .database import get_placeholder
+
+logger = logging.getLogger(__name__)
+
+
+def init_checkpoint_store(conn):
+    """Create the scrape_cycles and cycle_journal tables"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scrape_cycles (
+            cycle_id TEXT PRIMARY KEY,
+            started_at DOUBLE PRECISION,
+            finished_at DOUBLE PRECISION,
+            status TEXT
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cycle_journal (
+            cycle_id TEXT,
+            username TEXT,
+            status TEXT,
+            tweets INTEGER,
+            finished_at DOUBLE PRECISION,
+            PRIMARY KEY (cycle_id, username)
+        )
+    """)
+    conn.commit()
+
+
+class CycleJournal:
+    """Tracks which accounts a scrape cycle has finished"""
+
+    def __init__(self, conn, max_age_minutes=CHECKPOINT_MAX_AGE_MINUTES):
+        self.conn = conn
+        self.ph = get_placeholder(conn)
+        self.max_age = max_age_minutes * 60
+        self.cycle_id = None
+        self.done = set()
+
+    def open(self, now=None):
+        """Resume the latest unfinished cycle if it's recent, otherwise start a new one"""
+        now = now or time.time()
+        ph = self.ph
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT cycle_id, started_at FROM scrape_cycles WHERE status = 'running' ORDER BY started_at DESC")
+        unfinished = [tuple(row.values()) if isinstance(row, dict) else tuple(row) for row in cursor.fetchall()]
+
+        resumable = unfinished[0] if unfinished and now - unfinished[0][1] <= self.max_age else None
+        for cycle_id, _ in unfinished:
+            if resumable is None or cycle_id != resumable[0]:
+                cursor.execute(f"UPDATE scrape_cycles SET status = 'abandoned', finished_at = {ph} WHERE cycle_id = {ph}", (now, cycle_id))
+
+        if resumable:
+            self.cycle_id = resumable[0]
+            cursor.execute(f"SELECT username FROM cycle_journal WHERE cycle_id = {ph}", (self.cycle_id,))
+            self.done = {row[0] if not isinstance(row, dict) else row["username"] for row in cursor.fetchall()}
+            logger.info(f"↩️ Resuming cycle {self.cycle_id}: {len(self.done)} accounts already done")
+        else:
+            self.cycle_id = f"{time.strftime('%Y%m%dT%H%M%S', time.localtime(now))}-{uuid.uuid4().hex[:6]}"
+            self.done = set()
+            cursor.execute(
+                f"INSERT INTO scrape_cycles (cycle_id, started_at, finished_at, status) VALUES ({ph}, {ph}, NULL, 'running')",
+                (self.cycle_id, now)
+            )
+        self.conn.commit()
+        return self
+
+    def is_done(self, username):
+        return username in self.done
+
+    def mark_done(self, username, status, tweets=0, conn=None):
+        """Record an account as finished (its tweets must already be stored); conn overrides the journal's own"""
+        conn = conn or self.conn
+        ph = self.ph
+        conn.cursor().execute(f"""
+            INSERT INTO cycle_journal (cycle_id, username, status, tweets, finished_at)
+            VALUES ({ph}, {ph}, {ph}, {ph}, {ph})
+            ON CONFLICT (cycle_id, username) DO NOTHING
+        """, (self.cycle_id, username, status, tweets, time.time()))
+        conn.commit()
+        self.done.add(username)
+
+    def close(self):
+        """Mark the cycle complete so the next run starts a fresh one"""
+        ph = self.ph
+        self.conn.cursor().execute(
+            f"UPDATE scrape_cycles SET status = 'finished', finished_at = {ph} WHERE cycle_id = {ph}",
+            (time.time(), self.cycle_id)
+        )
+        self.conn.commit()
@@ -2,6 +2,8 @@
 Configuration for Nigerian News Twitter Scraper
 """
 
+import os
+
 # Accounts to track by category
 ACCOUNTS = {
     "news_outlets": [
@@ -47,3 +49,110 @@ MIN_ENGAGEMENT = 30
 HEADLESS = True
 DB_PATH = "data/nigerian_news.db"
 JSON_PATH = "nigerian_news.json"
+
+# Keywords for news relevance scoring in the main pipeline (one point per hit)
+NEWS_KEYWORDS = [
+    "breaking", "urgent", "news", "confirmed",
+    "government", "president", "minister", "parliament",
+    "security", "protest", "strike", "arrested",
+    "economy", "inflation", "business", "deal",
+    "health", "hospital", "disease", "outbreak",
+    "election", "vote", "campaign", "politics",
+    "corruption", "accountability", "justice"
+]
+
+# Trending terms (5-minute buckets, surge measured against a trailing 24h baseline)
+TREND_BUCKET_SECONDS = 300
+TREND_WINDOW_BUCKETS = 3
+TREND_BASELINE_HOURS = 24
+
+# JSON export (format: "json" array or "ndjson"; EXPORT_HOURS limits to recent tweets)
+EXPORT_FORMAT = os.getenv("EXPORT_FORMAT", "json")
+EXPORT_GZIP = os.getenv("EXPORT_GZIP", "false").lower() in ("1", "true", "yes")
+EXPORT_LIMIT = int(os.getenv("EXPORT_LIMIT", "500"))
+EXPORT_HOURS = int(os.getenv("EXPORT_HOURS")) if os.getenv("EXPORT_HOURS") else None
+
+# Archive of tweets older than the hot-table horizon (format: "ndjson" or "parquet", needs pyarrow)
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+ARCHIVE_FORMAT = os.getenv("ARCHIVE_FORMAT", "ndjson")
+ARCHIVE_HORIZON_DAYS = int(os.getenv("ARCHIVE_HORIZON_DAYS", "7"))
+
+# Precomputed static feed shards (served from FEED_DIR by the API or any static host)
+FEED_DIR = os.getenv("FEED_DIR", "feeds")
+FEED_SHARD_SIZE = int(os.getenv("FEED_SHARD_SIZE", "50"))
+FEED_HOURS = int(os.getenv("FEED_HOURS", "24"))
+
+# Incremental delta exports (a full snapshot is compacted every DELTA_COMPACT_EVERY deltas)
+DELTA_DIR = os.getenv("DELTA_DIR", "exports")
+DELTA_COMPACT_EVERY = int(os.getenv("DELTA_COMPACT_EVERY", "144"))
+# Rows stamped less than this long ago are left for the next delta, so a write that commits after
+# a later-stamped one (another worker, the DB thread) isn't skipped by the watermark
+DELTA_SAFETY_LAG_SECONDS = int(os.getenv("DELTA_SAFETY_LAG_SECONDS", "60"))
+
+# Daemon mode (python main.py --daemon): cycle cadence and when to recycle the browser
+SCRAPE_INTERVAL_SECONDS = int(os.getenv("SCRAPE_INTERVAL_SECONDS", "600"))
+BROWSER_RECYCLE_CYCLES = int(os.getenv("BROWSER_RECYCLE_CYCLES", "12"))
+BROWSER_MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", "350"))
+# Long scroll sessions: read articles keep only the last few with media, and the browser's memory is
+# sampled every few scrolls; above SCROLL_MAX_RSS_MB the account stops scrolling early, keeping what
+# it has, and the pooled pages are closed before the next account
+SCROLL_KEEP_ARTICLES = int(os.getenv("SCROLL_KEEP_ARTICLES", "10"))
+SCROLL_MAX_RSS_MB = int(os.getenv("SCROLL_MAX_RSS_MB", "600"))
+MEMORY_SAMPLE_SCROLLS = 5
+
+# Adaptive per-account polling (intervals are clamped to [floor, ceiling] and jittered)
+ADAPTIVE_POLLING = os.getenv("ADAPTIVE_POLLING", "true").lower() in ("1", "true", "yes")
+POLL_FLOOR_MINUTES = int(os.getenv("POLL_FLOOR_MINUTES", "10"))
+POLL_CEILING_MINUTES = int(os.getenv("POLL_CEILING_MINUTES", "360"))
+POLL_TARGET_YIELD = float(os.getenv("POLL_TARGET_YIELD", "2"))
+POLL_JITTER = 0.15
+
+# Lease-based work distribution (python main.py --worker). Exactly one worker publishes exports/feeds:
+# WORKER_PUBLISH=auto elects it through a lease renewed each cycle (taken over ROLE_LEASE_SECONDS after
+# the publisher stops); true/false force it on or off for this worker
+LEASE_SECONDS = int(os.getenv("LEASE_SECONDS", "300"))
+WORKER_PUBLISH = os.getenv("WORKER_PUBLISH", "auto").lower()
+ROLE_LEASE_SECONDS = int(os.getenv("ROLE_LEASE_SECONDS", "1800"))
+
+# Per-account circuit breakers and per-cycle retry budget
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", "3"))
+BREAKER_COOLDOWN_MINUTES = int(os.getenv("BREAKER_COOLDOWN_MINUTES", "30"))
+BREAKER_MAX_COOLDOWN_MINUTES = int(os.getenv("BREAKER_MAX_COOLDOWN_MINUTES", "1440"))
+RETRY_BUDGET = int(os.getenv("RETRY_BUDGET", "10"))
+
+# Resumable cycles: an interrupted cycle is resumed only if it started this recently
+CHECKPOINT_MAX_AGE_MINUTES = int(os.getenv("CHECKPOINT_MAX_AGE_MINUTES", "30"))
+
+# Streaming ingestion: batches (one per account) buffered between pipeline stages
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+
+# Page pool: pages are reused across accounts and retired after this many uses (or any error)
+PAGE_MAX_USES = int(os.getenv("PAGE_MAX_USES", "20"))
+BLOCK_MEDIA = os.getenv("BLOCK_MEDIA", "true").lower() in ("1", "true", "yes")
+
+# Scraper metrics: served on METRICS_PORT (0 = off) and/or written to METRICS_TEXTFILE after each cycle
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "")
+CYCLE_SUMMARY_DIR = os.getenv("CYCLE_SUMMARY_DIR", "logs/cycles")
+
+# API: statements slower than this are logged with their parameters and query plan (0 = off)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Each distinct slow statement is EXPLAINed at most once per this many seconds; the rest are only logged
+SLOW_QUERY_EXPLAIN_SECONDS = float(os.getenv("SLOW_QUERY_EXPLAIN_SECONDS", "300"))
+
+# Profiling: profile the first PROFILE_CYCLES cycles (daemon: also SIGUSR1 profiles the next one)
+PROFILE_CYCLES = int(os.getenv("PROFILE_CYCLES", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "logs/profiles")
+PROFILE_SLOW_CALLBACK_MS = float(os.getenv("PROFILE_SLOW_CALLBACK_MS", "100"))
+
+# Logging: written off the event loop to LOG_DIR/<prefix>_<date>.log, rolled over past LOG_MAX_MB
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # text or json
+LOG_MAX_MB = float(os.getenv("LOG_MAX_MB", "50"))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+# Log files, cycle summaries and profiles older than this are deleted
+LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", "14"))
+# Warnings from one call site beyond LOG_REPEAT_BURST per window are dropped (0 = no limit)
+LOG_REPEAT_BURST = int(os.getenv("LOG_REPEAT_BURST", "10"))
+LOG_REPEAT_WINDOW_SECONDS = float(os.getenv("LOG_REPEAT_WINDOW_SECONDS", "60"))
@@ -81,3 +81,15 @@ async def get_all_tweets_for_export(limit=500):
         """, (limit,)) as cursor:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
+
+def get_placeholder(conn):
+    """Return SQL placeholder based on connection type (sync sqlite3/psycopg2)"""
+    # Check if SQLite (has execute but no status)
+    if hasattr(conn, 'execute') and not hasattr(conn, 'status'):
+        return "?"
+    return "%s"
+
+def to_db_timestamp(conn, value):
+    """Bind a datetime for comparison against created_at/ingested_at"""
+    # SQLite stores timestamps as ISO strings, so compare like with like
+    return value.isoformat() if get_placeholder(conn) == "?" else value
@@ -0,0 +1,204 @@
+"""
+Incremental delta exports keyed on an updated_at watermark.
+
+Each run of export_delta() emits the rows inserted or updated since the last
+run as delta-<sequence>.ndjson.gz, ordered by (updated_at, tweet_id) so the
+last row written becomes the new watermark. Rows stamped within the last
+DELTA_SAFETY_LAG_SECONDS wait for the next run: a write stamped earlier but
+committed later than another would otherwise fall behind the watermark.
+Tweets deleted from the hot table (archived) follow the changes as
+{"tweet_id": ..., "deleted": true} tombstones. Every DELTA_COMPACT_EVERY deltas
+the full table is compacted into snapshot-<sequence>.ndjson.gz. A consumer at
+sequence N reads the deltas after N; one that has fallen behind the retained
+deltas starts again from the latest snapshot.
+
+state.json records the current sequence, the watermark and the snapshot.
+"""
+
+import itertools
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from .config import DELTA_DIR, DELTA_COMPACT_EVERY, DELTA_SAFETY_LAG_SECONDS
+from .database import get_placeholder, to_db_timestamp
+from .export import iter_rows, write_rows_atomic
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "state.json"
+
+
+def delta_name(sequence):
+    return f"delta-{sequence:012d}.ndjson.gz"
+
+
+def snapshot_name(sequence):
+    return f"snapshot-{sequence:012d}.ndjson.gz"
+
+
+def load_state(delta_dir=DELTA_DIR):
+    try:
+        with open(os.path.join(delta_dir, STATE_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"sequence": 0, "watermark": None, "snapshot": None, "previous_snapshot": None}
+
+
+def _save_state(delta_dir, state):
+    path = os.path.join(delta_dir, STATE_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _watermark_value(value):
+    # SQLite hands back the stored string; Postgres a datetime
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def _bind_watermark(conn, value):
+    return value if get_placeholder(conn) == "?" else datetime.fromisoformat(value)
+
+
+def init_tombstone_store(conn):
+    """Ids deleted from the tweets table that delta consumers haven't been told about yet"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tweet_tombstones (
+            tweet_id TEXT PRIMARY KEY,
+            deleted_at TIMESTAMP NOT NULL
+        )
+    """)
+    conn.commit()
+
+
+def record_tombstones(cursor, ph, tweet_ids, deleted_at=None):
+    """Note deleted tweets (in the caller's transaction, alongside the DELETE)"""
+    deleted_at = to_db_timestamp(cursor.connection, deleted_at or datetime.now())
+    cursor.executemany(
+        f"INSERT INTO tweet_tombstones (tweet_id, deleted_at) VALUES ({ph}, {ph}) ON CONFLICT (tweet_id) DO NOTHING",
+        [(tweet_id, deleted_at) for tweet_id in tweet_ids]
+    )
+
+
+def _tombstones(conn, until):
+    cursor = conn.cursor()
+    ph = get_placeholder(conn)
+    cursor.execute(f"SELECT tweet_id FROM tweet_tombstones WHERE deleted_at <= {ph} ORDER BY tweet_id", (until,))
+    return [{"tweet_id": row[0], "deleted": True} for row in cursor.fetchall()]
+
+
+def _iter_changes(conn, watermark, upto=None, until=None):
+    """Rows with (updated_at, tweet_id) after watermark (and at most upto), in watermark order
+
+    until bounds updated_at itself: only rows stamped at or before it are returned.
+    """
+    ph = get_placeholder(conn)
+    query = f"SELECT * FROM tweets WHERE is_retweet = {ph}"
+    params = [False]
+
+    if watermark:
+        query += f" AND (updated_at, tweet_id) > ({ph}, {ph})"
+        params.extend([_bind_watermark(conn, watermark["updated_at"]), watermark["tweet_id"]])
+    if upto:
+        query += f" AND (updated_at, tweet_id) <= ({ph}, {ph})"
+        params.extend([_bind_watermark(conn, upto["updated_at"]), upto["tweet_id"]])
+    if until:
+        query += f" AND updated_at <= {ph}"
+        params.append(until)
+
+    query += " ORDER BY updated_at, tweet_id"
+    return iter_rows(conn, query, params, name="tweets_delta")
+
+
+def compact_snapshot(conn, delta_dir=DELTA_DIR, state=None):
+    """Write a full snapshot as of the current sequence and drop superseded deltas"""
+    state = state or load_state(delta_dir)
+    sequence = state["sequence"]
+    count = write_rows_atomic(
+        os.path.join(delta_dir, snapshot_name(sequence)),
+        _iter_changes(conn, None, upto=state["watermark"]),
+        fmt="ndjson", compress=True
+    )
+
+    # Keep deltas back to the previous snapshot so recent consumers stay incremental
+    oldest_kept = state["snapshot"]["sequence"] if state["snapshot"] else 0
+    state["previous_snapshot"], state["snapshot"] = state["snapshot"], {
+        "sequence": sequence,
+        "file": snapshot_name(sequence),
+        "rows": count,
+        "created_at": datetime.now().isoformat(),
+    }
+    _save_state(delta_dir, state)
+
+    for file_name in os.listdir(delta_dir):
+        if file_name.startswith("delta-") and int(file_name[6:18]) <= oldest_kept:
+            os.remove(os.path.join(delta_dir, file_name))
+        elif file_name.startswith("snapshot-") and file_name != state["snapshot"]["file"]:
+            os.remove(os.path.join(delta_dir, file_name))
+
+    logger.info(f"✓ Compacted {count} tweets into {snapshot_name(sequence)}")
+    return state
+
+
+def export_delta(conn, delta_dir=DELTA_DIR, compact_every=DELTA_COMPACT_EVERY,
+                 safety_lag=DELTA_SAFETY_LAG_SECONDS) -> int:
+    """Emit rows changed (and tweets deleted) since the last watermark as the next delta file; returns rows written"""
+    os.makedirs(delta_dir, exist_ok=True)
+    init_tombstone_store(conn)
+    state = load_state(delta_dir)
+    sequence = state["sequence"] + 1
+    until = to_db_timestamp(conn, datetime.now() - timedelta(seconds=safety_lag))
+    tombstones = _tombstones(conn, until)
+    last = {}
+
+    def tracked(rows):
+        for row in rows:
+            last["updated_at"], last["tweet_id"] = row["updated_at"], row["tweet_id"]
+            yield row
+
+    path = os.path.join(delta_dir, delta_name(sequence))
+    rows = tracked(_iter_changes(conn, state["watermark"], until=until))
+    count = write_rows_atomic(path, itertools.chain(rows, tombstones), fmt="ndjson", compress=True)
+
+    if not count:
+        os.remove(path)
+        logger.info("✓ No changes since last delta export")
+        return 0
+
+    state["sequence"] = sequence
+    if last:
+        state["watermark"] = {"updated_at": _watermark_value(last["updated_at"]), "tweet_id": last["tweet_id"]}
+    _save_state(delta_dir, state)
+    if tombstones:
+        # Consumers have them now; later snapshots simply don't contain the rows
+        conn.cursor().execute(f"DELETE FROM tweet_tombstones WHERE deleted_at <= {get_placeholder(conn)}", (until,))
+        conn.commit()
+    logger.info(f"✓ Exported {count - len(tombstones)} changed and {len(tombstones)} deleted tweets "
+                f"to {delta_name(sequence)}")
+
+    snapshot_sequence = state["snapshot"]["sequence"] if state["snapshot"] else 0
+    if sequence - snapshot_sequence >= compact_every:
+        compact_snapshot(conn, delta_dir, state)
+
+    return count
+
+
+def files_since(since_sequence, delta_dir=DELTA_DIR):
+    """Files a consumer at since_sequence must read, in order, to reach the current sequence"""
+    state = load_state(delta_dir)
+    current = state["sequence"]
+    snapshot = state["snapshot"]
+    # Deltas are retained back to (but not including) the previous snapshot
+    oldest_delta = (state["previous_snapshot"]["sequence"] + 1) if state["previous_snapshot"] else 1
+
+    if since_sequence >= current:
+        files = []
+    elif since_sequence + 1 >= oldest_delta:
+        files = [delta_name(seq) for seq in range(since_sequence + 1, current + 1)]
+    else:
+        files = [snapshot["file"]] + [delta_name(seq) for seq in range(snapshot["sequence"] + 1, current + 1)]
+
+    return {"sequence": current, "files": files}
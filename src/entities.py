@@ -0,0 +1,139 @@
+"""
+Gazetteer-based entity tagging (states, LGAs, officials, agencies).
+
+All gazetteer aliases are compiled once into an Aho-Corasick automaton, so
+each tweet is tagged in a single pass over its text regardless of how many
+aliases there are. Tags are stored in the indexed tweet_entities side table
+and used for entity= filtering in the API.
+"""
+
+import logging
+from collections import deque
+from .gazetteer import GAZETTEER
+from .database import get_placeholder
+
+logger = logging.getLogger(__name__)
+
+CASE_SENSITIVE_MAX_LENGTH = 3
+
+
+class EntityMatcher:
+    """Aho-Corasick automaton over gazetteer aliases"""
+
+    def __init__(self, gazetteer=GAZETTEER):
+        self.types = {entity_id: entry["type"] for entity_id, entry in gazetteer.items()}
+        self.goto = [{}]
+        self.fail = [0]
+        # Per state: list of (alias length, entity_id, alias if case-sensitive else None)
+        self.output = [[]]
+
+        for entity_id, entry in gazetteer.items():
+            for alias in entry["aliases"]:
+                case_sensitive = alias.isupper() and len(alias) <= CASE_SENSITIVE_MAX_LENGTH
+                self._add(alias.lower(), (len(alias), entity_id, alias if case_sensitive else None))
+
+        self._build_failure_links()
+
+    def _add(self, pattern, payload):
+        state = 0
+        for char in pattern:
+            nxt = self.goto[state].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = nxt
+        self.output[state].append(payload)
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def match(self, text):
+        """Set of entity ids mentioned in text"""
+        lowered = text.lower()
+        # Case-sensitive checks need the original text at the same offsets
+        aligned = len(lowered) == len(text)
+        found = set()
+        state = 0
+
+        for end, char in enumerate(lowered):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+
+            for length, entity_id, exact in self.output[state]:
+                start = end - length + 1
+                if start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if end + 1 < len(lowered) and lowered[end + 1].isalnum():
+                    continue
+                if exact is not None and (not aligned or text[start:end + 1] != exact):
+                    continue
+                found.add(entity_id)
+
+        return found
+
+
+_matcher = None
+
+
+def get_matcher():
+    """Shared automaton, compiled on first use"""
+    global _matcher
+    if _matcher is None:
+        _matcher = EntityMatcher()
+    return _matcher
+
+
+def tag_entities(tweets: list) -> list:
+    """Attach sorted entity ids to each tweet"""
+    matcher = get_matcher()
+    for tweet in tweets:
+        tweet.entities = tuple(sorted(matcher.match(tweet.text)))
+    return tweets
+
+
+def init_entity_store(conn):
+    """Create the indexed tweet_entities side table"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tweet_entities (
+            tweet_id TEXT NOT NULL,
+            entity TEXT NOT NULL,
+            entity_type TEXT NOT NULL,
+            PRIMARY KEY (tweet_id, entity)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity ON tweet_entities(entity, tweet_id)")
+    conn.commit()
+
+
+def store_entities(conn, tweets: list):
+    """Store entity tags for tagged tweets"""
+    cursor = conn.cursor()
+    ph = get_placeholder(conn)
+    types = get_matcher().types
+
+    rows = [
+        (tweet.key, entity, types[entity])
+        for tweet in tweets
+        for entity in tweet.entities
+    ]
+
+    cursor.executemany(f"""
+        INSERT INTO tweet_entities (tweet_id, entity, entity_type) VALUES ({ph}, {ph}, {ph})
+        ON CONFLICT (tweet_id, entity) DO NOTHING
+    """, rows)
+    conn.commit()
+    logger.info(f"✓ Stored {len(rows)} entity tags")
@@ -0,0 +1,121 @@
+"""
+Streaming, atomic JSON export.
+
+Rows are pulled from a server-side cursor (a named cursor on Postgres; SQLite
+cursors are already lazy) in fixed-size batches and written one at a time as
+NDJSON or a JSON array, optionally gzip-compressed. Output goes to a temp file
+in the target directory that is renamed over the destination only once it is
+complete, so readers never see a partially written export. Memory stays flat
+regardless of export size.
+"""
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+from .config import EXPORT_FORMAT, EXPORT_GZIP, EXPORT_LIMIT
+from .database import get_placeholder, to_db_timestamp
+
+logger = logging.getLogger(__name__)
+
+FETCH_SIZE = 1000
+
+
+def open_stream_cursor(conn, name="tweets_export"):
+    """Server-side cursor on Postgres, regular (lazy) cursor on SQLite"""
+    if get_placeholder(conn) == "?":
+        return conn.cursor()
+    cursor = conn.cursor(name=name)
+    cursor.itersize = FETCH_SIZE
+    return cursor
+
+
+def iter_rows(conn, query, params, name="tweets_export"):
+    """Yield query results as dicts, FETCH_SIZE rows at a time"""
+    cursor = open_stream_cursor(conn, name)
+    try:
+        cursor.execute(query, params)
+        columns = None
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            if columns is None:
+                columns = [desc[0] for desc in cursor.description]
+            for row in rows:
+                yield dict(zip(columns, row))
+    finally:
+        cursor.close()
+
+
+def iter_export_rows(conn, limit=EXPORT_LIMIT, since=None, until=None):
+    """Yield export rows as dicts, newest first"""
+    ph = get_placeholder(conn)
+    query = f"SELECT * FROM tweets WHERE is_retweet = {ph}"
+    params = [False]
+
+    if since:
+        query += f" AND created_at >= {ph}"
+        params.append(to_db_timestamp(conn, since))
+    if until:
+        query += f" AND created_at < {ph}"
+        params.append(to_db_timestamp(conn, until))
+
+    query += " ORDER BY created_at DESC"
+    if limit:
+        query += f" LIMIT {ph}"
+        params.append(limit)
+
+    yield from iter_rows(conn, query, params)
+
+
+def write_rows_atomic(filename, rows, fmt="json", compress=False) -> int:
+    """Stream rows to a temp file and rename it over filename; returns rows written"""
+    if fmt not in ("json", "ndjson"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(prefix=".export_", suffix=".tmp", dir=directory)
+    os.close(fd)
+    opener = gzip.open if compress else open
+    count = 0
+
+    try:
+        with opener(tmp_path, "wt", encoding="utf-8") as out:
+            if fmt == "json":
+                out.write("[")
+            for row in rows:
+                line = json.dumps(row, default=str, ensure_ascii=False)
+                if fmt == "json":
+                    out.write(("\n" if count == 0 else ",\n") + line)
+                else:
+                    out.write(line + "\n")
+                count += 1
+            if fmt == "json":
+                out.write("\n]\n")
+
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return count
+
+
+def stream_export(conn, filename, fmt=EXPORT_FORMAT, compress=EXPORT_GZIP,
+                  limit=EXPORT_LIMIT, since=None, until=None) -> int:
+    """Write tweets to filename atomically; returns the number of rows written"""
+    if fmt not in ("json", "ndjson"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    if compress and not filename.endswith(".gz"):
+        filename += ".gz"
+
+    rows = iter_export_rows(conn, limit=limit, since=since, until=until)
+    count = write_rows_atomic(filename, rows, fmt=fmt, compress=compress)
+
+    logger.info(f"✓ Exported {count} tweets to {filename}")
+    return count
@@ -0,0 +1,135 @@
+"""
+Precomputed static feed shards.
+
+publish_feeds() writes gzip-compressed JSON shards for the common read
+patterns (latest per category, top in the last hour/day, one shard per
+hour) into FEED_DIR. Shard files are content-addressed
+(<name>.<sha256 prefix>.json.gz) so they can be cached forever; only shards
+whose content changed are rewritten. manifest.json maps each logical shard
+name to its current file and hash and is the only file clients need to
+revalidate.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import datetime, timedelta
+from .config import FEED_DIR, FEED_SHARD_SIZE, FEED_HOURS
+from .database import get_placeholder, to_db_timestamp
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+FEED_COLUMNS = [
+    "tweet_id", "author_username", "author_verified", "account_category", "text",
+    "created_at", "likes", "retweets", "replies", "url", "story_id",
+]
+SHARD_FILE_RE = re.compile(r"^[\w.-]+\.[0-9a-f]{16}\.json\.gz$")
+
+
+def _fetch(conn, where="", params=(), order="created_at DESC", limit=None):
+    cursor = conn.cursor()
+    ph = get_placeholder(conn)
+    query = f"SELECT {', '.join(FEED_COLUMNS)} FROM tweets WHERE is_retweet = {ph}{where} ORDER BY {order}"
+    params = [False, *params]
+    if limit:
+        query += f" LIMIT {ph}"
+        params.append(limit)
+    cursor.execute(query, params)
+    return [
+        {col: (bool(val) if col == "author_verified" else val) for col, val in zip(FEED_COLUMNS, row)}
+        for row in cursor.fetchall()
+    ]
+
+
+def build_shards(conn, shard_size=FEED_SHARD_SIZE, hours=FEED_HOURS, now=None):
+    """Compute {shard name: list of tweets} for every published shard"""
+    ph = get_placeholder(conn)
+    now = now or datetime.now()
+    shards = {}
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT DISTINCT account_category FROM tweets WHERE account_category IS NOT NULL")
+    for (category,) in cursor.fetchall():
+        shards[f"latest/{category}"] = _fetch(conn, f" AND account_category = {ph}", [category], limit=shard_size)
+
+    for label, window in (("1h", timedelta(hours=1)), ("24h", timedelta(hours=24))):
+        shards[f"top/{label}"] = _fetch(
+            conn, f" AND created_at > {ph}", [to_db_timestamp(conn, now - window)],
+            order="(likes + retweets + replies) DESC, created_at DESC", limit=shard_size
+        )
+
+    start = (now - timedelta(hours=hours - 1)).replace(minute=0, second=0, microsecond=0)
+    for hour in range(hours):
+        shards[f"hourly/{(start + timedelta(hours=hour)).strftime('%Y-%m-%dT%H')}"] = []
+    for tweet in _fetch(conn, f" AND created_at >= {ph}", [to_db_timestamp(conn, start)]):
+        key = f"hourly/{str(tweet['created_at'])[:13].replace(' ', 'T')}"
+        if key in shards:
+            shards[key].append(tweet)
+
+    return shards
+
+
+def _load_manifest(feed_dir):
+    try:
+        with open(os.path.join(feed_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"shards": {}}
+
+
+def _atomic_write(path, data):
+    fd, tmp_path = tempfile.mkstemp(prefix=".feed_", suffix=".tmp", dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+def publish_feeds(conn, feed_dir=FEED_DIR, shard_size=FEED_SHARD_SIZE, hours=FEED_HOURS) -> int:
+    """Write changed shards and the manifest; returns the number of shards rewritten"""
+    os.makedirs(feed_dir, exist_ok=True)
+    previous = _load_manifest(feed_dir)
+    now = datetime.now()
+    manifest = {"generated_at": previous.get("generated_at"), "shards": {}}
+    written = 0
+
+    for name, tweets in build_shards(conn, shard_size, hours, now).items():
+        payload = json.dumps(tweets, default=str, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        old = previous["shards"].get(name)
+
+        if old and old["sha256"] == digest and os.path.exists(os.path.join(feed_dir, old["file"])):
+            manifest["shards"][name] = old
+            continue
+
+        file_name = f"{name.replace('/', '-')}.{digest[:16]}.json.gz"
+        # mtime=0 keeps the compressed bytes identical for identical content
+        _atomic_write(os.path.join(feed_dir, file_name), gzip.compress(payload, mtime=0))
+        manifest["shards"][name] = {
+            "file": file_name,
+            "sha256": digest,
+            "count": len(tweets),
+            "updated_at": now.isoformat(),
+        }
+        written += 1
+
+    if written or manifest["shards"].keys() != previous["shards"].keys():
+        manifest["generated_at"] = now.isoformat()
+        _atomic_write(
+            os.path.join(feed_dir, MANIFEST_NAME),
+            json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        )
+
+    # Keep the previous generation around for clients holding the old manifest
+    keep = {s["file"] for s in manifest["shards"].values()} | {s["file"] for s in previous["shards"].values()}
+    for file_name in os.listdir(feed_dir):
+        if SHARD_FILE_RE.match(file_name) and file_name not in keep:
+            os.remove(os.path.join(feed_dir, file_name))
+
+    logger.info(f"✓ Published {len(manifest['shards'])} feed shards ({written} changed) to {feed_dir}/")
+    return written
@@ -0,0 +1,138 @@
+"""
+Bundled gazetteer for entity tagging.
+
+Maps a canonical entity id to its type and the aliases it is written as,
+including abbreviations and Pidgin/informal spellings. Short ALL CAPS
+aliases (e.g. "DSS", "BAT", "PH") are matched case-sensitively so ordinary
+words don't trigger them; everything else is matched case-insensitively on
+word boundaries.
+"""
+
+STATES = {
+    "abia": ["Abia", "Abia State"],
+    "adamawa": ["Adamawa", "Adamawa State"],
+    "akwa_ibom": ["Akwa Ibom", "Akwa-Ibom", "AKS", "Akwa Ibom State"],
+    "anambra": ["Anambra", "Anambra State"],
+    "bauchi": ["Bauchi", "Bauchi State"],
+    "bayelsa": ["Bayelsa", "Bayelsa State"],
+    "benue": ["Benue", "Benue State"],
+    "borno": ["Borno", "Borno State"],
+    "cross_river": ["Cross River", "Cross-River", "Cross River State"],
+    "delta": ["Delta State", "Asaba"],
+    "ebonyi": ["Ebonyi", "Ebonyi State"],
+    "edo": ["Edo", "Edo State"],
+    "ekiti": ["Ekiti", "Ekiti State"],
+    "enugu": ["Enugu", "Enugu State"],
+    "fct": ["FCT", "Abuja", "Federal Capital Territory", "Abj"],
+    "gombe": ["Gombe", "Gombe State"],
+    "imo": ["Imo State", "Owerri"],
+    "jigawa": ["Jigawa", "Jigawa State"],
+    "kaduna": ["Kaduna", "Kaduna State"],
+    "kano": ["Kano", "Kano State"],
+    "katsina": ["Katsina", "Katsina State"],
+    "kebbi": ["Kebbi", "Kebbi State"],
+    "kogi": ["Kogi", "Kogi State"],
+    "kwara": ["Kwara", "Kwara State", "Ilorin"],
+    "lagos": ["Lagos", "Lagos State", "Lasgidi", "Eko Atlantic"],
+    "nasarawa": ["Nasarawa", "Nassarawa", "Nasarawa State"],
+    "niger": ["Niger State", "Minna"],
+    "ogun": ["Ogun", "Ogun State", "Abeokuta"],
+    "ondo": ["Ondo", "Ondo State", "Akure"],
+    "osun": ["Osun", "Osun State", "Osogbo"],
+    "oyo": ["Oyo", "Oyo State", "Ibadan"],
+    "plateau": ["Plateau", "Plateau State", "Jos"],
+    "rivers": ["Rivers State", "Port Harcourt", "Port-Harcourt", "PH", "Portharcourt"],
+    "sokoto": ["Sokoto", "Sokoto State"],
+    "taraba": ["Taraba", "Taraba State", "Jalingo"],
+    "yobe": ["Yobe", "Yobe State", "Damaturu"],
+    "zamfara": ["Zamfara", "Zamfara State", "Gusau"],
+}
+
+LGAS = {
+    "ikeja": ["Ikeja"],
+    "alimosho": ["Alimosho"],
+    "eti_osa": ["Eti-Osa", "Eti Osa", "Lekki", "Ajah"],
+    "surulere": ["Surulere"],
+    "lagos_island": ["Lagos Island", "Isale Eko"],
+    "ikorodu": ["Ikorodu"],
+    "epe": ["Epe"],
+    "badagry": ["Badagry"],
+    "oshodi_isolo": ["Oshodi-Isolo", "Oshodi", "Isolo"],
+    "amac": ["AMAC", "Abuja Municipal"],
+    "bwari": ["Bwari"],
+    "gwagwalada": ["Gwagwalada"],
+    "kuje": ["Kuje"],
+    "obio_akpor": ["Obio-Akpor", "Obio Akpor"],
+    "nsukka": ["Nsukka"],
+    "onitsha": ["Onitsha", "Onitsha North", "Onitsha South"],
+    "nnewi": ["Nnewi"],
+    "aba": ["Aba North", "Aba South"],
+    "maiduguri": ["Maiduguri", "Maiduguri Metropolitan"],
+    "gwoza": ["Gwoza"],
+    "chibok": ["Chibok"],
+    "zaria": ["Zaria"],
+    "southern_kaduna": ["Southern Kaduna"],
+    "owo": ["Owo"],
+    "ife": ["Ife Central", "Ile-Ife", "Ile Ife"],
+    "warri": ["Warri", "Warri South"],
+    "makurdi": ["Makurdi"],
+    "kafanchan": ["Jema'a", "Kafanchan"],
+}
+
+OFFICIALS = {
+    "bola_tinubu": ["Tinubu", "Bola Tinubu", "Bola Ahmed Tinubu", "Asiwaju", "Jagaban", "BAT", "President Tinubu"],
+    "kashim_shettima": ["Shettima", "Kashim Shettima", "VP Shettima"],
+    "atiku_abubakar": ["Atiku", "Atiku Abubakar", "Turaki", "Waziri Adamawa"],
+    "peter_obi": ["Peter Obi", "Obi", "Okwute", "Obidient", "Obidients"],
+    "nyesom_wike": ["Wike", "Nyesom Wike", "Mr Project"],
+    "babajide_sanwo_olu": ["Sanwo-Olu", "Sanwo Olu", "Sanwoolu"],
+    "godswill_akpabio": ["Akpabio", "Godswill Akpabio", "Senate President"],
+    "tajudeen_abbas": ["Tajudeen Abbas", "Speaker Abbas"],
+    "muhammadu_buhari": ["Buhari", "Muhammadu Buhari", "Baba Go Slow", "Sai Baba"],
+    "nasir_el_rufai": ["El-Rufai", "El Rufai", "Elrufai", "Nasir El-Rufai"],
+    "rabiu_kwankwaso": ["Kwankwaso", "Rabiu Kwankwaso", "Kwankwasiyya"],
+    "olayemi_cardoso": ["Cardoso", "Olayemi Cardoso", "CBN Governor"],
+    "wale_edun": ["Wale Edun", "Finance Minister"],
+    "nuhu_ribadu": ["Ribadu", "Nuhu Ribadu", "NSA Ribadu"],
+    "kayode_egbetokun": ["Egbetokun", "Kayode Egbetokun", "IGP"],
+    "mahmood_yakubu": ["Mahmood Yakubu", "INEC Chairman"],
+    "ola_olukoyede": ["Olukoyede", "Ola Olukoyede", "EFCC Chairman"],
+    "dele_alake": ["Dele Alake", "Alake"],
+}
+
+AGENCIES = {
+    "inec": ["INEC", "Independent National Electoral Commission"],
+    "efcc": ["EFCC", "Economic and Financial Crimes Commission"],
+    "dss": ["DSS", "SSS", "Department of State Services", "State Security Service"],
+    "icpc": ["ICPC", "Independent Corrupt Practices Commission"],
+    "npf": ["NPF", "Nigeria Police", "Nigerian Police", "Nigeria Police Force", "Police Force", "Olopa"],
+    "ndlea": ["NDLEA", "National Drug Law Enforcement Agency"],
+    "cbn": ["CBN", "Central Bank of Nigeria", "Apex Bank"],
+    "nnpc": ["NNPC", "NNPCL", "NNPC Ltd", "Nigerian National Petroleum"],
+    "ncdc": ["NCDC", "Nigeria Centre for Disease Control"],
+    "frsc": ["FRSC", "Federal Road Safety Corps", "Road Safety"],
+    "nafdac": ["NAFDAC", "National Agency for Food and Drug Administration"],
+    "ncc": ["NCC", "Nigerian Communications Commission"],
+    "nbs": ["NBS", "National Bureau of Statistics"],
+    "nddc": ["NDDC", "Niger Delta Development Commission"],
+    "nysc": ["NYSC", "National Youth Service Corps", "Corper", "Corpers", "Corp member"],
+    "jamb": ["JAMB", "UTME"],
+    "nema": ["NEMA", "National Emergency Management Agency"],
+    "nigerian_army": ["Nigerian Army", "Nigeria Army", "Army HQ"],
+    "nigerian_navy": ["Nigerian Navy", "Nigeria Navy"],
+    "naf": ["NAF", "Nigerian Air Force", "Nigerian Airforce"],
+    "firs": ["FIRS", "Federal Inland Revenue Service"],
+    "customs": ["NCS", "Nigeria Customs", "Nigeria Customs Service", "Customs Service"],
+    "nimc": ["NIMC", "National Identity Management Commission"],
+    "nass": ["National Assembly", "NASS", "Senate", "House of Reps", "House of Representatives"],
+}
+
+GAZETTEER = {}
+for entity_type, entries in (
+    ("state", STATES),
+    ("lga", LGAS),
+    ("official", OFFICIALS),
+    ("agency", AGENCIES),
+):
+    for entity_id, aliases in entries.items():
+        GAZETTEER[entity_id] = {"type": entity_type, "aliases": aliases}
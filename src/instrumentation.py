@@ -0,0 +1,148 @@
+"""
+Where scrape cycle time goes.
+
+Each account visit gets an AccountTimer that records its phases
+(navigation, first_article, extraction, dedup, scroll, then filter, enrich
+and store in the pipeline) into Prometheus histograms by category and
+per-account counters. Cycle-wide steps (pruning, export, archive, feeds) are
+timed on the CycleSummary, which also writes one JSON file per cycle with
+every account's phase breakdown and, if configured, the metrics textfile.
+"""
+
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from .config import CYCLE_SUMMARY_DIR, METRICS_TEXTFILE
+from .logconfig import prune_files
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+PHASE_SECONDS = REGISTRY.histogram(
+    "scraper_phase_seconds", "Time spent in each phase of an account visit", ["phase", "category"])
+ACCOUNT_PHASE_SECONDS = REGISTRY.counter(
+    "scraper_account_phase_seconds_total", "Cumulative time per account and phase", ["account", "phase"])
+TWEETS_SCRAPED = REGISTRY.counter(
+    "scraper_tweets_scraped_total", "New tweets read from account timelines", ["account", "category"])
+ACCOUNT_RESULTS = REGISTRY.counter(
+    "scraper_account_results_total", "Account visits by outcome", ["category", "status"])
+CYCLE_PHASE_SECONDS = REGISTRY.histogram(
+    "scraper_cycle_phase_seconds", "Time spent in cycle-wide steps", ["phase"])
+CYCLE_SECONDS = REGISTRY.histogram(
+    "scraper_cycle_seconds", "Duration of whole scrape cycles", buckets=(30, 60, 120, 300, 600, 900, 1800, 3600))
+LAST_CYCLE = REGISTRY.gauge("scraper_last_cycle_timestamp_seconds", "When the last cycle finished")
+
+
+class AccountTimer:
+    """Phase times for one account within a cycle (retries add to the same totals)"""
+
+    def __init__(self, account, category):
+        self.account = account
+        self.category = category
+        self.phases = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.status = None
+        self.tweets = 0
+        self.started = time.time()
+        self.finished = None
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name, seconds):
+        self.phases[name] += seconds
+        self.counts[name] += 1
+        PHASE_SECONDS.observe(seconds, phase=name, category=self.category)
+        ACCOUNT_PHASE_SECONDS.inc(seconds, account=self.account, phase=name)
+
+    def finish(self, status, tweets=0):
+        self.status = status
+        self.tweets = tweets
+        self.finished = time.time()
+        ACCOUNT_RESULTS.inc(category=self.category, status=status)
+        if tweets:
+            TWEETS_SCRAPED.inc(tweets, account=self.account, category=self.category)
+
+    def as_dict(self):
+        return {
+            "account": self.account,
+            "category": self.category,
+            "status": self.status,
+            "tweets": self.tweets,
+            "seconds": round(sum(self.phases.values()), 3),
+            "phases": {name: {"seconds": round(s, 3), "count": self.counts[name]} for name, s in self.phases.items()},
+        }
+
+
+class CycleSummary:
+    """Per-cycle breakdown of where the time went"""
+
+    def __init__(self, cycle_id=None):
+        self.started = time.time()
+        self.cycle_id = cycle_id or time.strftime("%Y%m%dT%H%M%S", time.localtime(self.started))
+        self.accounts = {}
+        self.phases = defaultdict(float)
+
+    def account(self, username, category):
+        if username not in self.accounts:
+            self.accounts[username] = AccountTimer(username, category)
+        return self.accounts[username]
+
+    @contextmanager
+    def phase(self, name):
+        """Time a cycle-wide step"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self.phases[name] += seconds
+            CYCLE_PHASE_SECONDS.observe(seconds, phase=name)
+
+    def as_dict(self, finished=None):
+        finished = finished or time.time()
+        accounts = [timer.as_dict() for timer in self.accounts.values()]
+        account_phases = defaultdict(float)
+        for timer in self.accounts.values():
+            for name, seconds in timer.phases.items():
+                account_phases[name] += seconds
+        return {
+            "cycle_id": self.cycle_id,
+            "started_at": self.started,
+            "finished_at": finished,
+            "seconds": round(finished - self.started, 3),
+            "tweets": sum(a["tweets"] for a in accounts),
+            "account_phases": {name: round(s, 3) for name, s in sorted(account_phases.items(), key=lambda x: -x[1])},
+            "cycle_phases": {name: round(s, 3) for name, s in self.phases.items()},
+            "slowest_accounts": [a["account"] for a in sorted(accounts, key=lambda a: -a["seconds"])[:5]],
+            "accounts": accounts,
+        }
+
+    def finish(self, directory=CYCLE_SUMMARY_DIR, textfile=METRICS_TEXTFILE):
+        """Record the cycle, write its JSON summary and the metrics textfile; returns the summary"""
+        finished = time.time()
+        summary = self.as_dict(finished)
+        CYCLE_SECONDS.observe(summary["seconds"])
+        LAST_CYCLE.set(finished)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"cycle-{self.cycle_id}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+            prune_files(os.path.join(directory, "cycle-*.json"))
+        if textfile:
+            REGISTRY.write_textfile(textfile)
+
+        total = sum(summary["account_phases"].values()) or 1
+        breakdown = ", ".join(f"{name} {s / total:.0%}" for name, s in list(summary["account_phases"].items())[:6])
+        logger.info(f"⏲️ Account time by phase: {breakdown}")
+        return summary
@@ -0,0 +1,180 @@
+"""
+Work distribution across scraper processes via DB leases.
+
+Accounts are rows in account_schedule. A worker claims one due account at a
+time by stamping it with its id and a lease expiry, heartbeats while it
+scrapes, and releases the lease when done. Postgres claims with
+SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers never block on or
+double-claim a row; SQLite picks a candidate and takes it with an UPDATE that
+re-checks it is still due and unleased, moving on to the next candidate if
+another worker won. A crashed worker's lease simply expires and the account
+becomes claimable again.
+
+Cluster-wide roles work the same way: the publisher (the one worker that
+writes exports, deltas, the archive and feeds) holds a renewable lease row in
+worker_roles, and another worker takes over once it expires.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from .config import LEASE_SECONDS, ROLE_LEASE_SECONDS
+from .database import get_placeholder
+from .polling import SCHEDULE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+def init_lease_store(conn):
+    """Create the worker_roles table (one row per cluster-wide role)"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS worker_roles (
+            role TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires DOUBLE PRECISION NOT NULL
+        )
+    """)
+    conn.commit()
+
+
+def default_worker_id():
+    return os.getenv("WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class WorkQueue:
+    """Lease accounts from the account_schedule table"""
+
+    def __init__(self, conn, worker_id=None, lease_seconds=LEASE_SECONDS):
+        self.conn = conn
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.ph = get_placeholder(conn)
+        self.is_sqlite = self.ph == "?"
+        self.holding = {}  # username -> heartbeat task
+
+    def sync(self, state):
+        """Make sure every configured account has a row to claim"""
+        cursor = self.conn.cursor()
+        for s in state.values():
+            cursor.execute(f"""
+                INSERT INTO account_schedule ({', '.join(SCHEDULE_COLUMNS)})
+                VALUES ({', '.join([self.ph] * len(SCHEDULE_COLUMNS))})
+                ON CONFLICT (username) DO NOTHING
+            """, [s[col] for col in SCHEDULE_COLUMNS])
+        self.conn.commit()
+
+    def claim(self, usernames, now=None):
+        """Lease the most overdue unleased account among usernames; returns its row or None"""
+        now = now or time.time()
+        ph = self.ph
+        in_list = ", ".join([ph] * len(usernames))
+        candidate = f"""
+            SELECT username FROM account_schedule
+            WHERE next_due <= {ph} AND (lease_expires IS NULL OR lease_expires < {ph})
+              AND username IN ({in_list})
+            ORDER BY next_due LIMIT 1
+        """
+        cursor = self.conn.cursor()
+
+        # A worker can hold several leases (accounts still in the ingest pipeline),
+        # so the claimed row is identified by username, never by lease_owner alone
+        if self.is_sqlite:
+            # Pick a candidate, then take it only if it's still free; another
+            # worker may get there first, in which case try the next one
+            while True:
+                cursor.execute(candidate, [now, now, *usernames])
+                row = cursor.fetchone()
+                if row is None:
+                    self.conn.commit()
+                    return None
+                username = row[0]
+                cursor.execute(f"""
+                    UPDATE account_schedule SET lease_owner = {ph}, lease_expires = {ph}
+                    WHERE username = {ph} AND next_due <= {ph}
+                      AND (lease_expires IS NULL OR lease_expires < {ph})
+                """, (self.worker_id, now + self.lease_seconds, username, now, now))
+                claimed = cursor.rowcount == 1
+                self.conn.commit()
+                if claimed:
+                    break
+            cursor.execute(
+                f"SELECT {', '.join(SCHEDULE_COLUMNS)} FROM account_schedule WHERE username = {ph} AND lease_owner = {ph}",
+                (username, self.worker_id)
+            )
+        else:
+            cursor.execute(f"""
+                UPDATE account_schedule SET lease_owner = {ph}, lease_expires = {ph}
+                WHERE username = ({candidate} FOR UPDATE SKIP LOCKED)
+                RETURNING {', '.join(SCHEDULE_COLUMNS)}
+            """, [self.worker_id, now + self.lease_seconds, now, now, *usernames])
+
+        row = cursor.fetchone()
+        self.conn.commit()
+        if row is None:
+            return None
+        return dict(zip(SCHEDULE_COLUMNS, row.values() if isinstance(row, dict) else row))
+
+    def elect(self, role, now=None, lease_seconds=ROLE_LEASE_SECONDS):
+        """Take or renew the lease on a cluster-wide role; True if this worker holds it"""
+        now = now or time.time()
+        ph = self.ph
+        cursor = self.conn.cursor()
+        # Only overwrites a row we already own or whose lease has run out
+        cursor.execute(f"""
+            INSERT INTO worker_roles (role, owner, expires) VALUES ({ph}, {ph}, {ph})
+            ON CONFLICT (role) DO UPDATE SET owner = EXCLUDED.owner, expires = EXCLUDED.expires
+            WHERE worker_roles.owner = EXCLUDED.owner OR worker_roles.expires < {ph}
+        """, (role, self.worker_id, now + lease_seconds, now))
+        held = cursor.rowcount == 1
+        self.conn.commit()
+        return held
+
+    def heartbeat(self, username, now=None):
+        """Extend the lease; False if it expired and was taken over by another worker"""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"UPDATE account_schedule SET lease_expires = {self.ph} WHERE username = {self.ph} AND lease_owner = {self.ph}",
+            ((now or time.time()) + self.lease_seconds, username, self.worker_id)
+        )
+        self.conn.commit()
+        return cursor.rowcount == 1
+
+    def release(self, username, retry_at=None, conn=None):
+        """Give the account back; retry_at pushes back its next visit (e.g. after a failure)"""
+        conn = conn or self.conn
+        cursor = conn.cursor()
+        if retry_at is None:
+            cursor.execute(
+                f"UPDATE account_schedule SET lease_owner = NULL, lease_expires = NULL WHERE username = {self.ph} AND lease_owner = {self.ph}",
+                (username, self.worker_id)
+            )
+        else:
+            cursor.execute(
+                f"UPDATE account_schedule SET lease_owner = NULL, lease_expires = NULL, next_due = {self.ph} WHERE username = {self.ph} AND lease_owner = {self.ph}",
+                (retry_at, username, self.worker_id)
+            )
+        conn.commit()
+
+    def hold(self, username):
+        """Heartbeat the lease in the background until unhold(), i.e. through scraping and until the
+        account's tweets come out of the ingest pipeline and it is released"""
+        async def beat():
+            while True:
+                await asyncio.sleep(self.lease_seconds / 3)
+                if not self.heartbeat(username):
+                    logger.warning(f"Lost lease on @{username}; another worker may scrape it too")
+                    return
+
+        self.unhold(username)
+        self.holding[username] = asyncio.create_task(beat())
+
+    def unhold(self, username=None):
+        """Stop heartbeating one account's lease (all of them if username is None)"""
+        for name in [username] if username is not None else list(self.holding):
+            task = self.holding.pop(name, None)
+            if task is not None:
+                task.cancel()
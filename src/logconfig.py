@@ -0,0 +1,197 @@
+"""
+Logging setup for the scraper and API.
+
+Log calls only put the record on an in-memory queue. A QueueListener thread
+does the formatting and the file/console I/O, so logging never blocks the
+event loop.
+
+Files are named <prefix>_<date>.log and switch over at midnight, even in a
+long-running daemon. Within a day they roll over to .1, .2 and so on past
+LOG_MAX_MB. Days older than LOG_RETENTION_DAYS are deleted at startup and at
+each day switch; cycle summaries and profiles use prune_files for the same.
+
+LOG_FORMAT=json writes one JSON object per line. Warnings repeated from the
+same call site (e.g. "Error extracting tweet" on every article of a broken
+page) are rate-limited, and the next one that gets through says how many
+were dropped.
+"""
+
+import atexit
+import copy
+import glob
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import date, datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from .config import (
+    LOG_DIR, LOG_LEVEL, LOG_FORMAT, LOG_MAX_MB, LOG_BACKUP_COUNT, LOG_RETENTION_DAYS,
+    LOG_REPEAT_BURST, LOG_REPEAT_WINDOW_SECONDS,
+)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener = None
+
+
+class DailyRotatingFileHandler(RotatingFileHandler):
+    """<prefix>_<date>.log, starting a new file each day and rolling over to .1, .2... past max_bytes"""
+
+    def __init__(self, directory, prefix, max_bytes=0, backup_count=0, retention_days=0):
+        self.directory = directory
+        self.prefix = prefix
+        self.retention_days = retention_days
+        self.day = date.today()
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(self._path(self.day), maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+
+    def _path(self, day):
+        return os.path.join(self.directory, f"{self.prefix}_{day:%Y-%m-%d}.log")
+
+    def shouldRollover(self, record):
+        # Only forward: a record stamped just before midnight but handled after the switch
+        # must not send the handler back to the previous day's file
+        if date.fromtimestamp(record.created) > self.day:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        today = date.today()
+        if today == self.day:
+            super().doRollover()
+            return
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.day = today
+        self.baseFilename = os.path.abspath(self._path(today))
+        self.stream = self._open()
+        self.prune()
+
+    def prune(self):
+        """Delete files from days past the retention period"""
+        prune_files(os.path.join(self.directory, f"{self.prefix}_*.log*"), self.retention_days)
+
+
+def prune_files(pattern, retention_days=LOG_RETENTION_DAYS):
+    """Delete files matching the glob pattern last modified more than retention_days ago"""
+    if not retention_days:
+        return
+    cutoff = time.time() - retention_days * 86400
+    for path in glob.glob(pattern):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message and exception if any"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RepeatFilter(logging.Filter):
+    """Let through at most `burst` warnings per call site per `window` seconds"""
+
+    def __init__(self, burst=LOG_REPEAT_BURST, window=LOG_REPEAT_WINDOW_SECONDS):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.sites = {}  # (pathname, lineno) -> [window start, passed, suppressed]
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        # Errors always get through; only warnings are the noisy kind
+        if not self.burst or record.levelno != logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        with self.lock:
+            site = self.sites.get(key)
+            if site is None or record.created - site[0] >= self.window:
+                suppressed = site[2] if site else 0
+                self.sites[key] = [record.created, 1, 0]
+            elif site[1] < self.burst:
+                site[1] += 1
+                suppressed = 0
+            else:
+                site[2] += 1
+                return False
+        if suppressed:
+            record.msg = f"{record.getMessage()} (suppressed {suppressed} similar in the last {self.window:.0f}s)"
+            record.args = None
+        return True
+
+
+class _LocalQueueHandler(QueueHandler):
+    """Queues the record with its message merged but leaves formatting (tracebacks too) to the listener"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_logging(prefix="scraper", directory=LOG_DIR, level=LOG_LEVEL, fmt=LOG_FORMAT, force=False):
+    """Route the root logger through a queue to the rotating file and the console.
+
+    Like logging.basicConfig, does nothing if the root logger already has handlers unless force is set.
+    Returns the running QueueListener (stopped automatically at exit).
+    """
+    global _listener
+    root = logging.getLogger()
+    if root.handlers and not force:
+        return _listener
+    stop_logging()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+    formatter = JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT)
+    file_handler = DailyRotatingFileHandler(directory, prefix, max_bytes=int(LOG_MAX_MB * 1024 * 1024),
+                                            backup_count=LOG_BACKUP_COUNT, retention_days=LOG_RETENTION_DAYS)
+    # Short runs (cron, one-shot scrapes) never reach midnight, so prune here as well
+    file_handler.prune()
+    console = logging.StreamHandler(sys.stderr)
+    for handler in (file_handler, console):
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    queue_handler = _LocalQueueHandler(records)
+    queue_handler.addFilter(RepeatFilter())
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(records, file_handler, console, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,84 @@
+"""
+Process memory sampling for the scraper and the browser it drives.
+
+Reads /proc directly so no extra dependency is needed; on platforms without
+/proc the helpers return None and memory-based decisions are skipped.
+
+Finding the browser's processes means reading every /proc/<pid>/stat, so the
+descendant pids are cached and only rescanned every PID_RESCAN_SECONDS or
+when one of them has exited; in between a sample reads just their status files.
+"""
+
+import os
+import time
+
+PID_RESCAN_SECONDS = 30
+
+
+def _read_status_kb(pid, field="VmRSS"):
+    """The field's value in kB; 0 if it's missing, None if the process is gone"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    except (ValueError, IndexError):
+        pass
+    return 0
+
+
+def _children_map():
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Field 4 is the parent pid; split after the ")" closing the command name
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_rss_mb(pid=None):
+    """Resident memory of a single process in MB"""
+    if not os.path.isdir("/proc"):
+        return None
+    return (_read_status_kb(pid or os.getpid()) or 0) / 1024
+
+
+def _descendants(pid):
+    children = _children_map()
+    found = []
+    stack = list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        found.append(child)
+        stack.extend(children.get(child, []))
+    return found
+
+
+_tree_cache = {}  # root pid -> (scanned at, descendant pids)
+
+
+def child_processes_rss_mb(pid=None, rescan_seconds=PID_RESCAN_SECONDS):
+    """Combined resident memory of all descendants (Playwright driver + browser) in MB"""
+    if not os.path.isdir("/proc"):
+        return None
+
+    pid = pid or os.getpid()
+    now = time.monotonic()
+    cached = _tree_cache.get(pid)
+    if cached is not None and now - cached[0] < rescan_seconds:
+        sizes = [_read_status_kb(child) for child in cached[1]]
+        if None not in sizes:
+            return sum(sizes) / 1024
+
+    # First sample, cache expired (new renderers may have started) or a process exited
+    pids = _descendants(pid)
+    _tree_cache[pid] = (now, pids)
+    return sum(_read_status_kb(child) or 0 for child in pids) / 1024
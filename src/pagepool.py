@@ -0,0 +1,131 @@
+"""
+Reusable browser pages for a scrape run.
+
+Opening a page per account pays page creation, the context's init scripts
+(stealth) and renderer warm-up every time. The pool keeps warmed pages
+instead: each page is set up once (route handlers), reset to about:blank
+between accounts, checked before it's handed out again, and retired after
+PAGE_MAX_USES accounts or as soon as a scrape on it fails. Time spent
+getting a page ready is recorded per account so the saving shows up in the
+cycle log.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from .config import PAGE_MAX_USES
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_SECONDS = 5
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+
+async def block_heavy_resources(page):
+    """Route handler setup: skip downloading images, video and fonts (the scraper only reads text)"""
+    async def handle(route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    await page.route("**/*", handle)
+
+
+class PagePool:
+    """Hands out warmed pages from one browser context"""
+
+    def __init__(self, context, max_uses=PAGE_MAX_USES, setup=None, max_idle=1):
+        self.context = context
+        self.max_uses = max_uses
+        self.setup = setup
+        self.max_idle = max_idle
+        self.idle = []
+        self.uses = {}
+        self.created = 0
+        self.reused = 0
+        self.retired = 0
+        self.setup_seconds = []
+
+    async def _new_page(self):
+        page = await self.context.new_page()
+        if self.setup:
+            await self.setup(page)
+        self.uses[id(page)] = 0
+        self.created += 1
+        return page
+
+    async def _healthy(self, page):
+        if page.is_closed():
+            return False
+        try:
+            return await asyncio.wait_for(page.evaluate("() => document.readyState"), HEALTH_CHECK_SECONDS) is not None
+        except Exception:
+            return False
+
+    async def _retire(self, page):
+        self.uses.pop(id(page), None)
+        self.retired += 1
+        try:
+            await page.close()
+        except Exception:
+            pass  # Already gone with a crashed renderer
+
+    async def acquire(self):
+        started = time.perf_counter()
+        page = None
+        while self.idle and page is None:
+            candidate = self.idle.pop()
+            if await self._healthy(candidate):
+                page = candidate
+                self.reused += 1
+            else:
+                logger.info("Retiring unresponsive pooled page")
+                await self._retire(candidate)
+        if page is None:
+            page = await self._new_page()
+        self.uses[id(page)] += 1
+        self.setup_seconds.append(time.perf_counter() - started)
+        return page
+
+    async def release(self, page, healthy=True):
+        """Reset a page for the next account, or retire it when it's worn out or failed"""
+        if not healthy or self.uses.get(id(page), self.max_uses) >= self.max_uses or len(self.idle) >= self.max_idle:
+            await self._retire(page)
+            return
+        try:
+            # Drops the timeline's DOM, observers and in-flight requests
+            await page.goto("about:blank")
+        except Exception:
+            await self._retire(page)
+            return
+        self.idle.append(page)
+
+    @asynccontextmanager
+    async def page(self):
+        """A page for one account; retired instead of reused if the block raises"""
+        page = await self.acquire()
+        try:
+            yield page
+        except BaseException:
+            await self.release(page, healthy=False)
+            raise
+        await self.release(page)
+
+    async def drain(self):
+        """Retire every idle page (e.g. when the browser is using too much memory)"""
+        while self.idle:
+            await self._retire(self.idle.pop())
+
+    async def close(self):
+        await self.drain()
+
+    def report(self):
+        setups = self.setup_seconds
+        return {
+            "pages_created": self.created,
+            "pages_reused": self.reused,
+            "pages_retired": self.retired,
+            "avg_setup_ms": round(sum(setups) / len(setups) * 1000, 1) if setups else None,
+            "first_setup_ms": round(setups[0] * 1000, 1) if setups else None,
+        }
@@ -0,0 +1,156 @@
+"""
+Streaming ingestion pipeline.
+
+Stages are coroutines connected by bounded asyncio.Queues: each stage runs
+in its own task and takes the next item as soon as it's done with the last,
+so the scraper keeps navigating while earlier accounts are filtered and
+stored. A full queue makes the stage feeding it wait (backpressure) instead
+of buffering without bound. Blocking database work goes through DbExecutor,
+a single worker thread that owns its own connection, opened on first use and
+reopened if it breaks. Per-stage counters
+(items, busy time, queue depth, errors) are kept for the cycle report.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class StageMetrics:
+    """Throughput and queue depth of one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+        self.depth_total = 0
+        self.depth_samples = 0
+
+    def sample_depth(self, depth):
+        self.max_depth = max(self.max_depth, depth)
+        self.depth_total += depth
+        self.depth_samples += 1
+
+    def as_dict(self):
+        return {
+            "stage": self.name,
+            "batches": self.batches,
+            "items": self.items,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "items_per_second": round(self.items / self.busy_seconds, 1) if self.busy_seconds else None,
+            "max_queue_depth": self.max_depth,
+            "avg_queue_depth": round(self.depth_total / self.depth_samples, 2) if self.depth_samples else 0,
+        }
+
+
+class Pipeline:
+    """Run items through (name, coroutine function) stages over bounded queues"""
+
+    def __init__(self, stages, maxsize=4, size=len):
+        self.stages = stages
+        self.size = size
+        self.queues = [asyncio.Queue(maxsize=maxsize) for _ in stages]
+        self.metrics = [StageMetrics(name) for name, _ in stages]
+        self.tasks = []
+
+    def start(self):
+        for i, (name, fn) in enumerate(self.stages):
+            self.tasks.append(asyncio.create_task(self._run_stage(i, fn), name=f"pipeline-{name}"))
+        return self
+
+    async def put(self, item):
+        """Feed the first stage; waits while it is backed up"""
+        self.metrics[0].sample_depth(self.queues[0].qsize())
+        await self.queues[0].put(item)
+
+    async def _run_stage(self, i, fn):
+        inbox = self.queues[i]
+        outbox = self.queues[i + 1] if i + 1 < len(self.queues) else None
+        metrics = self.metrics[i]
+
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                if outbox is not None:
+                    await outbox.put(_DONE)
+                return
+
+            started = time.perf_counter()
+            try:
+                result = await fn(item)
+            except Exception as e:
+                # A failed item is dropped; its account isn't checkpointed, so it is redone later
+                metrics.errors += 1
+                logger.error(f"Pipeline stage '{metrics.name}' failed: {e}")
+                continue
+            finally:
+                metrics.busy_seconds += time.perf_counter() - started
+            metrics.batches += 1
+            metrics.items += self.size(item)
+
+            if outbox is not None and result is not None:
+                metrics_next = self.metrics[i + 1]
+                metrics_next.sample_depth(outbox.qsize())
+                await outbox.put(result)
+
+    async def close(self):
+        """Let queued items drain through every stage, then stop"""
+        await self.queues[0].put(_DONE)
+        await asyncio.gather(*self.tasks)
+
+    def report(self):
+        return [m.as_dict() for m in self.metrics]
+
+
+class DbExecutor:
+    """Runs blocking DB calls on one worker thread with its own connection"""
+
+    def __init__(self, connect):
+        self.connect = connect
+        self.conn = None
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+
+    def _call(self, fn, args):
+        # Connected lazily on the worker thread: connections can't be shared with the event
+        # loop thread (SQLite forbids it). A failed connect fails this call; the next one retries.
+        if self.conn is None:
+            self.conn = self.connect()
+        try:
+            return fn(self.conn, *args)
+        except Exception:
+            self._drop_if_broken()
+            raise
+
+    def _drop_if_broken(self):
+        """After a failed call, reconnect next time if the connection itself is gone"""
+        try:
+            self.conn.rollback()
+            self.conn.cursor().execute("SELECT 1")
+        except Exception:
+            self._close()
+
+    async def run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, self._call, fn, args)
+
+    def _close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+
+    def shutdown(self):
+        if self.conn is not None:
+            self.pool.submit(self._close)
+        self.pool.shutdown(wait=True)
@@ -0,0 +1,214 @@
+"""
+Adaptive per-account polling priorities.
+
+Each account's posting rate is estimated from what previous visits found
+(an EWMA of new tweets per hour, seeded from the tweets table) and its next
+visit is scheduled so that a visit is expected to find about
+POLL_TARGET_YIELD new tweets, clamped between a floor and a ceiling and
+jittered so accounts don't synchronise. Due accounts come off a priority
+queue ordered by how overdue they are. Schedule state lives in the
+account_schedule table so it survives restarts, and freshness_report()
+compares expected and observed ingestion lag per account.
+"""
+
+import heapq
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from .config import (
+    POLL_FLOOR_MINUTES, POLL_CEILING_MINUTES, POLL_TARGET_YIELD, POLL_JITTER,
+)
+from .database import get_placeholder, to_db_timestamp
+
+logger = logging.getLogger(__name__)
+
+EWMA_ALPHA = 0.3
+PRIOR_RATE_PER_HOUR = 0.1
+HISTORY_HOURS = 72
+# Extra look-back so tweets posted just before the previous visit aren't missed
+WINDOW_MARGIN_MINUTES = 10
+
+SCHEDULE_COLUMNS = [
+    "username", "category", "rate_per_hour", "interval_seconds", "next_due",
+    "last_scraped_at", "last_yield", "lag_seconds", "scrape_seconds",
+]
+
+
+def init_schedule_store(conn):
+    """Create the account_schedule table (also the work table workers lease accounts from)"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS account_schedule (
+            username TEXT PRIMARY KEY,
+            category TEXT,
+            rate_per_hour DOUBLE PRECISION,
+            interval_seconds DOUBLE PRECISION,
+            next_due DOUBLE PRECISION,
+            last_scraped_at DOUBLE PRECISION,
+            last_yield INTEGER,
+            lag_seconds DOUBLE PRECISION,
+            scrape_seconds DOUBLE PRECISION,
+            lease_owner TEXT,
+            lease_expires DOUBLE PRECISION
+        )
+    """)
+    
+    # Migration: lease columns were added after the table
+    cursor.execute("SELECT * FROM account_schedule LIMIT 0")
+    existing = {col[0] for col in cursor.description}
+    for col_name, col_type in [("lease_owner", "TEXT"), ("lease_expires", "DOUBLE PRECISION")]:
+        if col_name not in existing:
+            cursor.execute(f"ALTER TABLE account_schedule ADD COLUMN {col_name} {col_type}")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_schedule_due ON account_schedule(next_due)")
+    conn.commit()
+
+
+def _history_rates(conn):
+    """Tweets per hour per author over the recent history in the hot table"""
+    cursor = conn.cursor()
+    ph = get_placeholder(conn)
+    since = to_db_timestamp(conn, datetime.now() - timedelta(hours=HISTORY_HOURS))
+    cursor.execute(
+        f"SELECT author_username, COUNT(*) FROM tweets WHERE created_at > {ph} GROUP BY author_username",
+        (since,)
+    )
+    return {username: count / HISTORY_HOURS for username, count in cursor.fetchall()}
+
+
+class PollingScheduler:
+    """Priority-queue scheduler over ACCOUNTS driven by estimated posting rates"""
+
+    def __init__(self, conn, accounts, floor_minutes=POLL_FLOOR_MINUTES, ceiling_minutes=POLL_CEILING_MINUTES,
+                 target_yield=POLL_TARGET_YIELD, jitter=POLL_JITTER, rng=None):
+        self.conn = conn
+        self.floor = floor_minutes * 60
+        self.ceiling = ceiling_minutes * 60
+        self.target_yield = target_yield
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.state = {}
+
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {', '.join(SCHEDULE_COLUMNS)} FROM account_schedule")
+        stored = {row[0]: dict(zip(SCHEDULE_COLUMNS, row)) for row in cursor.fetchall()}
+        history = None
+
+        for category, usernames in accounts.items():
+            for username in usernames:
+                if username in stored:
+                    self.state[username] = stored[username]
+                    self.state[username]["category"] = category
+                    continue
+                if history is None:
+                    history = _history_rates(conn)
+                # New accounts are due immediately, seeded from stored history
+                self.state[username] = {
+                    "username": username,
+                    "category": category,
+                    "rate_per_hour": history.get(username, 0) + PRIOR_RATE_PER_HOUR,
+                    "interval_seconds": self.floor,
+                    "next_due": 0.0,
+                    "last_scraped_at": None,
+                    "last_yield": None,
+                    "lag_seconds": None,
+                    "scrape_seconds": None,
+                }
+
+    def adopt(self, row):
+        """Replace the cached state of an account with a row freshly read from the table"""
+        row = dict(row)
+        row["category"] = self.state.get(row["username"], row)["category"]
+        self.state[row["username"]] = {col: row[col] for col in SCHEDULE_COLUMNS}
+
+    def due_accounts(self, now=None, limit=None) -> list:
+        """(category, username, window_minutes) for accounts due now, most overdue first"""
+        now = now or time.time()
+        heap = [(s["next_due"], username) for username, s in self.state.items() if s["next_due"] <= now]
+        heapq.heapify(heap)
+
+        due = []
+        while heap and (limit is None or len(due) < limit):
+            _, username = heapq.heappop(heap)
+            due.append((self.state[username]["category"], username, self.window_minutes(username, now)))
+        return due
+
+    def window_minutes(self, username, now=None):
+        """How far back to accept tweets: everything since the previous visit"""
+        last = self.state[username]["last_scraped_at"]
+        if last is None:
+            return None
+        return ((now or time.time()) - last) / 60 + WINDOW_MARGIN_MINUTES
+
+    def record(self, username, tweets, started, finished=None, conn=None):
+        """Update rate, lag and next due time after scraping an account; conn overrides the scheduler's own"""
+        finished = finished or time.time()
+        s = self.state[username]
+
+        # The look-back window (at least TIME_WINDOW_MINUTES, plus a margin) re-reads tweets found on
+        # earlier visits, and ones below the engagement filter are never stored to dedupe against;
+        # only tweets posted since the previous visit are new
+        if s["last_scraped_at"] is not None:
+            tweets = [tweet for tweet in tweets if tweet.created_at > s["last_scraped_at"]]
+            hours = max((finished - s["last_scraped_at"]) / 3600, 1 / 60)
+            observed = len(tweets) / hours
+            s["rate_per_hour"] = EWMA_ALPHA * observed + (1 - EWMA_ALPHA) * s["rate_per_hour"]
+
+        lags = [finished - tweet.created_at for tweet in tweets]
+        if lags:
+            lag = sum(lags) / len(lags)
+            s["lag_seconds"] = lag if s["lag_seconds"] is None else EWMA_ALPHA * lag + (1 - EWMA_ALPHA) * s["lag_seconds"]
+
+        duration = finished - started
+        s["scrape_seconds"] = duration if s["scrape_seconds"] is None else EWMA_ALPHA * duration + (1 - EWMA_ALPHA) * s["scrape_seconds"]
+
+        if s["last_scraped_at"] is None:
+            # First visit gives no rate sample yet; come back soon to get one
+            interval = self.floor
+        else:
+            interval = self.target_yield / max(s["rate_per_hour"], 1e-6) * 3600
+            interval = min(max(interval, self.floor), self.ceiling)
+        s["interval_seconds"] = interval
+        s["next_due"] = finished + interval * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+        s["last_scraped_at"] = finished
+        s["last_yield"] = len(tweets)
+        self._save(s, conn or self.conn)
+
+    def _save(self, s, conn):
+        ph = get_placeholder(conn)
+        updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in SCHEDULE_COLUMNS[1:])
+        conn.cursor().execute(f"""
+            INSERT INTO account_schedule ({', '.join(SCHEDULE_COLUMNS)})
+            VALUES ({', '.join([ph] * len(SCHEDULE_COLUMNS))})
+            ON CONFLICT (username) DO UPDATE SET {updates}
+        """, [s[col] for col in SCHEDULE_COLUMNS])
+        conn.commit()
+
+    def browser_minutes_per_hour(self):
+        """Expected browser time per hour under the current schedule"""
+        total = 0.0
+        for s in self.state.values():
+            total += (s["scrape_seconds"] or 0) * 3600 / s["interval_seconds"]
+        return total / 60
+
+
+def freshness_report(conn) -> list:
+    """Expected vs observed freshness (ingestion lag) per account, stalest first"""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {', '.join(SCHEDULE_COLUMNS)} FROM account_schedule")
+    report = []
+    for row in cursor.fetchall():
+        s = dict(zip(SCHEDULE_COLUMNS, row.values() if isinstance(row, dict) else row))
+        report.append({
+            "username": s["username"],
+            "category": s["category"],
+            "rate_per_hour": round(s["rate_per_hour"] or 0, 3),
+            "interval_minutes": round((s["interval_seconds"] or 0) / 60, 1),
+            # Posts land uniformly between visits, so the expected lag is half an interval
+            "expected_freshness_minutes": round((s["interval_seconds"] or 0) / 120, 1),
+            "actual_freshness_minutes": round(s["lag_seconds"] / 60, 1) if s["lag_seconds"] is not None else None,
+            "last_yield": s["last_yield"],
+            "next_due": datetime.fromtimestamp(s["next_due"]).isoformat() if s["next_due"] else None,
+        })
+    report.sort(key=lambda r: r["actual_freshness_minutes"] or 0, reverse=True)
+    return report
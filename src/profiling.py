@@ -0,0 +1,180 @@
+"""
+Profiling for a single scrape cycle.
+
+While a CycleProfiler is running it collects three things. cProfile
+records CPU time on the event-loop thread. tracemalloc takes a snapshot at
+cycle end. Asyncio debug mode captures slow-callback warnings: any step
+that holds the loop longer than PROFILE_SLOW_CALLBACK_MS, such as a
+synchronous DB call inside a coroutine.
+
+Reports go to PROFILE_DIR:
+- profile-<cycle>.prof: for pstats/snakeviz.
+- profile-<cycle>.txt: top functions, top allocations, slow callbacks, and
+  a per-account table.
+- profile-<cycle>.json: the same data in machine-readable form.
+
+The per-account table joins the CycleSummary phase times with the slow
+callbacks that fired while each account was being scraped.
+
+Everything is off unless a cycle is profiled. Tracing roughly doubles CPU
+cost while on, so profile single cycles, not the whole day.
+"""
+
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from .config import PROFILE_DIR, PROFILE_SLOW_CALLBACK_MS
+from .logconfig import prune_files
+
+logger = logging.getLogger(__name__)
+
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 20
+TRACEMALLOC_FRAMES = 5
+
+
+class _SlowCallbacks(logging.Handler):
+    """Collects asyncio's "Executing <handle> took N seconds" debug-mode warnings"""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.callbacks = []
+
+    def emit(self, record):
+        if not str(record.msg).startswith("Executing"):
+            return
+        args = record.args or ()
+        seconds = args[-1] if args and isinstance(args[-1], float) else 0.0
+        handle = str(args[0]) if args else record.getMessage()
+        self.callbacks.append({"at": record.created, "seconds": seconds, "handle": handle})
+
+
+class CycleProfiler:
+    """CPU, allocation and event-loop blocking profile of one cycle"""
+
+    def __init__(self, summary, directory=PROFILE_DIR, slow_callback_ms=PROFILE_SLOW_CALLBACK_MS):
+        self.summary = summary
+        self.directory = directory
+        self.slow_callback_ms = slow_callback_ms
+        self.profile = cProfile.Profile()
+        self.slow = _SlowCallbacks()
+        self.loop = None
+        self.loop_state = None
+        self.started_tracemalloc = False
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.loop_state = (self.loop.get_debug(), self.loop.slow_callback_duration)
+        self.loop.set_debug(True)
+        self.loop.slow_callback_duration = self.slow_callback_ms / 1000
+        logging.getLogger("asyncio").addHandler(self.slow)
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self.started_tracemalloc = True
+        self.profile.enable()
+        logger.info(f"🔬 Profiling cycle {self.summary.cycle_id}")
+        return self
+
+    def stop(self):
+        """Stop collecting and write the reports; returns the path of the text report"""
+        self.profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        traced_mb, peak_mb = (n / 1e6 for n in tracemalloc.get_traced_memory())
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+        logging.getLogger("asyncio").removeHandler(self.slow)
+        debug, slow_duration = self.loop_state
+        self.loop.set_debug(debug)
+        self.loop.slow_callback_duration = slow_duration
+
+        report = {
+            "cycle_id": self.summary.cycle_id,
+            "slow_callback_ms": self.slow_callback_ms,
+            "functions": self.top_functions(),
+            "allocations": self.top_allocations(snapshot),
+            "traced_mb": round(traced_mb, 1),
+            "peak_traced_mb": round(peak_mb, 1),
+            "slow_callbacks": sorted(self.slow.callbacks, key=lambda c: -c["seconds"]),
+            "accounts": self.account_breakdown(),
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"profile-{self.summary.cycle_id}")
+        self.profile.dump_stats(base + ".prof")
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(format_report(report, self.stats_text()))
+        prune_files(os.path.join(self.directory, "profile-*"))
+
+        blocked = sum(c["seconds"] for c in self.slow.callbacks)
+        logger.info(f"🔬 Profile written to {base}.txt ({len(self.slow.callbacks)} slow callbacks, "
+                    f"{blocked:.1f}s blocking the loop, peak traced {peak_mb:.0f} MB)")
+        return base + ".txt"
+
+    def top_functions(self, limit=TOP_FUNCTIONS):
+        stats = pstats.Stats(self.profile)
+        rows = []
+        for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({"function": f"{name} ({os.path.basename(filename)}:{line})", "calls": calls,
+                         "own_seconds": round(own, 4), "cumulative_seconds": round(cumulative, 4)})
+        rows.sort(key=lambda r: -r["cumulative_seconds"])
+        return rows[:limit]
+
+    def stats_text(self, limit=TOP_FUNCTIONS):
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    @staticmethod
+    def top_allocations(snapshot, limit=TOP_ALLOCATIONS):
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ])
+        return [{"where": str(stat.traceback[0]), "kb": round(stat.size / 1024, 1), "blocks": stat.count}
+                for stat in snapshot.statistics("lineno")[:limit]]
+
+    def account_breakdown(self):
+        """Phase times per account plus the slow callbacks that fired while it was being scraped"""
+        accounts = []
+        for timer in self.summary.accounts.values():
+            finished = timer.finished or time.time()
+            blocking = [c for c in self.slow.callbacks if timer.started <= c["at"] <= finished]
+            row = timer.as_dict()
+            row["slow_callbacks"] = len(blocking)
+            row["blocked_seconds"] = round(sum(c["seconds"] for c in blocking), 3)
+            accounts.append(row)
+        accounts.sort(key=lambda a: -a["seconds"])
+        return accounts
+
+
+def format_report(report, stats_text):
+    lines = [f"Profile of cycle {report['cycle_id']}", ""]
+
+    lines.append(f"Slow callbacks (> {report['slow_callback_ms']:.0f} ms holding the event loop):")
+    for c in report["slow_callbacks"][:20] or [{"seconds": 0, "handle": "none"}]:
+        lines.append(f"  {c['seconds'] * 1000:8.0f} ms  {c['handle']}")
+
+    lines += ["", "Per account (slowest first):",
+              f"  {'account':24s} {'status':12s} {'tweets':>6s} {'seconds':>8s} {'blocked':>8s}  top phases"]
+    for a in report["accounts"]:
+        phases = sorted(a["phases"].items(), key=lambda p: -p[1]["seconds"])[:3]
+        top = ", ".join(f"{name} {p['seconds']:.1f}s" for name, p in phases)
+        lines.append(f"  {a['account']:24s} {str(a['status']):12s} {a['tweets']:6d} {a['seconds']:8.1f} "
+                     f"{a['blocked_seconds']:8.2f}  {top}")
+
+    lines += ["", f"Top allocations at cycle end (traced {report['traced_mb']} MB, peak {report['peak_traced_mb']} MB):"]
+    for alloc in report["allocations"]:
+        lines.append(f"  {alloc['kb']:10.1f} KB {alloc['blocks']:8d} blocks  {alloc['where']}")
+
+    lines += ["", "CPU profile (event-loop thread, by cumulative time):", stats_text]
+    return "\n".join(lines) + "\n"
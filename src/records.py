@@ -0,0 +1,87 @@
+"""
+Compact tweet record shared by the scraper and the ingestion pipeline.
+
+One TweetRecord is created per scraped tweet and flows unchanged through
+filtering, entity tagging, clustering and storage; the enrichment stages fill
+in their fields in place rather than copying. Tweet ids are ints and
+created_at is epoch seconds internally. Conversion to the TEXT/ISO forms the
+database and JSON files use happens only at those edges.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(slots=True)
+class TweetRecord:
+    tweet_id: int
+    author_username: str
+    category: str
+    text: str
+    created_at: float
+    likes: int = 0
+    retweets: int = 0
+    replies: int = 0
+    url: str = ""
+    author_verified: bool = False
+    is_retweet: bool = False
+    # Filled in by the pipeline stages
+    relevance_score: int = 0
+    story_id: Optional[str] = None
+    entities: tuple = ()
+
+    @property
+    def total_engagement(self) -> int:
+        return self.likes + self.retweets + self.replies
+
+    @property
+    def key(self) -> str:
+        """tweet_id as stored in the TEXT key columns"""
+        return str(self.tweet_id)
+
+    @property
+    def created_at_iso(self) -> str:
+        return datetime.fromtimestamp(self.created_at).isoformat()
+
+    @classmethod
+    def from_dict(cls, tweet: dict) -> "TweetRecord":
+        """Build a record from a scraper-style dict (created_at as ISO string or epoch)"""
+        created_at = tweet["created_at"]
+        if not isinstance(created_at, (int, float)):
+            created_at = datetime.fromisoformat(str(created_at)).timestamp()
+        return cls(
+            tweet_id=int(tweet["tweet_id"]),
+            author_username=tweet["author_username"],
+            category=tweet.get("category") or tweet.get("account_category", ""),
+            text=tweet["text"],
+            created_at=created_at,
+            likes=tweet.get("likes", 0),
+            retweets=tweet.get("retweets", 0),
+            replies=tweet.get("replies", 0),
+            url=tweet.get("url", ""),
+            author_verified=bool(tweet.get("author_verified", False)),
+            is_retweet=bool(tweet.get("is_retweet", False)),
+            relevance_score=tweet.get("relevance_score", 0),
+            story_id=tweet.get("story_id"),
+            entities=tuple(tweet.get("entities", ())),
+        )
+
+    def to_dict(self) -> dict:
+        """Scraper-style dict with the external (string) id and ISO timestamp"""
+        return {
+            "tweet_id": self.key,
+            "author_username": self.author_username,
+            "author_verified": self.author_verified,
+            "category": self.category,
+            "text": self.text,
+            "likes": self.likes,
+            "retweets": self.retweets,
+            "replies": self.replies,
+            "url": self.url,
+            "is_retweet": self.is_retweet,
+            "created_at": self.created_at_iso,
+            "relevance_score": self.relevance_score,
+            "story_id": self.story_id,
+            "entities": list(self.entities),
+        }
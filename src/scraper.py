@@ -1,10 +1,10 @@
-import asyncio
 import logging
 from datetime import datetime
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from .config import HEADLESS, MAX_TWEETS_PER_ACCOUNT
 from .analyzer import parse_metric, calculate_relevance_score, filter_tweet
 from .database import save_tweet
+from .waits import scroll_and_wait, ScrollWaits, FIXED_WAIT_MS, TIMELINE_END
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +14,7 @@ class TwitterScraper:
         self.context = None
         self.page = None
         self.playwright = None
+        self.waits = ScrollWaits(initial_ms=2000)
 
     async def start(self):
         """Start the browser"""
@@ -67,8 +68,10 @@ class TwitterScraper:
             return 0
 
         tweets_collected = 0
-        last_height = 0
+        waits = 0
+        waited_ms = 0.0
         consecutive_no_new_tweets = 0
+        consecutive_ends = 0
         processed_ids = set()
 
         while tweets_collected < MAX_TWEETS_PER_ACCOUNT:
@@ -164,15 +167,19 @@ class TwitterScraper:
             else:
                 consecutive_no_new_tweets = 0
 
-            # Scroll down
-            await self.page.evaluate('window.scrollBy(0, 2000)')
-            await asyncio.sleep(2) # Wait for load
-            
-            # Check if we reached bottom
-            # new_height = await self.page.evaluate('document.body.scrollHeight')
-            # if new_height == last_height:
-            #     break
-            # last_height = new_height
+            # Scroll down and wait until the next articles render; an apparent end of the timeline
+            # is confirmed by a second wait of at least FIXED_WAIT_MS before stopping
+            timeout_ms = self.waits.timeout_ms(username)
+            if consecutive_ends:
+                timeout_ms = max(timeout_ms, FIXED_WAIT_MS)
+            outcome, ms = await scroll_and_wait(self.page, lambda: self.page.evaluate('window.scrollBy(0, 2000)'),
+                                                timeout_ms)
+            self.waits.observe(username, outcome, ms)
+            waits += 1
+            waited_ms += ms
+            consecutive_ends = consecutive_ends + 1 if outcome == TIMELINE_END else 0
+            if consecutive_ends >= 2:
+                break
 
         if tweets_collected == 0:
             logger.warning(f"No tweets collected for {username}. Taking screenshot and dumping HTML...")
@@ -181,5 +188,7 @@ class TwitterScraper:
             with open(f"debug_{username}.html", "w", encoding="utf-8") as f:
                 f.write(content)
             
+        if waits:
+            logger.info(f"Waited {waited_ms / 1000:.1f}s over {waits} scrolls (fixed sleeps: {waits * 2:.1f}s)")
         logger.info(f"Collected {tweets_collected} tweets from {username}")
         return tweets_collected
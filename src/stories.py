@@ -0,0 +1,178 @@
+"""
+Near-duplicate story clustering using MinHash signatures and an LSH index.
+
+Each new tweet's normalised text is shingled and MinHashed; the signature is
+split into bands whose hashes are stored in an indexed bucket table. Tweets
+sharing a bucket with a recent tweet are candidates, and the best candidate
+above the similarity threshold donates its story_id. The index is updated
+incrementally per cycle and pruned to a sliding window.
+"""
+
+import hashlib
+import logging
+import re
+import zlib
+from datetime import datetime, timedelta
+import numpy as np
+from .database import get_placeholder
+
+logger = logging.getLogger(__name__)
+
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16  # 4 rows per band -> candidate threshold around 0.5 Jaccard
+SHINGLE_SIZE = 5
+SIMILARITY_THRESHOLD = 0.5
+STORY_WINDOW_HOURS = 48
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(1337)
+_PERM_A = _rng.randint(1, _PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+_PERM_B = _rng.randint(0, _PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+_URL_RE = re.compile(r"https?://\S+")
+_MENTION_RE = re.compile(r"[@#]\w+")
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalise_text(text):
+    """Lowercase and strip URLs, mentions, hashtags and punctuation"""
+    text = _URL_RE.sub(" ", text.lower())
+    text = _MENTION_RE.sub(" ", text)
+    text = _NON_WORD_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Character shingles of normalised text"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash_signature(text):
+    """MinHash signature of a tweet's text, or None if nothing to hash"""
+    grams = shingles(normalise_text(text))
+    if not grams:
+        return None
+
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME
+    return permuted.min(axis=1)
+
+
+def band_keys(signature):
+    """LSH bucket keys, one per band"""
+    rows = NUM_PERMUTATIONS // NUM_BANDS
+    keys = []
+    for band in range(NUM_BANDS):
+        chunk = signature[band * rows:(band + 1) * rows].tobytes()
+        keys.append(f"{band}:{hashlib.blake2b(chunk, digest_size=8).hexdigest()}")
+    return keys
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity from two MinHash signatures"""
+    return float(np.mean(sig_a == sig_b))
+
+
+def _encode_signature(signature):
+    return ",".join(str(v) for v in signature.tolist())
+
+
+def _decode_signature(value):
+    return np.array([int(v) for v in value.split(",")], dtype=np.uint64)
+
+
+def init_story_index(conn):
+    """Create the LSH side tables"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS story_signatures (
+            tweet_id TEXT PRIMARY KEY,
+            story_id TEXT NOT NULL,
+            signature TEXT NOT NULL,
+            indexed_at TIMESTAMP NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS story_buckets (
+            bucket TEXT NOT NULL,
+            tweet_id TEXT NOT NULL,
+            indexed_at TIMESTAMP NOT NULL
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_story_bucket ON story_buckets(bucket)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_story_bucket_time ON story_buckets(indexed_at)")
+    conn.commit()
+
+
+def prune_story_index(conn, window_hours=STORY_WINDOW_HOURS):
+    """Drop index entries older than the clustering window"""
+    cursor = conn.cursor()
+    ph = get_placeholder(conn)
+    cutoff = datetime.now() - timedelta(hours=window_hours)
+    cursor.execute(f"DELETE FROM story_buckets WHERE indexed_at < {ph}", (cutoff,))
+    cursor.execute(f"DELETE FROM story_signatures WHERE indexed_at < {ph}", (cutoff,))
+    conn.commit()
+
+
+def _find_story(cursor, ph, signature, keys):
+    """Return the story_id of the most similar indexed tweet, if any"""
+    cursor.execute(f"""
+        SELECT DISTINCT s.tweet_id, s.story_id, s.signature
+        FROM story_buckets b
+        JOIN story_signatures s ON s.tweet_id = b.tweet_id
+        WHERE b.bucket IN ({', '.join([ph] * len(keys))})
+    """, keys)
+
+    best_story, best_score = None, SIMILARITY_THRESHOLD
+    for _, story_id, encoded in cursor.fetchall():
+        score = estimate_similarity(signature, _decode_signature(encoded))
+        if score >= best_score:
+            best_story, best_score = story_id, score
+
+    return best_story
+
+
+def cluster_tweets(conn, tweets: list) -> list:
+    """Assign a story_id to each tweet, updating the LSH index incrementally"""
+    cursor = conn.cursor()
+    ph = get_placeholder(conn)
+    now = datetime.now()
+    new_stories = 0
+
+    for tweet in tweets:
+        tweet_id = tweet.key
+
+        cursor.execute(f"SELECT story_id FROM story_signatures WHERE tweet_id = {ph}", (tweet_id,))
+        existing = cursor.fetchone()
+        if existing:
+            tweet.story_id = existing[0]
+            continue
+
+        signature = minhash_signature(tweet.text)
+        if signature is None:
+            tweet.story_id = tweet_id
+            new_stories += 1
+            continue
+
+        keys = band_keys(signature)
+        story_id = _find_story(cursor, ph, signature, keys)
+        if story_id is None:
+            story_id = tweet_id
+            new_stories += 1
+
+        tweet.story_id = story_id
+        cursor.execute(
+            f"INSERT INTO story_signatures (tweet_id, story_id, signature, indexed_at) VALUES ({ph}, {ph}, {ph}, {ph})",
+            (tweet_id, story_id, _encode_signature(signature), now)
+        )
+        cursor.executemany(
+            f"INSERT INTO story_buckets (bucket, tweet_id, indexed_at) VALUES ({ph}, {ph}, {ph})",
+            [(key, tweet_id, now) for key in keys]
+        )
+
+    conn.commit()
+    logger.info(f"✓ Clustered {len(tweets)} tweets ({new_stories} new stories)")
+    return tweets
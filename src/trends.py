@@ -0,0 +1,210 @@
+"""
+Incremental trending-terms engine.
+
+Term and hashtag counts are kept per time bucket. The scraper adds the
+counts for each stored batch (O(tokens in new tweets)) to the trend_buckets
+table; the API keeps the buckets in memory, pulls only the rows updated
+since its last refresh (late tweets can add to any bucket still in the
+baseline) and ranks terms by how far the current window surges above the
+trailing baseline.
+"""
+
+import logging
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from .config import TREND_BUCKET_SECONDS, TREND_WINDOW_BUCKETS, TREND_BASELINE_HOURS
+from .database import get_placeholder
+
+logger = logging.getLogger(__name__)
+
+MIN_TERM_LENGTH = 3
+MIN_WINDOW_COUNT = 3
+# Rows updated this long before the newest one we've seen are re-read, to cover
+# writes that committed out of order or came from a host with a slightly different clock
+REFRESH_OVERLAP_SECONDS = 120
+
+STOPWORDS = {
+    "the", "and", "for", "are", "but", "not", "you", "all", "any", "can", "had", "her",
+    "was", "one", "our", "out", "has", "have", "his", "how", "its", "who", "did", "get",
+    "him", "she", "they", "them", "this", "that", "with", "from", "your", "what", "when",
+    "will", "just", "been", "were", "than", "then", "there", "their", "about", "into",
+    "more", "some", "would", "which", "these", "those", "also", "after", "over", "said",
+    "https", "http", "amp", "via", "don", "dey", "wey", "una", "make", "abi",
+}
+
+_TOKEN_RE = re.compile(r"#\w+|[a-z0-9][\w']+")
+
+
+def tokenize(text):
+    """Distinct terms and hashtags in a tweet"""
+    terms = set()
+    for token in _TOKEN_RE.findall(re.sub(r"https?://\S+", " ", text.lower())):
+        token = token.strip("'")
+        if token.startswith("#"):
+            if len(token) > 1:
+                terms.add(token)
+        elif len(token) >= MIN_TERM_LENGTH and token not in STOPWORDS and not token.isdigit():
+            terms.add(token)
+    return terms
+
+
+def bucket_of(timestamp, bucket_seconds=TREND_BUCKET_SECONDS):
+    """Start (epoch seconds) of the bucket containing timestamp"""
+    return int(timestamp // bucket_seconds) * bucket_seconds
+
+
+def count_terms(tweets, bucket_seconds=TREND_BUCKET_SECONDS):
+    """Per-bucket term counts for a batch of tweets"""
+    counts = defaultdict(Counter)
+    for tweet in tweets:
+        counts[bucket_of(tweet.created_at, bucket_seconds)].update(tokenize(tweet.text))
+    return counts
+
+
+def init_trend_store(conn):
+    """Create the persisted bucket table"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS trend_buckets (
+            bucket_start BIGINT NOT NULL,
+            term TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            updated_at DOUBLE PRECISION,
+            PRIMARY KEY (bucket_start, term)
+        )
+    """)
+    
+    # Migration: updated_at was added after the table
+    cursor.execute("SELECT * FROM trend_buckets LIMIT 0")
+    if "updated_at" not in {col[0] for col in cursor.description}:
+        cursor.execute("ALTER TABLE trend_buckets ADD COLUMN updated_at DOUBLE PRECISION")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_trend_buckets_updated ON trend_buckets(updated_at)")
+    conn.commit()
+
+
+def record_trends(conn, tweets, bucket_seconds=TREND_BUCKET_SECONDS, retention_hours=TREND_BASELINE_HOURS):
+    """Add a stored batch's term counts to trend_buckets and expire old buckets"""
+    cursor = conn.cursor()
+    ph = get_placeholder(conn)
+    now = time.time()
+    cutoff = bucket_of(now - retention_hours * 3600, bucket_seconds)
+
+    rows = [
+        (bucket, term, count, now)
+        for bucket, counter in count_terms(tweets, bucket_seconds).items()
+        if bucket >= cutoff
+        for term, count in counter.items()
+    ]
+
+    cursor.executemany(f"""
+        INSERT INTO trend_buckets (bucket_start, term, count, updated_at) VALUES ({ph}, {ph}, {ph}, {ph})
+        ON CONFLICT (bucket_start, term) DO UPDATE
+        SET count = trend_buckets.count + EXCLUDED.count, updated_at = EXCLUDED.updated_at
+    """, rows)
+    cursor.execute(f"DELETE FROM trend_buckets WHERE bucket_start < {ph}", (cutoff,))
+    conn.commit()
+    logger.info(f"✓ Recorded {len(rows)} trend counts")
+
+
+class TrendTracker:
+    """In-memory bucketed term counts with surge scoring"""
+
+    def __init__(self, bucket_seconds=TREND_BUCKET_SECONDS, window_buckets=TREND_WINDOW_BUCKETS,
+                 baseline_hours=TREND_BASELINE_HOURS, refresh_seconds=30):
+        self.bucket_seconds = bucket_seconds
+        self.window_buckets = window_buckets
+        self.retention_seconds = baseline_hours * 3600
+        self.refresh_seconds = refresh_seconds
+        self.buckets = {}
+        self.totals = Counter()
+        self.last_refresh = 0.0
+        self.watermark = None  # Newest updated_at read from trend_buckets
+
+    def _set_bucket(self, bucket, counter):
+        old = self.buckets.get(bucket)
+        if old:
+            for term, count in old.items():
+                self.totals[term] -= count
+        for term, count in counter.items():
+            self.totals[term] += count
+        self.buckets[bucket] = counter
+
+    def _set_count(self, bucket, term, count):
+        counter = self.buckets.setdefault(bucket, Counter())
+        self.totals[term] += count - counter.get(term, 0)
+        counter[term] = count
+
+    def _expire(self, now):
+        cutoff = bucket_of(now - self.retention_seconds, self.bucket_seconds)
+        for bucket in [b for b in self.buckets if b < cutoff]:
+            for term, count in self.buckets.pop(bucket).items():
+                self.totals[term] -= count
+                if self.totals[term] <= 0:
+                    del self.totals[term]
+
+    def update(self, tweets, now=None):
+        """Add a batch of tweets directly (O(tokens in the batch))"""
+        for bucket, counter in count_terms(tweets, self.bucket_seconds).items():
+            merged = Counter(self.buckets.get(bucket, ()))
+            merged.update(counter)
+            self._set_bucket(bucket, merged)
+        self._expire(now or time.time())
+
+    def refresh(self, conn, force=False):
+        """Pull the bucket counts updated in the database since the last refresh"""
+        now = time.time()
+        if not force and now - self.last_refresh < self.refresh_seconds:
+            return
+
+        ph = get_placeholder(conn)
+        cursor = conn.cursor()
+        if self.watermark is None:
+            cursor.execute(
+                f"SELECT bucket_start, term, count, updated_at FROM trend_buckets WHERE bucket_start >= {ph}",
+                (bucket_of(now - self.retention_seconds, self.bucket_seconds),)
+            )
+        else:
+            # Any bucket can change: a late tweet adds to the bucket of its created_at
+            cursor.execute(
+                f"SELECT bucket_start, term, count, updated_at FROM trend_buckets WHERE updated_at >= {ph}",
+                (self.watermark - REFRESH_OVERLAP_SECONDS,)
+            )
+
+        watermark = self.watermark or 0.0
+        for row in cursor.fetchall():
+            bucket, term, count, updated_at = row.values() if isinstance(row, dict) else row
+            self._set_count(int(bucket), term, int(count))
+            watermark = max(watermark, updated_at or 0.0)
+        self.watermark = watermark
+        self._expire(now)
+        self.last_refresh = now
+
+    def top(self, k=20, now=None, min_count=MIN_WINDOW_COUNT):
+        """Top-k surging terms in the current window versus the trailing baseline"""
+        now = now or time.time()
+        current_start = bucket_of(now, self.bucket_seconds) - (self.window_buckets - 1) * self.bucket_seconds
+
+        window = Counter()
+        for bucket, counter in self.buckets.items():
+            if bucket >= current_start:
+                window.update(counter)
+
+        baseline_buckets = max(self.retention_seconds // self.bucket_seconds - self.window_buckets, 1)
+        trends = []
+        for term, count in window.items():
+            if count < min_count:
+                continue
+            baseline = self.totals[term] - count
+            expected = baseline / baseline_buckets * self.window_buckets
+            score = (count - expected) / math.sqrt(expected + 1)
+            trends.append({
+                "term": term,
+                "count": count,
+                "baseline": round(expected, 3),
+                "score": round(score, 3),
+            })
+
+        trends.sort(key=lambda t: (t["score"], t["count"]), reverse=True)
+        return trends[:k]
@@ -0,0 +1,82 @@
+"""
+Event-driven waits after scrolling a timeline.
+
+Before each scroll a MutationObserver is armed in the page; it resolves as
+soon as new <article> nodes are added, or when the timeout passes. A timeout
+with the page scrolled to the bottom and no loading spinner looks like the end
+of the timeline; the scrapers only stop after a second such wait of at least
+FIXED_WAIT_MS, so one slow fetch doesn't cut a timeline short. Timeouts adapt
+per account to how long its new articles have taken to appear (an EWMA), so
+fast timelines aren't held up by a fixed sleep and slow ones get longer
+before being given up on.
+"""
+
+ARTICLES_ADDED, TIMELINE_END, WAIT_TIMED_OUT = "new", "end", "timeout"
+
+FIXED_WAIT_MS = 1500  # The sleep this replaces, used to report the time saved
+LATENCY_ALPHA = 0.3
+TIMEOUT_MULTIPLIER = 3.0
+MIN_TIMEOUT_MS = 500
+MAX_TIMEOUT_MS = 6000
+
+ARM_JS = """
+(timeoutMs) => {
+    const started = performance.now();
+    window.__articleWait = new Promise((resolve) => {
+        const finish = (outcome) => {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve({outcome, ms: performance.now() - started});
+        };
+        const observer = new MutationObserver((records) => {
+            for (const record of records) {
+                for (const node of record.addedNodes) {
+                    if (node.nodeType === 1 && (node.matches("article") || node.querySelector("article"))) {
+                        return finish("new");
+                    }
+                }
+            }
+        });
+        observer.observe(document.body, {childList: true, subtree: true});
+        const timer = setTimeout(() => {
+            const root = document.scrollingElement || document.documentElement;
+            const atBottom = window.innerHeight + window.scrollY >= root.scrollHeight - 50;
+            finish(atBottom && !document.querySelector('[role="progressbar"]') ? "end" : "timeout");
+        }, timeoutMs);
+    });
+}
+"""
+
+
+async def scroll_and_wait(page, scroll, timeout_ms):
+    """Arm the observer, run the scroll coroutine, then wait for (outcome, ms waited)"""
+    await page.evaluate(ARM_JS, timeout_ms)
+    await scroll()
+    result = await page.evaluate("() => window.__articleWait")
+    return result["outcome"], result["ms"]
+
+
+class ScrollWaits:
+    """Per-account timeouts learned from how long new articles take to appear"""
+
+    def __init__(self, initial_ms=FIXED_WAIT_MS, alpha=LATENCY_ALPHA, multiplier=TIMEOUT_MULTIPLIER,
+                 min_ms=MIN_TIMEOUT_MS, max_ms=MAX_TIMEOUT_MS):
+        self.initial_ms = initial_ms
+        self.alpha = alpha
+        self.multiplier = multiplier
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.latency = {}
+
+    def timeout_ms(self, username):
+        latency = self.latency.get(username)
+        if latency is None:
+            return self.initial_ms * 2
+        return min(max(latency * self.multiplier, self.min_ms), self.max_ms)
+
+    def observe(self, username, outcome, ms):
+        """Learn from a wait; reaching the end of the timeline says nothing about latency"""
+        if outcome == TIMELINE_END:
+            return
+        previous = self.latency.get(username)
+        self.latency[username] = ms if previous is None else self.alpha * ms + (1 - self.alpha) * previous
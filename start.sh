@@ -1,6 +1,6 @@
 #!/bin/bash
 # Unified startup script for Railway
-# Runs both the API server and the scraper cron job
+# Runs both the API server and the scraper daemon
 
 set -e
 
@@ -14,17 +14,10 @@ API_PID=$!
 # Wait for API to be ready
 sleep 5
 
-# Run the scraper once on startup
-echo "Running initial scrape..."
-python main.py || echo "Initial scrape failed, will retry on schedule"
-
-# Start the cron-like loop for periodic scraping
-echo "Starting scraper cron loop (every 10 minutes)..."
-while true; do
-    sleep 600  # 10 minutes
-    echo "[$(date)] Running scheduled scrape..."
-    python main.py || echo "Scrape failed, will retry in 10 minutes"
-done &
+# Run the scraper as a long-lived daemon: browser and DB connections stay warm
+# across cycles, which run every SCRAPE_INTERVAL_SECONDS (default 10 minutes)
+echo "Starting scraper daemon..."
+python main.py --daemon &
 SCRAPER_PID=$!
 
 # Keep the script running and forward signals
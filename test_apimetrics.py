@@ -0,0 +1,114 @@
+import asyncio
+import sqlite3
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import src.apimetrics as apimetrics
+from src.apimetrics import (
+    RequestMetrics, TimedConnection, REQUEST_SECONDS, RESPONSES, REQUEST_PHASE_SECONDS, QUERY_SECONDS,
+)
+
+
+def call(middleware, path="/tweets"):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware({"type": "http", "method": "GET", "path": path}, receive, send))
+    return sent
+
+
+class TestRequestMetrics(unittest.TestCase):
+    def test_records_latency_status_and_query_phase_by_route_template(self):
+        async def app(scope, receive, send):
+            scope["route"] = SimpleNamespace(path="/tweets/category/{category}")
+            conn = TimedConnection(sqlite3.connect(":memory:"), connect_seconds=0.01)
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            conn.close()
+            await send({"type": "http.response.start", "status": 404, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        route = "/tweets/category/{category}"
+        before = REQUEST_SECONDS.count(method="GET", route=route)
+        queries = QUERY_SECONDS.count(route=route, statement="SELECT")
+        sent = call(RequestMetrics(app), "/tweets/category/news")
+
+        self.assertEqual(sent[0]["status"], 404)
+        self.assertEqual(REQUEST_SECONDS.count(method="GET", route=route), before + 1)
+        self.assertGreaterEqual(RESPONSES.get(method="GET", route=route, status=404), 1)
+        self.assertEqual(QUERY_SECONDS.count(route=route, statement="SELECT"), queries + 1)
+        for phase in ("connect", "query", "app"):
+            self.assertGreaterEqual(REQUEST_PHASE_SECONDS.count(route=route, phase=phase), 1)
+
+    def test_unmatched_paths_share_a_label_and_errors_count_as_500(self):
+        async def app(scope, receive, send):
+            raise RuntimeError("boom")
+
+        before = RESPONSES.get(method="GET", route="unmatched", status=500)
+        with self.assertRaises(RuntimeError):
+            call(RequestMetrics(app), "/wp-login.php")
+        self.assertEqual(RESPONSES.get(method="GET", route="unmatched", status=500), before + 1)
+
+
+class TestTimedConnection(unittest.TestCase):
+    def setUp(self):
+        self.conn = TimedConnection(sqlite3.connect(":memory:"))
+        self.conn.cursor().execute("CREATE TABLE tweets (tweet_id TEXT, author_username TEXT)")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_behaves_like_the_wrapped_connection(self):
+        cursor = self.conn.cursor()
+        cursor.execute("INSERT INTO tweets VALUES (?, ?)", ("1", "channelstv"))
+        self.conn.commit()
+        cursor.execute("SELECT author_username FROM tweets WHERE tweet_id = ?", ("1",))
+        self.assertEqual(cursor.fetchall(), [("channelstv",)])
+        self.assertTrue(hasattr(self.conn, "execute"))
+        self.assertFalse(hasattr(self.conn, "status"))
+
+    def test_slow_select_is_logged_with_params_and_plan(self):
+        apimetrics._explained.clear()
+        cursor = self.conn.cursor()
+        with mock.patch.object(apimetrics, "SLOW_QUERY_MS", 1e-6), \
+             self.assertLogs("src.apimetrics", level="WARNING") as logs:
+            cursor.execute("SELECT * FROM tweets WHERE author_username = ?", ("channelstv",))
+            cursor.fetchall()
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("params=('channelstv',)", logs.output[0])
+        self.assertIn("SCAN tweets", logs.output[0])
+
+    def test_repeated_slow_select_is_explained_once_per_interval(self):
+        apimetrics._explained.clear()
+        cursor = self.conn.cursor()
+        query = "SELECT * FROM tweets WHERE tweet_id = ?"
+        before = apimetrics.SLOW_QUERIES.get(route="")
+        with mock.patch.object(apimetrics, "SLOW_QUERY_MS", 1e-6), \
+             mock.patch.object(apimetrics, "explain", wraps=apimetrics.explain) as explain, \
+             self.assertLogs("src.apimetrics", level="WARNING") as logs:
+            for i in range(5):
+                cursor.execute(query, (str(i),))
+                cursor.fetchall()
+        self.assertEqual(explain.call_count, 1)
+        self.assertEqual(len(logs.output), 5)
+        self.assertIn("plan logged within the last", logs.output[-1])
+        self.assertEqual(apimetrics.SLOW_QUERIES.get(route="") - before, 5)
+
+    def test_fast_statements_are_not_logged(self):
+        cursor = self.conn.cursor()
+        with mock.patch.object(apimetrics, "SLOW_QUERY_MS", 10_000), \
+             mock.patch.object(apimetrics.logger, "warning") as warning:
+            cursor.execute("SELECT COUNT(*) FROM tweets")
+            cursor.fetchone()
+            cursor.close()
+        warning.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
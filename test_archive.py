@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from src.archive import archive_old_tweets, read_archive
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.archive_dir = os.path.join(self.tmpdir.name, "archive")
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("""
+            CREATE TABLE tweets (id INTEGER PRIMARY KEY AUTOINCREMENT, tweet_id TEXT, text TEXT,
+                                 likes INTEGER, created_at TIMESTAMP)
+        """)
+        self.conn.execute("CREATE TABLE tweet_entities (tweet_id TEXT, entity TEXT, entity_type TEXT)")
+        now = datetime.now()
+        rows = [(str(i), f"Tweet {i}", i, (now - timedelta(hours=6 * i)).isoformat()) for i in range(100)]
+        self.conn.executemany("INSERT INTO tweets (tweet_id, text, likes, created_at) VALUES (?, ?, ?, ?)", rows)
+        self.conn.executemany("INSERT INTO tweet_entities VALUES (?, 'lagos', 'state')", [(str(i),) for i in range(100)])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_moves_old_rows_in_batches(self):
+        archived = archive_old_tweets(self.conn, horizon_days=7, archive_dir=self.archive_dir, batch_size=16)
+
+        # Anything at least 7 days (28 x 6h) old leaves the hot table
+        hot = self.conn.execute("SELECT COUNT(*) FROM tweets").fetchone()[0]
+        self.assertEqual(archived, 72)
+        self.assertEqual(hot, 28)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM tweet_entities").fetchone()[0], 28)
+        self.assertTrue(all(d.startswith("date=") for d in os.listdir(self.archive_dir)))
+
+        df = read_archive(self.archive_dir, columns=["tweet_id", "likes"])
+        self.assertEqual(list(df.columns), ["tweet_id", "likes"])
+        self.assertEqual(sorted(df["likes"].tolist()), list(range(28, 100)))
+
+        # Running again is a no-op
+        self.assertEqual(archive_old_tweets(self.conn, horizon_days=7, archive_dir=self.archive_dir), 0)
+
+    def test_partition_pruning(self):
+        archive_old_tweets(self.conn, horizon_days=7, archive_dir=self.archive_dir)
+        start = datetime.now() - timedelta(days=10)
+        end = datetime.now() - timedelta(days=9)
+        df = read_archive(self.archive_dir, columns=["created_at"], start=start, end=end)
+        days = {ts.strftime("%Y-%m-%d") for ts in df["created_at"]}
+        self.assertEqual(days, {start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")})
+
+if __name__ == '__main__':
+    unittest.main()
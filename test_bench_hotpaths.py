@@ -0,0 +1,24 @@
+import unittest
+from benchmarks.bench_hotpaths import find_regressions, synthetic_corpus
+
+
+class TestRegressionGate(unittest.TestCase):
+    def test_flags_only_slowdowns_beyond_threshold(self):
+        baseline = {"cases": {"parse_metric": {"ns_per_tweet": 100.0}, "store_tweets": {"ns_per_tweet": 1000.0}}}
+        results = {"cases": {
+            "parse_metric": {"ns_per_tweet": 140.0},
+            "store_tweets": {"ns_per_tweet": 1200.0},
+            "export_to_json": {"ns_per_tweet": 5000.0},  # New case, no baseline yet
+        }}
+        regressions = find_regressions(results, baseline, threshold=0.25)
+        self.assertEqual([name for name, _ in regressions], ["parse_metric"])
+        self.assertAlmostEqual(regressions[0][1], 1.4)
+
+    def test_corpus_is_seeded(self):
+        texts = lambda seed: [(t["text"], t["likes"], t["time_str"]) for t in synthetic_corpus(50, seed)]
+        self.assertEqual(texts(7), texts(7))
+        self.assertNotEqual(synthetic_corpus(50, seed=7)[0]["text"], synthetic_corpus(50, seed=8)[0]["text"])
+
+
+if __name__ == "__main__":
+    unittest.main()
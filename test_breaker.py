@@ -0,0 +1,120 @@
+import asyncio
+import sqlite3
+import unittest
+from unittest import mock
+import main
+from src.breaker import (
+    init_breaker_store, CircuitBreakers, RetryBudget, ScrapeFailure,
+    CLOSED, OPEN, HALF_OPEN, TIMEOUT, MISSING, LOGIN_WALL,
+)
+
+class TestCircuitBreakers(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        init_breaker_store(self.conn)
+        self.breakers = CircuitBreakers(self.conn, threshold=3, cooldown_minutes=10, max_cooldown_minutes=30)
+
+    def test_opens_after_threshold_and_backs_off(self):
+        for _ in range(2):
+            self.breakers.record_failure("dead", TIMEOUT, now=1000)
+        self.assertEqual(self.breakers.get("dead")["state"], CLOSED)
+        self.breakers.record_failure("dead", TIMEOUT, now=1000)
+        self.assertEqual(self.breakers.get("dead")["state"], OPEN)
+
+        self.assertFalse(self.breakers.allow("dead", now=1000 + 599))
+        self.assertTrue(self.breakers.allow("dead", now=1000 + 600))
+        self.assertEqual(self.breakers.get("dead")["state"], HALF_OPEN)
+
+        # Failed probes double the cool-down up to the cap
+        self.breakers.record_failure("dead", TIMEOUT, now=2000)
+        self.assertEqual(self.breakers.retry_at("dead"), 2000 + 1200)
+        self.breakers.allow("dead", now=4000)
+        self.breakers.record_failure("dead", TIMEOUT, now=4000)
+        self.assertEqual(self.breakers.retry_at("dead"), 4000 + 1800)
+
+        self.breakers.allow("dead", now=9000)
+        self.breakers.record_success("dead")
+        b = self.breakers.get("dead")
+        self.assertEqual((b["state"], b["failures"], b["cooldown_seconds"]), (CLOSED, 0, 600))
+
+    def test_missing_account_opens_immediately(self):
+        self.breakers.record_failure("gone", MISSING, now=1000)
+        self.assertFalse(self.breakers.allow("gone", now=1001))
+
+    def test_retry_budget(self):
+        budget = RetryBudget(2)
+        self.assertEqual([budget.take() for _ in range(3)], [True, True, False])
+
+class FakePage:
+    def is_closed(self):
+        return False
+
+    async def evaluate(self, script):
+        return "complete"
+
+    async def goto(self, url):
+        pass
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def close(self):
+        pass
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage()
+
+class TestScrapeAccountsFailures(unittest.TestCase):
+    def run_scrape(self, conn, outcomes, accounts):
+        calls = []
+
+        async def scrape_account_tweets(page, username, category, conn, **kwargs):
+            calls.append(username)
+            outcome = outcomes[username]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        async def no_sleep(seconds):
+            pass
+
+        with mock.patch.object(main, "scrape_account_tweets", scrape_account_tweets), \
+             mock.patch.object(main.asyncio, "sleep", no_sleep), \
+             mock.patch.object(main, "filter_and_enrich", lambda tweets, min_engagement: tweets), \
+             mock.patch.object(main, "tag_entities", lambda tweets: tweets), \
+             mock.patch.object(main, "store_batch", lambda conn, tweets: None), \
+             mock.patch.object(main, "RETRY_BUDGET", 3):
+            tweets = asyncio.run(main.scrape_accounts(FakeContext(), conn, accounts_dict=accounts, adaptive=False,
+                                                          db_factory=lambda: None))
+        return calls, tweets
+
+    def test_classified_failures_and_budget(self):
+        conn = sqlite3.connect(":memory:")
+        init_breaker_store(conn)
+        accounts = {"news": ["slow1", "slow2", "gone", "walled", "ok"]}
+        outcomes = {
+            "slow1": ScrapeFailure(TIMEOUT),
+            "slow2": ScrapeFailure(TIMEOUT),
+            "gone": ScrapeFailure(MISSING),
+            "walled": ScrapeFailure(LOGIN_WALL),
+            "ok": [{"tweet_id": "1"}],
+        }
+        calls, tweets = self.run_scrape(conn, outcomes, accounts)
+
+        # slow1 gets 2 retries, slow2 the last one; permanent failures are never retried
+        self.assertEqual(calls, ["slow1"] * 3 + ["slow2"] * 2 + ["gone", "walled", "ok"])
+        self.assertEqual(tweets, [{"tweet_id": "1"}])
+
+        breakers = CircuitBreakers(conn)
+        self.assertEqual(breakers.get("gone")["state"], OPEN)
+        self.assertEqual(breakers.get("slow1")["failures"], 1)
+        # A login wall is a session problem and doesn't count against the account
+        self.assertEqual(breakers.get("walled")["failures"], 0)
+
+        # Next cycle the missing account is skipped without a page load
+        calls, _ = self.run_scrape(conn, outcomes, accounts)
+        self.assertNotIn("gone", calls)
+
+if __name__ == '__main__':
+    unittest.main()
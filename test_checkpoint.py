@@ -0,0 +1,104 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+import main
+from src.breaker import init_breaker_store
+from src.checkpoint import init_checkpoint_store, CycleJournal
+
+ACCOUNTS = {"news": ["a", "b", "c"], "politics": ["d", "e"]}
+
+class Crash(BaseException):
+    """Stands in for the process being killed"""
+
+class FakePage:
+    def is_closed(self):
+        return False
+
+    async def evaluate(self, script):
+        return "complete"
+
+    async def goto(self, url):
+        pass
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def close(self):
+        pass
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage()
+
+class TestCycleJournal(unittest.TestCase):
+    def setUp(self):
+        # A file, not :memory:, because checkpoints are written from the DB thread's own connection
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "journal.db")
+        self.conn = sqlite3.connect(self.db_path)
+        init_checkpoint_store(self.conn)
+        init_breaker_store(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmpdir.cleanup()
+
+    def test_resumes_recent_cycle_and_abandons_stale_one(self):
+        first = CycleJournal(self.conn, max_age_minutes=30).open(now=1000)
+        first.mark_done("a", "done", 3)
+
+        resumed = CycleJournal(self.conn, max_age_minutes=30).open(now=1000 + 600)
+        self.assertEqual(resumed.cycle_id, first.cycle_id)
+        self.assertTrue(resumed.is_done("a"))
+
+        fresh = CycleJournal(self.conn, max_age_minutes=30).open(now=1000 + 3600)
+        self.assertNotEqual(fresh.cycle_id, first.cycle_id)
+        self.assertFalse(fresh.is_done("a"))
+        status = self.conn.execute("SELECT status FROM scrape_cycles WHERE cycle_id = ?", (first.cycle_id,)).fetchone()
+        self.assertEqual(status, ("abandoned",))
+
+        fresh.close()
+        self.assertNotEqual(CycleJournal(self.conn).open().cycle_id, fresh.cycle_id)
+
+    def test_crashed_cycle_resumes_where_it_stopped(self):
+        scraped, stored = [], []
+
+        async def scrape_account_tweets(page, username, category, conn, **kwargs):
+            if username == crash_on:
+                raise Crash()
+            scraped.append(username)
+            return [{"tweet_id": f"{username}-1"}]
+
+        async def no_sleep(seconds):
+            pass
+
+        def run():
+            journal = CycleJournal(self.conn).open()
+            with mock.patch.object(main, "scrape_account_tweets", scrape_account_tweets), \
+                 mock.patch.object(main.asyncio, "sleep", no_sleep), \
+                 mock.patch.object(main, "filter_and_enrich", lambda tweets, min_engagement: tweets), \
+                 mock.patch.object(main, "tag_entities", lambda tweets: tweets), \
+                 mock.patch.object(main, "store_batch", lambda conn, tweets: stored.extend(tweets)):
+                asyncio.run(main.scrape_accounts(FakeContext(), self.conn, accounts_dict=ACCOUNTS,
+                                                 adaptive=False, journal=journal,
+                                                 db_factory=lambda: sqlite3.connect(self.db_path)))
+            journal.close()
+
+        crash_on = "c"
+        with self.assertRaises(Crash):
+            run()
+        # Accounts finished before the crash were already stored
+        self.assertEqual([t["tweet_id"] for t in stored], ["a-1", "b-1"])
+
+        crash_on = None
+        run()
+        self.assertEqual(scraped, ["a", "b", "c", "d", "e"])
+        self.assertEqual(len(stored), 5)
+        done = self.conn.execute("SELECT COUNT(*) FROM cycle_journal WHERE status = 'done'").fetchone()
+        self.assertEqual(done, (5,))
+
+if __name__ == '__main__':
+    unittest.main()
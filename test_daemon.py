@@ -0,0 +1,92 @@
+import asyncio
+import sqlite3
+import unittest
+from unittest import mock
+import main
+from src.checkpoint import init_checkpoint_store
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def close(self):
+        self.connected = False
+
+class FakePlaywright:
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+def memory_db():
+    conn = sqlite3.connect(":memory:")
+    init_checkpoint_store(conn)
+    return conn
+
+class TestScraperDaemon(unittest.TestCase):
+    def run_daemon(self, daemon, cycles, scrape=None, failed_launches=0):
+        launches = []
+
+        async def launch_browser(p):
+            if daemon.cycles <= failed_launches:
+                if daemon.cycles >= cycles:
+                    daemon.request_stop()
+                raise RuntimeError("Firefox failed to launch")
+            launches.append(FakeBrowser())
+            return launches[-1], object()
+
+        async def scrape_accounts(context, conn, stop_event=None, **kwargs):
+            if scrape:
+                await scrape()
+            if daemon.cycles >= cycles:
+                daemon.request_stop()
+            return []
+
+        with mock.patch.object(main, "async_playwright", FakePlaywright), \
+             mock.patch.object(main, "launch_browser", launch_browser), \
+             mock.patch.object(main, "scrape_accounts", scrape_accounts), \
+             mock.patch.object(main, "process_tweets", lambda conn, tweets, **kwargs: None), \
+             mock.patch.object(main, "init_database", memory_db), \
+             mock.patch.object(main, "child_processes_rss_mb", lambda: 100.0), \
+             mock.patch.object(main.CycleSummary, "finish", lambda self: self.as_dict()):
+            asyncio.run(daemon.run())
+        return launches
+
+    def test_reuses_browser_and_recycles_after_n_cycles(self):
+        daemon = main.ScraperDaemon(interval=0.01, recycle_cycles=2, max_browser_rss_mb=1000)
+        launches = self.run_daemon(daemon, cycles=5)
+        self.assertEqual(daemon.cycles, 5)
+        self.assertEqual(len(launches), 3)
+        self.assertTrue(all(not b.connected for b in launches))
+
+    def test_recycles_on_memory_growth(self):
+        daemon = main.ScraperDaemon(interval=0.01, recycle_cycles=100, max_browser_rss_mb=50)
+        launches = self.run_daemon(daemon, cycles=3)
+        self.assertEqual(len(launches), 3)
+
+    def test_failed_launch_is_retried_next_cycle(self):
+        daemon = main.ScraperDaemon(interval=0.01, recycle_cycles=100, max_browser_rss_mb=1000)
+        launches = self.run_daemon(daemon, cycles=3, failed_launches=1)
+        self.assertEqual(daemon.cycles, 3)
+        self.assertEqual(len(launches), 1)
+
+    def test_overrun_skips_missed_slots(self):
+        daemon = main.ScraperDaemon(interval=0.05, recycle_cycles=100, max_browser_rss_mb=1000)
+        starts = []
+
+        async def slow_scrape():
+            starts.append(asyncio.get_running_loop().time())
+            if len(starts) == 1:
+                await asyncio.sleep(0.12)  # overruns two slots
+
+        self.run_daemon(daemon, cycles=3, scrape=slow_scrape)
+        # Cycles never overlap and the next start lands on the cadence grid
+        self.assertGreaterEqual(starts[1] - starts[0], 0.12)
+        self.assertAlmostEqual((starts[1] - starts[0]) / 0.05, 3, delta=0.6)
+
+if __name__ == '__main__':
+    unittest.main()
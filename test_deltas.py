@@ -0,0 +1,109 @@
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from src.database import to_db_timestamp
+from src.deltas import export_delta, files_since, load_state, record_tombstones
+
+class TestDeltaExports(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.delta_dir = self.tmpdir.name
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("""
+            CREATE TABLE tweets (tweet_id TEXT PRIMARY KEY, likes INTEGER, is_retweet BOOLEAN, updated_at TIMESTAMP)
+        """)
+        self.clock = datetime(2025, 11, 28, 4, 0, 0)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def stamp(self, value):
+        # updated_at as store_tweets writes it
+        return to_db_timestamp(self.conn, value)
+
+    def upsert(self, tweet_id, likes):
+        self.clock += timedelta(seconds=1)
+        self.conn.execute("INSERT OR REPLACE INTO tweets VALUES (?, ?, 0, ?)", (tweet_id, likes, self.stamp(self.clock)))
+
+    def read(self, name):
+        with gzip.open(os.path.join(self.delta_dir, os.path.basename(name)), "rt") as f:
+            return [json.loads(line) for line in f]
+
+    def replay(self, since):
+        table = {}
+        plan = files_since(since, self.delta_dir)
+        for name in plan["files"]:
+            for row in self.read(name):
+                table[row["tweet_id"]] = row["likes"]
+        return plan, table
+
+    def test_emits_only_changes(self):
+        for i in range(3):
+            self.upsert(str(i), 0)
+        self.assertEqual(export_delta(self.conn, self.delta_dir), 3)
+        self.assertEqual(export_delta(self.conn, self.delta_dir), 0)
+
+        self.upsert("1", 50)
+        self.upsert("3", 0)
+        self.assertEqual(export_delta(self.conn, self.delta_dir), 2)
+        self.assertEqual([r["tweet_id"] for r in self.read("delta-000000000002.ndjson.gz")], ["1", "3"])
+        self.assertEqual(load_state(self.delta_dir)["sequence"], 2)
+
+        plan, table = self.replay(1)
+        self.assertEqual(plan["files"], ["delta-000000000002.ndjson.gz"])
+        self.assertEqual(table, {"1": 50, "3": 0})
+
+    def test_compaction_and_catch_up(self):
+        for seq in range(1, 8):
+            self.upsert(str(seq), seq)
+            self.upsert("hot", seq)
+            export_delta(self.conn, self.delta_dir, compact_every=3)
+
+        state = load_state(self.delta_dir)
+        self.assertEqual(state["snapshot"]["sequence"], 6)
+        self.assertEqual(state["previous_snapshot"]["sequence"], 3)
+        # Deltas up to the previous snapshot have been dropped
+        self.assertFalse(os.path.exists(os.path.join(self.delta_dir, "delta-000000000003.ndjson.gz")))
+
+        expected = {str(i): i for i in range(1, 8)}
+        expected["hot"] = 7
+
+        plan, table = self.replay(5)
+        self.assertEqual(plan["files"], ["delta-000000000006.ndjson.gz", "delta-000000000007.ndjson.gz"])
+
+        plan, table = self.replay(0)
+        self.assertEqual(plan["files"], ["snapshot-000000000006.ndjson.gz", "delta-000000000007.ndjson.gz"])
+        self.assertEqual(table, expected)
+
+    def test_recent_rows_wait_so_late_commits_are_not_skipped(self):
+        now = datetime.now()
+        self.conn.execute("INSERT INTO tweets VALUES ('a', 1, 0, ?)", (self.stamp(now - timedelta(seconds=10)),))
+        self.assertEqual(export_delta(self.conn, self.delta_dir, safety_lag=60), 0)
+
+        # Stamped before 'a' but committed after the first export (e.g. by another worker)
+        self.conn.execute("INSERT INTO tweets VALUES ('b', 2, 0, ?)", (self.stamp(now - timedelta(seconds=20)),))
+        self.assertEqual(export_delta(self.conn, self.delta_dir, safety_lag=0), 2)
+        self.assertEqual([r["tweet_id"] for r in self.read("delta-000000000001.ndjson.gz")], ["b", "a"])
+
+    def test_deleted_tweets_are_exported_as_tombstones(self):
+        self.upsert("1", 0)
+        self.upsert("2", 0)
+        export_delta(self.conn, self.delta_dir)
+
+        # Archiving deletes the row and records a tombstone in the same transaction
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM tweets WHERE tweet_id = '1'")
+        record_tombstones(cursor, "?", ["1"], deleted_at=datetime.now() - timedelta(minutes=5))
+        self.conn.commit()
+
+        self.assertEqual(export_delta(self.conn, self.delta_dir), 1)
+        self.assertEqual(self.read("delta-000000000002.ndjson.gz"), [{"tweet_id": "1", "deleted": True}])
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM tweet_tombstones").fetchone()[0], 0)
+        self.assertEqual(export_delta(self.conn, self.delta_dir), 0)
+
+if __name__ == '__main__':
+    unittest.main()
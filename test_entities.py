@@ -0,0 +1,51 @@
+import sqlite3
+import unittest
+from src.entities import EntityMatcher, tag_entities, init_entity_store, store_entities
+from src.records import TweetRecord
+
+class TestEntityTagging(unittest.TestCase):
+    def setUp(self):
+        self.matcher = EntityMatcher()
+
+    def test_aliases_and_informal_spellings(self):
+        text = "INEC don shift Edo election. Jagaban wey dey Abj talk say EFCC go check am for Lasgidi"
+        self.assertEqual(
+            self.matcher.match(text),
+            {"inec", "edo", "bola_tinubu", "fct", "efcc", "lagos"}
+        )
+
+    def test_word_boundaries(self):
+        # "Edo" inside "Edozie", "Kano" inside "Kanolised" must not match
+        self.assertEqual(self.matcher.match("Edozie Kanolised the report"), set())
+        self.assertEqual(self.matcher.match("Protest in Lagos-Ibadan expressway"), {"lagos", "oyo"})
+
+    def test_short_caps_aliases_are_case_sensitive(self):
+        self.assertEqual(self.matcher.match("DSS operatives arrested him"), {"dss"})
+        self.assertEqual(self.matcher.match("that bat flew past the ph meter"), set())
+
+    def test_ambiguous_lagos_nicknames_need_context(self):
+        # bare "Eko"/"Gidi" are common words; only the unambiguous forms count
+        self.assertEqual(self.matcher.match("Eko oni baje, gidi gidi bam"), set())
+        self.assertEqual(self.matcher.match("Flooding at Eko Atlantic again"), {"lagos"})
+        self.assertEqual(self.matcher.match("Traffic for Isale Eko"), {"lagos_island"})
+
+    def test_overlapping_aliases(self):
+        self.assertEqual(
+            self.matcher.match("Bola Ahmed Tinubu visits Port Harcourt and Ile-Ife"),
+            {"bola_tinubu", "rivers", "ife"}
+        )
+
+    def test_store_entities(self):
+        conn = sqlite3.connect(":memory:")
+        init_entity_store(conn)
+        tweets = tag_entities([
+            TweetRecord(1, "dailytrust", "news", "NDLEA raids warehouse in Kano", 0.0),
+            TweetRecord(2, "dailytrust", "news", "Nothing to see here", 0.0),
+        ])
+        store_entities(conn, tweets)
+        store_entities(conn, tweets)  # idempotent
+        rows = conn.execute("SELECT tweet_id, entity, entity_type FROM tweet_entities ORDER BY entity").fetchall()
+        self.assertEqual(rows, [("1", "kano", "state"), ("1", "ndlea", "agency")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from src.export import stream_export
+
+class TestStreamExport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE tweets (tweet_id TEXT, text TEXT, created_at TIMESTAMP, is_retweet BOOLEAN)")
+        now = datetime.now()
+        self.conn.executemany("INSERT INTO tweets VALUES (?, ?, ?, ?)", [
+            (str(i), f"Tweet {i} – Ọ̀yọ́", (now - timedelta(hours=i)).isoformat(), i % 5 == 0)
+            for i in range(2500)
+        ])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_json_array(self):
+        count = stream_export(self.conn, self.path("out.json"), fmt="json", limit=1500)
+        with open(self.path("out.json"), encoding="utf-8") as f:
+            rows = json.load(f)
+        self.assertEqual(count, 1500)
+        self.assertEqual(len(rows), 1500)
+        self.assertEqual(rows[0]["tweet_id"], "1")
+        self.assertTrue(all(not r["is_retweet"] for r in rows))
+
+    def test_gzip_ndjson_with_time_range(self):
+        since = datetime.now() - timedelta(hours=10, minutes=30)
+        stream_export(self.conn, self.path("out.ndjson"), fmt="ndjson", compress=True, limit=None, since=since)
+        with gzip.open(self.path("out.ndjson.gz"), "rt", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([r["tweet_id"] for r in rows], ["1", "2", "3", "4", "6", "7", "8", "9"])
+
+    def test_empty_export_is_valid_json(self):
+        self.conn.execute("DELETE FROM tweets")
+        stream_export(self.conn, self.path("empty.json"))
+        with open(self.path("empty.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [])
+
+    def test_failed_export_keeps_previous_file(self):
+        with open(self.path("out.json"), "w") as f:
+            f.write("[]")
+        with self.assertRaises(ValueError):
+            stream_export(self.conn, self.path("out.json"), fmt="csv")
+        self.conn.execute("DROP TABLE tweets")
+        with self.assertRaises(sqlite3.OperationalError):
+            stream_export(self.conn, self.path("out.json"))
+        with open(self.path("out.json")) as f:
+            self.assertEqual(f.read(), "[]")
+        self.assertEqual(os.listdir(self.tmpdir.name), ["out.json"])
+
+if __name__ == '__main__':
+    unittest.main()
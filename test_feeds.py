@@ -0,0 +1,67 @@
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from src.feeds import publish_feeds, MANIFEST_NAME
+
+class TestFeeds(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.feed_dir = self.tmpdir.name
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("""
+            CREATE TABLE tweets (tweet_id TEXT, author_username TEXT, author_verified BOOLEAN,
+                account_category TEXT, text TEXT, created_at TIMESTAMP, likes INTEGER,
+                retweets INTEGER, replies INTEGER, url TEXT, story_id TEXT, is_retweet BOOLEAN)
+        """)
+        self.now = datetime.now()
+        for i in range(30):
+            self.insert(str(i), "news_outlets" if i % 2 else "journalists", self.now - timedelta(minutes=20 * i), likes=i)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def insert(self, tweet_id, category, created_at, likes=0):
+        self.conn.execute(
+            "INSERT INTO tweets VALUES (?, 'a', 0, ?, 'text', ?, ?, 0, 0, '', ?, 0)",
+            (tweet_id, category, created_at.isoformat(), likes, tweet_id)
+        )
+
+    def manifest(self):
+        with open(os.path.join(self.feed_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+
+    def read_shard(self, name):
+        with gzip.open(os.path.join(self.feed_dir, self.manifest()["shards"][name]["file"]), "rt") as f:
+            return json.load(f)
+
+    def test_publishes_shards(self):
+        publish_feeds(self.conn, self.feed_dir, shard_size=5, hours=3)
+        shards = self.manifest()["shards"]
+
+        self.assertIn("latest/news_outlets", shards)
+        self.assertIn("latest/journalists", shards)
+        self.assertEqual(len([n for n in shards if n.startswith("hourly/")]), 3)
+        self.assertEqual([t["tweet_id"] for t in self.read_shard("top/1h")], ["2", "1", "0"])
+        self.assertEqual(len(self.read_shard("latest/news_outlets")), 5)
+
+    def test_only_changed_shards_are_rewritten(self):
+        self.assertGreater(publish_feeds(self.conn, self.feed_dir, shard_size=5, hours=3), 0)
+        before = self.manifest()
+        self.assertEqual(publish_feeds(self.conn, self.feed_dir, shard_size=5, hours=3), 0)
+        self.assertEqual(self.manifest(), before)
+
+        self.insert("new", "journalists", self.now, likes=1000)
+        publish_feeds(self.conn, self.feed_dir, shard_size=5, hours=3)
+        after = self.manifest()["shards"]
+        self.assertEqual(after["latest/news_outlets"], before["shards"]["latest/news_outlets"])
+        self.assertNotEqual(after["latest/journalists"], before["shards"]["latest/journalists"])
+        self.assertEqual(self.read_shard("top/1h")[0]["tweet_id"], "new")
+        # Previous generation is kept for clients holding the old manifest
+        self.assertTrue(os.path.exists(os.path.join(self.feed_dir, before["shards"]["latest/journalists"]["file"])))
+
+if __name__ == '__main__':
+    unittest.main()
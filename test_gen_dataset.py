@@ -0,0 +1,29 @@
+import unittest
+from collections import Counter
+import numpy as np
+from benchmarks.gen_dataset import COLUMNS, author_table, generate_chunk
+
+
+class TestSyntheticDataset(unittest.TestCase):
+    def test_rows_are_skewed_and_heavy_tailed(self):
+        rng = np.random.default_rng(1)
+        authors = author_table(rng)
+        end = 1_790_000_000.0
+        start = end - 7 * 86400
+        rows = generate_chunk(rng, 1000, 20000, authors, start, end, rng.uniform(start, end, 20))
+
+        self.assertEqual(len(rows[0]), len(COLUMNS))
+        self.assertEqual(len({row[0] for row in rows}), len(rows))
+
+        # A few accounts produce a large share of the tweets
+        per_author = Counter(row[1] for row in rows).most_common()
+        self.assertGreater(sum(c for _, c in per_author[:5]) / len(rows), 0.4)
+
+        # Most tweets get little engagement, a few get a lot
+        likes = sorted(row[6] for row in rows)
+        self.assertLess(likes[len(likes) // 2], 20)
+        self.assertGreater(likes[-1], 50 * max(likes[len(likes) // 2], 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
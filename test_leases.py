@@ -0,0 +1,114 @@
+import asyncio
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from src.leases import init_lease_store, WorkQueue
+from src.polling import init_schedule_store, PollingScheduler
+
+ACCOUNTS = {"news": [f"account{i}" for i in range(40)]}
+USERNAMES = ACCOUNTS["news"]
+
+def run_worker(db_path, worker_id, results):
+    conn = sqlite3.connect(db_path, timeout=30)
+    queue = WorkQueue(conn, worker_id, lease_seconds=60)
+    claimed = []
+    while (row := queue.claim(USERNAMES)) is not None:
+        claimed.append(row["username"])
+        time.sleep(0.005)  # "scrape"
+        queue.release(row["username"], retry_at=time.time() + 3600)
+    results.put((worker_id, claimed))
+    conn.close()
+
+class TestWorkQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "work.db")
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE tweets (tweet_id TEXT, author_username TEXT, created_at TIMESTAMP)")
+        init_schedule_store(conn)
+        WorkQueue(conn).sync(PollingScheduler(conn, ACCOUNTS).state)
+        conn.close()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_processes_share_accounts_without_duplicates(self):
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=run_worker, args=(self.db_path, f"w{i}", results))
+                   for i in range(4)]
+        for w in workers:
+            w.start()
+        claims = dict(results.get(timeout=60) for _ in workers)
+        for w in workers:
+            w.join()
+
+        everything = [u for claimed in claims.values() for u in claimed]
+        self.assertEqual(sorted(everything), sorted(USERNAMES))
+        self.assertGreater(sum(1 for claimed in claims.values() if claimed), 1)
+
+    def test_expired_lease_is_reclaimed(self):
+        a = WorkQueue(sqlite3.connect(self.db_path), "a", lease_seconds=0.2)
+        b = WorkQueue(sqlite3.connect(self.db_path), "b", lease_seconds=0.2)
+
+        first = a.claim(["account0"])["username"]
+        self.assertIsNone(b.claim(["account0"]))
+        # Heartbeats keep the lease alive past its original expiry
+        time.sleep(0.15)
+        self.assertTrue(a.heartbeat(first))
+        time.sleep(0.1)
+        self.assertIsNone(b.claim(["account0"]))
+
+        # "a" crashes: no more heartbeats, so the lease lapses and "b" takes over
+        time.sleep(0.25)
+        self.assertEqual(b.claim(["account0"])["username"], first)
+        self.assertFalse(a.heartbeat(first))
+
+    def test_claims_while_earlier_leases_are_held(self):
+        # Accounts still in the ingest pipeline keep their lease, so a worker
+        # routinely holds several; each claim must return the row it just took
+        queue = WorkQueue(sqlite3.connect(self.db_path), "w")
+        claimed = [queue.claim(USERNAMES[:3])["username"] for _ in range(3)]
+        self.assertEqual(sorted(claimed), USERNAMES[:3])
+        self.assertIsNone(queue.claim(USERNAMES[:3]))
+
+    def test_hold_keeps_the_lease_until_unhold(self):
+        # The lease has to outlive the scrape while the account's tweets wait in the ingest pipeline
+        a = WorkQueue(sqlite3.connect(self.db_path), "a", lease_seconds=0.3)
+        b = WorkQueue(sqlite3.connect(self.db_path), "b", lease_seconds=0.3)
+
+        async def run():
+            first = a.claim(["account0"])["username"]
+            a.hold(first)
+            await asyncio.sleep(0.7)
+            taken_while_held = b.claim(["account0"])
+            a.unhold(first)
+            a.release(first)
+            return taken_while_held, b.claim(["account0"])
+
+        taken_while_held, after_release = asyncio.run(run())
+        self.assertIsNone(taken_while_held)
+        self.assertEqual(after_release["username"], "account0")
+        self.assertEqual(a.holding, {})
+
+    def test_one_publisher_is_elected_and_replaced_when_it_stops(self):
+        conn = sqlite3.connect(self.db_path)
+        init_lease_store(conn)
+        a = WorkQueue(conn, "a")
+        b = WorkQueue(sqlite3.connect(self.db_path), "b")
+        now = time.time()
+
+        self.assertTrue(a.elect("publisher", now=now, lease_seconds=60))
+        self.assertFalse(b.elect("publisher", now=now + 1, lease_seconds=60))
+        # The publisher renews every cycle and keeps the role
+        self.assertTrue(a.elect("publisher", now=now + 50, lease_seconds=60))
+        self.assertFalse(b.elect("publisher", now=now + 100, lease_seconds=60))
+
+        # "a" stops renewing: once its lease runs out "b" takes over
+        self.assertTrue(b.elect("publisher", now=now + 111, lease_seconds=60))
+        self.assertFalse(a.elect("publisher", now=now + 112, lease_seconds=60))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, timedelta
+from src.logconfig import DailyRotatingFileHandler, JsonFormatter, RepeatFilter, prune_files, setup_logging, stop_logging
+
+
+def record(msg, level=logging.WARNING, lineno=10, created=None, args=None):
+    rec = logging.LogRecord("main", level, "main.py", lineno, msg, args, None)
+    if created is not None:
+        rec.created = created
+    return rec
+
+
+class TestRepeatFilter(unittest.TestCase):
+    def test_limits_warnings_per_call_site_and_reports_suppressed(self):
+        f = RepeatFilter(burst=3, window=60)
+        now = time.time()
+        passed = [f.filter(record(f"Error extracting tweet: {i}", created=now + i)) for i in range(10)]
+        self.assertEqual(passed, [True] * 3 + [False] * 7)
+
+        # Another call site has its own budget
+        self.assertTrue(f.filter(record("Attempt failed", lineno=20, created=now)))
+
+        later = record("Error extracting tweet: again", created=now + 61)
+        self.assertTrue(f.filter(later))
+        self.assertIn("suppressed 7 similar", later.getMessage())
+
+    def test_errors_and_info_are_never_dropped(self):
+        f = RepeatFilter(burst=1, window=60)
+        self.assertTrue(all(f.filter(record("boom", level=logging.ERROR)) for _ in range(5)))
+        self.assertTrue(all(f.filter(record("hi", level=logging.INFO)) for _ in range(5)))
+
+
+class TestDailyRotatingFileHandler(unittest.TestCase):
+    def test_switches_file_when_the_day_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = DailyRotatingFileHandler(tmp, "scraper")
+            handler.day = date.today() - timedelta(days=1)  # As if started yesterday
+            handler.baseFilename = os.path.join(tmp, f"scraper_{handler.day:%Y-%m-%d}.log")
+            handler.emit(record("today"))
+            handler.close()
+
+            today = os.path.join(tmp, f"scraper_{date.today():%Y-%m-%d}.log")
+            with open(today) as f:
+                self.assertIn("today", f.read())
+            self.assertEqual(handler.day, date.today())
+
+    def test_late_record_from_yesterday_stays_in_todays_file(self):
+        # Queued before midnight, written after the switch: no flip back to yesterday's file
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = DailyRotatingFileHandler(tmp, "scraper")
+            yesterday = time.time() - 86400
+            self.assertFalse(handler.shouldRollover(record("late", created=yesterday)))
+            handler.close()
+
+    def test_rolls_over_past_max_bytes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = DailyRotatingFileHandler(tmp, "scraper", max_bytes=100, backup_count=2)
+            for i in range(20):
+                handler.emit(record(f"line {i} " + "x" * 30))
+            handler.close()
+            names = sorted(os.listdir(tmp))
+            self.assertEqual(len(names), 3)
+            self.assertTrue(names[1].endswith(".log.1"))
+
+
+class TestPruneFiles(unittest.TestCase):
+    def test_deletes_only_old_matching_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            old = time.time() - 20 * 86400
+            for name in ("cycle-1.json", "cycle-2.json", "profile-1.txt"):
+                path = os.path.join(tmp, name)
+                open(path, "w").close()
+                if name != "cycle-2.json":
+                    os.utime(path, (old, old))
+
+            prune_files(os.path.join(tmp, "cycle-*.json"), retention_days=14)
+            self.assertEqual(sorted(os.listdir(tmp)), ["cycle-2.json", "profile-1.txt"])
+
+            prune_files(os.path.join(tmp, "profile-*"), retention_days=0)  # 0 keeps everything
+            self.assertIn("profile-1.txt", os.listdir(tmp))
+
+
+class TestJsonFormatter(unittest.TestCase):
+    def test_formats_one_object_per_record(self):
+        entry = json.loads(JsonFormatter().format(record("Stored %d tweets", level=logging.INFO, args=(5,))))
+        self.assertEqual(entry["message"], "Stored 5 tweets")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["logger"], "main")
+
+
+class TestSetupLogging(unittest.TestCase):
+    def setUp(self):
+        root = logging.getLogger()
+        self.saved = (root.handlers[:], root.level)
+
+    def tearDown(self):
+        stop_logging()
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in self.saved[0]:
+            root.addHandler(handler)
+        root.setLevel(self.saved[1])
+
+    def test_records_reach_the_file_through_the_queue(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            setup_logging("test", directory=tmp, fmt="json", force=True)
+            try:
+                raise ValueError("bad row")
+            except ValueError:
+                logging.getLogger("main").exception("Failed to store")
+            stop_logging()
+
+            with open(os.path.join(tmp, f"test_{date.today():%Y-%m-%d}.log")) as f:
+                entry = json.loads(f.read().strip().splitlines()[-1])
+            self.assertEqual(entry["message"], "Failed to store")
+            self.assertIn("ValueError: bad row", entry["exception"])
+
+    def test_prunes_old_files_at_startup(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            stale = os.path.join(tmp, "test_2000-01-01.log")
+            open(stale, "w").close()
+            os.utime(stale, (0, 0))
+            setup_logging("test", directory=tmp, force=True)
+            stop_logging()
+            self.assertFalse(os.path.exists(stale))
+
+
+if __name__ == "__main__":
+    unittest.main()
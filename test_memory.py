@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+from src import memory
+
+@unittest.skipUnless(os.path.isdir("/proc"), "needs /proc")
+class TestChildProcessesRss(unittest.TestCase):
+    def setUp(self):
+        memory._tree_cache.clear()
+        self.child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+
+    def tearDown(self):
+        if self.child.poll() is None:
+            self.child.kill()
+            self.child.wait()
+        memory._tree_cache.clear()
+
+    def test_reuses_cached_pids_until_one_exits(self):
+        self.assertGreater(memory.child_processes_rss_mb(), 0)
+
+        # Later samples read only the cached pids instead of scanning all of /proc
+        with mock.patch.object(memory, "_children_map", wraps=memory._children_map) as scan:
+            self.assertGreater(memory.child_processes_rss_mb(), 0)
+            self.assertEqual(scan.call_count, 0)
+
+            self.child.kill()
+            self.child.wait()
+            memory.child_processes_rss_mb()
+            self.assertEqual(scan.call_count, 1)
+
+    def test_rescans_after_the_interval(self):
+        memory.child_processes_rss_mb()
+        with mock.patch.object(memory, "_children_map", wraps=memory._children_map) as scan:
+            memory.child_processes_rss_mb(rescan_seconds=0)
+            self.assertEqual(scan.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+from src.metrics import Registry
+from src.instrumentation import CycleSummary, PHASE_SECONDS, ACCOUNT_RESULTS
+
+
+class TestRegistry(unittest.TestCase):
+    def test_counter_and_gauge_render_with_labels(self):
+        registry = Registry()
+        counter = registry.counter("requests_total", "Requests", ["route"])
+        counter.inc(route="/tweets")
+        counter.inc(2, route="/tweets")
+        registry.gauge("up", "Up").set(1)
+
+        text = registry.render()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{route="/tweets"} 3', text)
+        self.assertIn("up 1", text)
+
+    def test_registering_twice_returns_the_same_metric(self):
+        registry = Registry()
+        self.assertIs(registry.counter("c", "C"), registry.counter("c", "C"))
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.7, 5):
+            histogram.observe(value)
+
+        text = registry.render()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("latency_seconds_count 4", text)
+        self.assertEqual(histogram.count(), 4)
+
+    def test_label_values_are_escaped(self):
+        registry = Registry()
+        registry.counter("c", "C", ["path"]).inc(path='a"b')
+        self.assertIn('c{path="a\\"b"} 1', registry.render())
+
+    def test_textfile_is_written(self):
+        registry = Registry()
+        registry.counter("c", "C").inc()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scraper.prom")
+            registry.write_textfile(path)
+            with open(path) as f:
+                self.assertIn("c 1", f.read())
+            self.assertEqual(os.listdir(tmp), ["scraper.prom"])
+
+
+class TestCycleSummary(unittest.TestCase):
+    def test_account_phases_are_summed_and_written(self):
+        before = PHASE_SECONDS.count(phase="navigation", category="news_outlets")
+        done = ACCOUNT_RESULTS.get(category="news_outlets", status="done")
+
+        summary = CycleSummary("test-cycle")
+        timer = summary.account("channelstv", "news_outlets")
+        with timer.phase("navigation"):
+            pass
+        timer.add("scroll", 2.0)
+        timer.add("scroll", 1.0)
+        timer.finish("done", 7)
+        self.assertIs(summary.account("channelstv", "news_outlets"), timer)
+        summary.account("dailytrust", "news_outlets").finish("timeout")
+        with summary.phase("export"):
+            pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            result = summary.finish(directory=tmp, textfile="")
+            with open(os.path.join(tmp, "cycle-test-cycle.json")) as f:
+                written = json.load(f)
+
+        self.assertEqual(written["cycle_id"], "test-cycle")
+        self.assertEqual(written["tweets"], 7)
+        self.assertEqual(written["slowest_accounts"][0], "channelstv")
+        self.assertEqual(next(iter(written["account_phases"])), "scroll")
+        channelstv = written["accounts"][0]
+        self.assertEqual(channelstv["phases"]["scroll"], {"seconds": 3.0, "count": 2})
+        self.assertIn("export", written["cycle_phases"])
+        self.assertEqual(result["accounts"][1]["status"], "timeout")
+
+        self.assertEqual(PHASE_SECONDS.count(phase="navigation", category="news_outlets"), before + 1)
+        self.assertEqual(ACCOUNT_RESULTS.get(category="news_outlets", status="done"), done + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
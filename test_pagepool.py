@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+from src.pagepool import PagePool
+
+
+class FakePage:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.hung = False
+        self.visited = []
+
+    def is_closed(self):
+        return self.closed
+
+    async def evaluate(self, script):
+        if self.hung:
+            raise RuntimeError("Target crashed")
+        return "complete"
+
+    async def goto(self, url):
+        self.visited.append(url)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        self.pages.append(FakePage(len(self.pages)))
+        return self.pages[-1]
+
+
+class TestPagePool(unittest.TestCase):
+    def setUp(self):
+        self.context = FakeContext()
+        self.set_up = []
+
+        async def setup(page):
+            self.set_up.append(page.number)
+
+        self.pool = PagePool(self.context, max_uses=3, setup=setup)
+
+    def use(self, fail=False):
+        async def visit():
+            async with self.pool.page() as page:
+                if fail:
+                    raise RuntimeError("scrape failed")
+                return page
+        return asyncio.run(visit())
+
+    def test_reuses_warmed_page_until_worn_out(self):
+        pages = [self.use() for _ in range(4)]
+        self.assertEqual([p.number for p in pages], [0, 0, 0, 1])
+        self.assertEqual(self.set_up, [0, 1])  # Setup runs once per page, not per account
+        self.assertEqual(pages[0].visited, ["about:blank", "about:blank"])
+        self.assertTrue(pages[0].closed)
+        self.assertEqual(self.pool.report()["pages_reused"], 2)
+
+    def test_failed_scrape_retires_the_page(self):
+        with self.assertRaises(RuntimeError):
+            self.use(fail=True)
+        self.assertTrue(self.context.pages[0].closed)
+        self.assertEqual(self.use().number, 1)
+
+    def test_unhealthy_page_is_replaced(self):
+        first = self.use()
+        first.hung = True
+        self.assertEqual(self.use().number, 1)
+        self.assertTrue(first.closed)
+
+    def test_drain_closes_idle_pages(self):
+        page = self.use()
+        asyncio.run(self.pool.drain())
+        self.assertTrue(page.closed)
+        self.assertEqual(self.pool.report()["pages_retired"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from src.pipeline import Pipeline, DbExecutor
+
+class TestPipeline(unittest.TestCase):
+    def test_items_flow_in_order_with_bounded_queues(self):
+        seen, depths = [], []
+
+        async def run():
+            async def double(batch):
+                return [x * 2 for x in batch]
+
+            async def slow_sink(batch):
+                await asyncio.sleep(0.01)
+                seen.append(batch)
+
+            pipeline = Pipeline([("double", double), ("sink", slow_sink)], maxsize=2).start()
+            for i in range(10):
+                await pipeline.put([i, i])
+                depths.append(pipeline.queues[0].qsize() + pipeline.queues[1].qsize())
+            await pipeline.close()
+            return pipeline.report()
+
+        report = asyncio.run(run())
+        self.assertEqual(seen, [[i * 2, i * 2] for i in range(10)])
+        # The producer is held back instead of buffering everything
+        self.assertLessEqual(max(depths), 4)
+        self.assertEqual([(m["stage"], m["batches"], m["items"]) for m in report],
+                         [("double", 10, 20), ("sink", 10, 20)])
+        self.assertGreater(report[1]["busy_seconds"], 0.09)
+
+    def test_failed_item_is_dropped_and_counted(self):
+        seen = []
+
+        async def run():
+            async def check(batch):
+                if batch == ["bad"]:
+                    raise ValueError("bad batch")
+                return batch
+
+            async def sink(batch):
+                seen.append(batch)
+
+            pipeline = Pipeline([("check", check), ("sink", sink)]).start()
+            for batch in (["a"], ["bad"], ["b"]):
+                await pipeline.put(batch)
+            await pipeline.close()
+            return pipeline.report()
+
+        report = asyncio.run(run())
+        self.assertEqual(seen, [["a"], ["b"]])
+        self.assertEqual(report[0]["errors"], 1)
+
+class TestDbExecutor(unittest.TestCase):
+    def test_runs_on_its_own_thread_and_connection(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "pipeline.db")
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+
+            def insert(db_conn, x):
+                db_conn.execute("INSERT INTO t VALUES (?)", (x,))
+                db_conn.commit()
+                return threading.current_thread().name
+
+            async def run():
+                db = DbExecutor(lambda: sqlite3.connect(path))
+                names = [await db.run(insert, x) for x in range(3)]
+                db.shutdown()
+                return names
+
+            names = asyncio.run(run())
+            self.assertTrue(all(name.startswith("db") for name in names))
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone(), (3,))
+            conn.close()
+
+    def test_failed_connect_is_retried_and_shutdown_stays_quiet(self):
+        attempts = []
+
+        def connect():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise sqlite3.OperationalError("database is down")
+            return sqlite3.connect(":memory:")
+
+        async def run():
+            db = DbExecutor(connect)
+            with self.assertRaises(sqlite3.OperationalError):
+                await db.run(lambda c: c.execute("SELECT 1").fetchone())
+            row = await db.run(lambda c: c.execute("SELECT 1").fetchone())
+            db.shutdown()
+            return row
+
+        self.assertEqual(asyncio.run(run()), (1,))
+        self.assertEqual(len(attempts), 2)
+
+    def test_unused_executor_never_connects(self):
+        attempts = []
+        DbExecutor(lambda: attempts.append(1)).shutdown()
+        self.assertEqual(attempts, [])
+
+if __name__ == '__main__':
+    unittest.main()
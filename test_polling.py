@@ -0,0 +1,77 @@
+import random
+import sqlite3
+import unittest
+from src.polling import init_schedule_store, PollingScheduler, freshness_report
+from src.records import TweetRecord
+
+ACCOUNTS = {"news": ["busy", "quiet"], "politics": ["new"]}
+
+class TestPollingScheduler(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE tweets (tweet_id TEXT, author_username TEXT, created_at TIMESTAMP)")
+        init_schedule_store(self.conn)
+
+    def scheduler(self):
+        return PollingScheduler(self.conn, ACCOUNTS, floor_minutes=10, ceiling_minutes=360,
+                                target_yield=2, jitter=0.1, rng=random.Random(7))
+
+    def tweets(self, n, at, lag=300):
+        return [TweetRecord(i, "busy", "news", "text", at - lag) for i in range(n)]
+
+    def test_new_accounts_are_due_immediately(self):
+        due = self.scheduler().due_accounts()
+        self.assertEqual(sorted(u for _, u, _ in due), ["busy", "new", "quiet"])
+        self.assertTrue(all(window is None for _, _, window in due))
+
+    def test_intervals_follow_rate_within_floor_and_ceiling(self):
+        sched = self.scheduler()
+        t = 1_700_000_000.0
+        for username in ("busy", "quiet"):
+            sched.record(username, [], t - 30, t)
+
+        # Hourly visits: "busy" keeps finding 20 new tweets, "quiet" none
+        for i in range(1, 11):
+            now = t + i * 3600
+            sched.record("busy", self.tweets(20, now), now - 30, now)
+            sched.record("quiet", [], now - 30, now)
+
+        busy, quiet = sched.state["busy"], sched.state["quiet"]
+        self.assertEqual(busy["interval_seconds"], 600)
+        self.assertEqual(quiet["interval_seconds"], 360 * 60)
+        # Jitter keeps next_due within +/-10% of the interval
+        self.assertAlmostEqual(quiet["next_due"] - quiet["last_scraped_at"], quiet["interval_seconds"],
+                               delta=0.1 * quiet["interval_seconds"])
+
+        # Busy accounts come back well before quiet ones, most overdue first
+        due = [u for _, u, _ in sched.due_accounts(now=busy["next_due"] + 1)]
+        self.assertEqual(due, ["new", "busy"])
+        # The look-back window covers everything since the last visit
+        self.assertGreater(sched.window_minutes("quiet", now=t + 20 * 3600), 600)
+
+    def test_tweets_from_earlier_visits_are_not_counted_again(self):
+        sched = self.scheduler()
+        t = 1_700_000_000.0
+        sched.record("busy", self.tweets(5, t, lag=1200), t - 30, t)
+
+        # Ten minutes later the hour-long window returns the same five tweets plus one new one
+        now = t + 600
+        seen_again = self.tweets(5, t, lag=1200) + [TweetRecord(99, "busy", "news", "text", now - 60)]
+        sched.record("busy", seen_again, now - 30, now)
+        self.assertEqual(sched.state["busy"]["last_yield"], 1)
+        self.assertAlmostEqual(sched.state["busy"]["lag_seconds"], 0.3 * 60 + 0.7 * 1200)
+
+    def test_state_persists_and_report(self):
+        sched = self.scheduler()
+        sched.record("busy", self.tweets(3, 1_700_000_000.0, lag=600), 1_699_999_990.0, 1_700_000_000.0)
+
+        reloaded = self.scheduler()
+        self.assertEqual(reloaded.state["busy"]["last_yield"], 3)
+        self.assertEqual(reloaded.due_accounts(now=1_700_000_001.0)[0][1], "new")
+
+        report = {r["username"]: r for r in freshness_report(self.conn)}
+        self.assertEqual(report["busy"]["actual_freshness_minutes"], 10.0)
+        self.assertEqual(report["busy"]["expected_freshness_minutes"], report["busy"]["interval_minutes"] / 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest import mock
+import main
+from src.checkpoint import init_checkpoint_store
+from src.instrumentation import CycleSummary
+from src.profiling import CycleProfiler
+
+
+class TestCycleProfiler(unittest.TestCase):
+    def test_reports_blocking_calls_per_account(self):
+        summary = CycleSummary("profiled")
+
+        async def cycle(directory):
+            profiler = CycleProfiler(summary, directory=directory, slow_callback_ms=20).start()
+            await asyncio.sleep(0)  # Callbacks are timed from the loop's next step
+            timer = summary.account("channelstv", "news_outlets")
+            with timer.phase("dedup"):
+                time.sleep(0.05)  # A synchronous call holding the event loop
+            await asyncio.sleep(0)
+            timer.finish("done", 3)
+            summary.account("dailytrust", "news_outlets").finish("timeout")
+            buffers = [bytearray(1024) for _ in range(100)]
+            path = profiler.stop()
+            loop = asyncio.get_running_loop()
+            return path, buffers, loop.get_debug()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path, _, debug_after = asyncio.run(cycle(tmp))
+            self.assertEqual(sorted(os.listdir(tmp)),
+                             ["profile-profiled.json", "profile-profiled.prof", "profile-profiled.txt"])
+            with open(os.path.join(tmp, "profile-profiled.json")) as f:
+                report = json.load(f)
+            with open(path) as f:
+                text = f.read()
+
+        self.assertFalse(debug_after)
+        self.assertGreaterEqual(len(report["slow_callbacks"]), 1)
+        self.assertGreaterEqual(report["slow_callbacks"][0]["seconds"], 0.04)
+
+        accounts = {a["account"]: a for a in report["accounts"]}
+        self.assertEqual(accounts["channelstv"]["slow_callbacks"], 1)
+        self.assertGreaterEqual(accounts["channelstv"]["blocked_seconds"], 0.04)
+        self.assertEqual(accounts["dailytrust"]["slow_callbacks"], 0)
+        self.assertTrue(report["allocations"])
+        self.assertTrue(any("sleep" in f["function"] for f in report["functions"]))
+        self.assertIn("Per account", text)
+        self.assertIn("channelstv", text)
+
+
+class FakePlaywright:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestProfiledRun(unittest.TestCase):
+    def test_failed_one_shot_cycle_still_writes_its_profile(self):
+        def memory_db():
+            conn = sqlite3.connect(":memory:")
+            init_checkpoint_store(conn)
+            return conn
+
+        async def launch_browser(p):
+            return None, None
+
+        async def scrape_accounts(*args, **kwargs):
+            raise RuntimeError("scrape blew up")
+
+        with tempfile.TemporaryDirectory() as tmp, \
+             mock.patch.object(main, "init_database", memory_db), \
+             mock.patch.object(main, "async_playwright", FakePlaywright), \
+             mock.patch.object(main, "launch_browser", launch_browser), \
+             mock.patch.object(main, "scrape_accounts", scrape_accounts), \
+             mock.patch.object(main, "CycleProfiler", lambda summary: CycleProfiler(summary, directory=tmp)):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(main.main(profile=True))
+            self.assertTrue(any(name.endswith(".txt") for name in os.listdir(tmp)))
+
+
+if __name__ == "__main__":
+    unittest.main()
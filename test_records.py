@@ -0,0 +1,35 @@
+import unittest
+from src.records import TweetRecord
+
+class TestTweetRecord(unittest.TestCase):
+    def test_round_trip_through_edge_dicts(self):
+        scraped = {
+            "tweet_id": "1862000000000000001",
+            "author_username": "channelstv",
+            "author_verified": True,
+            "category": "news_outlets",
+            "text": "INEC fixes date for Edo governorship election",
+            "likes": 120,
+            "retweets": 30,
+            "replies": 4,
+            "url": "https://x.com/channelstv/status/1862000000000000001",
+            "is_retweet": False,
+            "created_at": "2025-11-28T04:30:00",
+        }
+        record = TweetRecord.from_dict(scraped)
+        self.assertEqual(record.tweet_id, 1862000000000000001)
+        self.assertIsInstance(record.created_at, float)
+        self.assertEqual(record.total_engagement, 154)
+
+        out = record.to_dict()
+        self.assertEqual({k: out[k] for k in scraped}, scraped)
+        self.assertEqual(TweetRecord.from_dict(out), record)
+
+    def test_slotted(self):
+        record = TweetRecord(1, "channelstv", "news_outlets", "text", 0.0)
+        self.assertFalse(hasattr(record, "__dict__"))
+        with self.assertRaises(AttributeError):
+            record.extra = 1
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import json
+import time
+import unittest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+from benchmarks.replay_server import build_server, PAGE_SIZE
+
+
+class TestReplayServer(unittest.TestCase):
+    def setUp(self):
+        self.server = build_server(["channelstv"], tweets_per_account=25).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path):
+        with urlopen(self.server.base_url + path) as response:
+            return response.read().decode("utf-8")
+
+    def test_profile_shell_uses_scraper_markup(self):
+        html = self.get("/channelstv")
+        for testid in ("tweet", "tweetText", "User-Name", "like", "retweet", "reply"):
+            self.assertIn(f'data-testid="{testid}"', html)
+
+    def test_paginates_and_shifts_to_now(self):
+        pages, cursor = [], 0
+        while cursor is not None:
+            page = json.loads(self.get(f"/i/api/UserTweets?username=channelstv&cursor={cursor}"))
+            pages.append(page["tweets"])
+            cursor = page["next_cursor"]
+        self.assertEqual([len(p) for p in pages], [PAGE_SIZE, PAGE_SIZE, 5])
+        newest = pages[0][0]
+        self.assertAlmostEqual(newest["created_at"], time.time() - 60, delta=5)
+        self.assertTrue(newest["datetime"].endswith("Z"))
+
+    def test_unknown_account_and_injected_failures(self):
+        with self.assertRaises(HTTPError) as missing:
+            self.get("/i/api/UserTweets?username=nobody&cursor=0")
+        self.assertEqual(missing.exception.code, 404)
+
+        self.server.failure_rate = 1.0
+        with self.assertRaises(HTTPError) as failed:
+            self.get("/i/api/UserTweets?username=channelstv&cursor=0")
+        self.assertEqual(failed.exception.code, 500)
+        self.assertEqual(self.server.failures, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import asyncio
+import sqlite3
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+import main
+from src.waits import ARM_JS
+
+
+def raw_article(tweet_id, minutes_ago=5, text="Fuel queues in Lagos", likes="12 likes. Like"):
+    posted = datetime.fromtimestamp(time.time() - minutes_ago * 60, tz=timezone.utc)
+    return {
+        "text": text,
+        "user": "Channels TV\n@channelstv",
+        "likes": likes,
+        "retweets": "3 reposts. Repost",
+        "replies": "",
+        "time": f"{minutes_ago}m",
+        "datetime": posted.isoformat().replace("+00:00", "Z"),
+        "href": f"/channelstv/status/{tweet_id}",
+    }
+
+
+class FakeMouse:
+    def __init__(self):
+        self.scrolls = 0
+
+    async def wheel(self, dx, dy):
+        self.scrolls += 1
+
+
+class FakeScrollPage:
+    """Timeline that serves one batch of article rows per evaluate() call"""
+
+    def __init__(self, batches, outcomes=()):
+        self.batches = list(batches)
+        self.outcomes = list(outcomes)
+        self.mouse = FakeMouse()
+        self.url = "https://x.com/channelstv"
+        self.timeouts = []
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def wait_for_selector(self, selector, **kwargs):
+        pass
+
+    async def query_selector(self, selector):
+        return object()
+
+    async def query_selector_all(self, selector):
+        raise AssertionError("scroll loop must not hold element handles")
+
+    async def evaluate(self, script, arg=None):
+        if script == main.EXTRACT_ARTICLES_JS:
+            return self.batches.pop(0) if self.batches else []
+        if script == ARM_JS:
+            self.timeouts.append(arg)
+            return None
+        # Awaiting the armed observer
+        return self.outcomes.pop(0) if self.outcomes else {"outcome": "new", "ms": 200.0}
+
+    async def wait_for_timeout(self, ms):
+        raise AssertionError("scrolling must wait on page events, not fixed sleeps")
+
+
+class TestArticleToRecord(unittest.TestCase):
+    def test_builds_record_from_row(self):
+        tweet = main.article_to_record(raw_article(101, minutes_ago=5), "channelstv", "news_outlets")
+        self.assertEqual(tweet.tweet_id, 101)
+        self.assertEqual((tweet.likes, tweet.retweets, tweet.replies), (12, 3, 0))
+        self.assertEqual(tweet.url, "https://x.com/channelstv/status/101")
+        self.assertTrue(tweet.author_verified)
+        self.assertAlmostEqual(tweet.created_at, time.time() - 300, delta=5)
+
+    def test_falls_back_to_relative_time(self):
+        row = raw_article(102)
+        row["datetime"] = None
+        row["time"] = "2h"
+        tweet = main.article_to_record(row, "channelstv", "news_outlets")
+        self.assertAlmostEqual(tweet.created_at, time.time() - 7200, delta=5)
+
+    def test_skips_rows_without_id_or_text(self):
+        self.assertIsNone(main.article_to_record(raw_article(103, text=""), "channelstv", "news_outlets"))
+        row = raw_article(104)
+        row["href"] = ""
+        self.assertIsNone(main.article_to_record(row, "channelstv", "news_outlets"))
+
+
+class TestBoundedScroll(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE tweets (tweet_id TEXT)")
+        main.SCROLL_WAITS.latency.clear()
+
+    def scrape(self, page, rss_mb=100.0):
+        with mock.patch.object(main, "child_processes_rss_mb", lambda: rss_mb):
+            return asyncio.run(main.scrape_account_tweets(page, "channelstv", "news_outlets", self.conn))
+
+    def test_stops_at_the_time_window(self):
+        # Re-rendered rows are ignored; a run of old tweets ends the session
+        page = FakeScrollPage([
+            [raw_article(1), raw_article(2)],
+            [raw_article(2), raw_article(3)],
+            [raw_article(10 + i, minutes_ago=120) for i in range(5)],
+            [raw_article(99)],
+        ])
+        tweets = self.scrape(page)
+        self.assertEqual([t.tweet_id for t in tweets], [1, 2, 3])
+        self.assertEqual(page.mouse.scrolls, 2)
+
+    def test_stops_at_the_end_of_the_timeline(self):
+        page = FakeScrollPage([[raw_article(1)], [raw_article(2)], [raw_article(3)], [raw_article(4)]],
+                              outcomes=[{"outcome": "new", "ms": 300.0}, {"outcome": "end", "ms": 900.0},
+                                        {"outcome": "end", "ms": 1500.0}])
+        tweets = self.scrape(page)
+        self.assertEqual([t.tweet_id for t in tweets], [1, 2, 3])
+        self.assertEqual(page.mouse.scrolls, 3)
+        # The second wait used the timeout learned from the first
+        self.assertEqual(page.timeouts[1], main.SCROLL_WAITS.timeout_ms("channelstv"))
+        # The end was confirmed with at least the old fixed sleep
+        self.assertGreaterEqual(page.timeouts[2], main.FIXED_WAIT_MS)
+
+    def test_one_short_end_wait_does_not_end_the_timeline(self):
+        # The first wait hit the bottom before X finished fetching; the next batch still arrives
+        page = FakeScrollPage([[raw_article(i)] for i in range(1, 5)],
+                              outcomes=[{"outcome": "end", "ms": 600.0}, {"outcome": "new", "ms": 1200.0},
+                                        {"outcome": "end", "ms": 600.0}, {"outcome": "end", "ms": 1500.0}])
+        tweets = self.scrape(page)
+        self.assertEqual([t.tweet_id for t in tweets], [1, 2, 3, 4])
+        self.assertEqual(page.mouse.scrolls, 4)
+
+    def test_page_errors_reach_the_caller(self):
+        # The page pool only retires a page when the block raises, so errors can't be swallowed
+        class CrashingPage(FakeScrollPage):
+            async def evaluate(self, script, arg=None):
+                if script == main.EXTRACT_ARTICLES_JS and self.mouse.scrolls:
+                    raise RuntimeError("Target crashed")
+                return await super().evaluate(script, arg)
+
+        page = CrashingPage([[raw_article(1)], [raw_article(2)]])
+        with self.assertRaises(RuntimeError):
+            self.scrape(page)
+
+    def test_stops_scrolling_early_when_browser_memory_is_high(self):
+        page = FakeScrollPage([[raw_article(i)] for i in range(1, 20)])
+        with mock.patch.object(main, "SCROLL_MAX_RSS_MB", 500):
+            tweets = self.scrape(page, rss_mb=800.0)
+        self.assertEqual(len(tweets), main.MEMORY_SAMPLE_SCROLLS)
+        self.assertEqual(page.mouse.scrolls, main.MEMORY_SAMPLE_SCROLLS - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import sqlite3
+import unittest
+from src.stories import init_story_index, cluster_tweets, minhash_signature, estimate_similarity
+from src.records import TweetRecord
+
+def tweet(tweet_id, author, text):
+    return TweetRecord(int(tweet_id), author, "news", text, 0.0)
+
+class TestStoryClustering(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        init_story_index(self.conn)
+
+    def test_similarity_of_reworded_story(self):
+        a = minhash_signature("BREAKING: INEC postpones Edo governorship election to next Saturday https://t.co/abc")
+        b = minhash_signature("Breaking - INEC postpones Edo governorship election to next Saturday. Details: https://t.co/xyz")
+        c = minhash_signature("Super Eagles qualify for AFCON after 2-0 win over Ghana in Abuja")
+        self.assertGreater(estimate_similarity(a, b), 0.7)
+        self.assertLess(estimate_similarity(a, c), 0.2)
+
+    def test_clusters_across_accounts_and_cycles(self):
+        first = cluster_tweets(self.conn, [
+            tweet("1", "channelstv", "BREAKING: INEC postpones Edo governorship election to next Saturday"),
+            tweet("2", "PremiumTimesNG", "Super Eagles qualify for AFCON after 2-0 win over Ghana in Abuja"),
+        ])
+        self.assertEqual(first[0].story_id, "1")
+        self.assertEqual(first[1].story_id, "2")
+
+        # A later cycle only consults the index, not the earlier batch
+        second = cluster_tweets(self.conn, [
+            tweet("3", "TheCablNG", "INEC postpones Edo governorship election to next Saturday #EdoDecides"),
+            tweet("4", "dailytrust", "Fuel price rises to N1,200 per litre in Lagos filling stations"),
+        ])
+        self.assertEqual(second[0].story_id, "1")
+        self.assertEqual(second[1].story_id, "4")
+
+    def test_reclustering_known_tweet_is_stable(self):
+        cluster_tweets(self.conn, [tweet("1", "channelstv", "Senate confirms new ministerial nominees after screening")])
+        again = cluster_tweets(self.conn, [tweet("1", "channelstv", "Senate confirms new ministerial nominees after screening")])
+        self.assertEqual(again[0].story_id, "1")
+        count = self.conn.execute("SELECT COUNT(*) FROM story_signatures").fetchone()[0]
+        self.assertEqual(count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
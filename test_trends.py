@@ -0,0 +1,65 @@
+import sqlite3
+import time
+import unittest
+from src.trends import tokenize, init_trend_store, record_trends, TrendTracker
+from src.records import TweetRecord
+
+def tweet(text, ts):
+    return TweetRecord(0, "channelstv", "news", text, ts)
+
+class TestTrends(unittest.TestCase):
+    def test_tokenize(self):
+        terms = tokenize("BREAKING: Fuel scarcity hits Lagos again #FuelScarcity https://t.co/x and the 2024")
+        self.assertEqual(terms, {"breaking", "fuel", "scarcity", "hits", "lagos", "again", "#fuelscarcity"})
+
+    def test_surging_term_ranks_first(self):
+        now = time.time()
+        tracker = TrendTracker()
+        # Steady background chatter about naira across the baseline
+        tracker.update([tweet("naira exchange rate update", now - h * 3600) for h in range(1, 20)], now=now)
+        # A burst of Edo election tweets plus the usual naira talk in the current window
+        tracker.update([tweet(f"Edo election results #EdoDecides {i}", now - 60) for i in range(10)], now=now)
+        tracker.update([tweet("naira exchange rate update", now - 60 * i) for i in range(3)], now=now)
+
+        top = tracker.top(10, now=now)
+        self.assertIn(top[0]["term"], {"edo", "election", "results", "#edodecides"})
+        naira = next(t for t in top if t["term"] == "naira")
+        self.assertLess(naira["score"], top[0]["score"])
+
+    def test_persisted_buckets_reload(self):
+        conn = sqlite3.connect(":memory:")
+        init_trend_store(conn)
+        now = time.time()
+        record_trends(conn, [tweet("Senate passes budget", now - 30)] * 2)
+        record_trends(conn, [tweet("Senate passes budget", now - 20)])
+
+        tracker = TrendTracker()
+        tracker.refresh(conn, force=True)
+        counts = {t["term"]: t["count"] for t in tracker.top(10, now=now)}
+        self.assertEqual(counts["senate"], 3)
+
+        # Incremental refresh only re-reads rows updated since the last one
+        record_trends(conn, [tweet("Senate passes budget", now - 10)])
+        tracker.refresh(conn, force=True)
+        counts = {t["term"]: t["count"] for t in tracker.top(10, now=now)}
+        self.assertEqual(counts["senate"], 4)
+
+    def test_late_tweets_in_older_buckets_are_picked_up(self):
+        conn = sqlite3.connect(":memory:")
+        init_trend_store(conn)
+        now = time.time()
+        record_trends(conn, [tweet("Lagos flooding", now - 2 * 3600)])
+        record_trends(conn, [tweet("Senate passes budget", now - 30)])
+
+        tracker = TrendTracker()
+        tracker.refresh(conn, force=True)
+        self.assertEqual(tracker.totals["flooding"], 1)
+
+        # A slow account reports tweets from two hours ago, well behind the newest bucket
+        record_trends(conn, [tweet("Lagos flooding", now - 2 * 3600 + 5)] * 2)
+        tracker.refresh(conn, force=True)
+        self.assertEqual(tracker.totals["flooding"], 3)
+        self.assertEqual(tracker.totals["senate"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import asyncio
+import unittest
+from src.waits import ScrollWaits, scroll_and_wait, ARM_JS, TIMELINE_END, WAIT_TIMED_OUT, ARTICLES_ADDED
+
+
+class TestScrollWaits(unittest.TestCase):
+    def test_timeout_follows_observed_latency(self):
+        waits = ScrollWaits(initial_ms=1500, alpha=0.5, multiplier=3.0, min_ms=500, max_ms=6000)
+        self.assertEqual(waits.timeout_ms("fast"), 3000)
+
+        waits.observe("fast", ARTICLES_ADDED, 100)
+        self.assertEqual(waits.timeout_ms("fast"), 500)  # Never below the floor
+        waits.observe("fast", ARTICLES_ADDED, 300)
+        self.assertEqual(waits.timeout_ms("fast"), 600)
+
+        # Timeouts push the estimate up, capped at the ceiling
+        for _ in range(10):
+            waits.observe("slow", WAIT_TIMED_OUT, 6000)
+        self.assertEqual(waits.timeout_ms("slow"), 6000)
+
+        # The end of a timeline isn't a latency sample
+        waits.observe("fast", TIMELINE_END, 5000)
+        self.assertEqual(waits.timeout_ms("fast"), 600)
+
+    def test_scroll_and_wait_arms_before_scrolling(self):
+        calls = []
+
+        class Page:
+            async def evaluate(self, script, arg=None):
+                calls.append("arm" if script == ARM_JS else "wait")
+                return None if script == ARM_JS else {"outcome": "new", "ms": 120.5}
+
+        async def scroll():
+            calls.append("scroll")
+
+        result = asyncio.run(scroll_and_wait(Page(), scroll, 900))
+        self.assertEqual(result, ("new", 120.5))
+        self.assertEqual(calls, ["arm", "scroll", "wait"])
+
+
+if __name__ == "__main__":
+    unittest.main()